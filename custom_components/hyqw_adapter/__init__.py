@@ -7,7 +7,8 @@ import asyncio
 import logging
 from datetime import timedelta
 import copy
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional, Any, Set
 
 import aiohttp
 import async_timeout
@@ -16,6 +17,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
@@ -27,13 +29,13 @@ from .const import (
 from .const import CONF_REPLAY_ENABLED
 from .area_manager import AreaManager
 from .polling_bus import PollingBus
-from .state_manager import StateManager
+from .state_manager import StateManager, current_temperature, scaled_temperature
 from .throttled_action_bus import ThrottledActionBus
 from .mqtt_gateway import MqttGateway
 from .replay_manager import ReplayManager
 from .replay_recorder import ReplayRecorder
 from .state_sync_router import StateSyncRouter
-from .mqtt_entities import async_setup_mqtt_entities
+from .mqtt_entities import async_setup_mqtt_entities, clear_device_info_cache
 from .temperature_sensor_binder import TemperatureSensorBinder
 
 _LOGGER = logging.getLogger(__name__)
@@ -81,7 +83,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 await _process_temperature_sensor_binding(coordinator)
             except Exception as err:
                 _LOGGER.error(f"延迟处理温度传感器绑定失败: {err}")
-        asyncio.create_task(delayed_binding())
+        # 后台任务：不阻塞启动，且与其他平台的实体注册交替执行
+        hass.async_create_background_task(delayed_binding(), f"{DOMAIN}_temperature_binding")
     
     # 注册实体名称设置服务
     await _register_entity_naming_service(hass, coordinator)
@@ -138,7 +141,7 @@ async def _process_temperature_sensor_binding(coordinator: "HYQWAdapterCoordinat
             return
         
         # 处理温度传感器绑定
-        coordinator.temperature_binder.process_all_devices(devices)
+        await coordinator.temperature_binder.async_process_all_devices(devices)
         
         # 记录绑定摘要
         binding_summary = coordinator.temperature_binder.get_binding_summary()
@@ -168,10 +171,15 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # 停止节流操作总线
     await coordinator.throttled_action_bus.stop()
     
+    # 写入尚未落盘的配置修改与回放录制数据
+    await coordinator.async_flush_options()
+    await coordinator.replay_manager.async_flush()
+    
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        clear_device_info_cache(entry.entry_id)
     
     return unload_ok
 
@@ -246,13 +254,31 @@ class HYQWAdapterCoordinator(DataUpdateCoordinator):
             "device_control_requests": 0,
         }
         
+        # 统计信息的只读视图（统计字典只原地修改，视图始终反映最新值，读取无需复制）
+        self.request_stats = MappingProxyType(self._request_stats)
+        # 轮询统计对象同样只原地修改，直接共享引用
+        self.polling_stats = self.polling_bus.stats
+        
         # 其他属性
         self._last_update_time = None
         self._empty_states_count = 0
+        # 本次数据推送中发生变化的设备si集合；None表示全量刷新，所有实体都需更新
+        self._changed_devices: Optional[Set[int]] = None
+        # 按设备si登记的增量推送回调，路由器更新时只通知发生变化的设备
+        self._device_listeners: Dict[int, List[Callable[[], None]]] = {}
+        # deviceId -> 设备字典索引，随self.data对象变化惰性重建（复用同一dict）
+        self._device_by_id: Dict[Any, Dict] = {}
+        self._device_index_source: Optional[Dict] = None
         
         # 异步锁，防止状态更新并发冲突
         self._update_lock = asyncio.Lock()
         
+        # 文本实体的配置修改先暂存，合并后一次性写入配置条目
+        self.pending_options: Dict[str, Any] = {}
+        self._options_debouncer = Debouncer(
+            hass, _LOGGER, cooldown=0.5, immediate=False, function=self.async_flush_options
+        )
+        
         # 设置更新间隔作为轮询总线的备用
         update_interval = timedelta(seconds=self.polling_config["long_polling_interval"])
         
@@ -271,7 +297,10 @@ class HYQWAdapterCoordinator(DataUpdateCoordinator):
             har_data = self._har_data
             delattr(self, '_har_data')
             
-            # 设置初始数据
+            # 设置初始数据，并按typeId建立设备索引供各平台直接取用
+            har_data["devices_by_type"] = self._group_devices_by_type(har_data.get("devices", []))
+            for device in har_data["devices_by_type"].get(12, ()):
+                self._apply_current_temperature(device)
             self.data = har_data
             
             # 初始化状态管理器
@@ -302,6 +331,32 @@ class HYQWAdapterCoordinator(DataUpdateCoordinator):
         
         return {}
     
+    @staticmethod
+    def _group_devices_by_type(devices: List[Dict]) -> Dict[Any, List[Dict]]:
+        """按typeId分组设备（与devices共享同一批设备字典）"""
+        by_type: Dict[Any, List[Dict]] = {}
+        for device in devices:
+            by_type.setdefault(device.get("typeId"), []).append(device)
+        return by_type
+    
+    def get_device_by_id(self, device_id: Any) -> Optional[Dict]:
+        """按deviceId查找当前数据中的设备字典（O(1)）"""
+        data = self.data
+        if data is not self._device_index_source:
+            index = self._device_by_id
+            index.clear()
+            if data:
+                for device in data.get("devices", ()):
+                    index[device.get("deviceId")] = device
+            self._device_index_source = data
+        return self._device_by_id.get(device_id)
+    
+    @staticmethod
+    def _apply_current_temperature(device: Dict) -> None:
+        """在数据入口处换算空调当前温度（fn5，超过100视为放大10倍），实体读取时无需再计算"""
+        state = device.get("current_states", {}).get(5)
+        device["current_temperature"] = current_temperature(state.get("fv") if state else None)
+    
     async def _initialize_router_config(self) -> None:
         """初始化状态同步路由器配置"""
         try:
@@ -388,13 +443,48 @@ class HYQWAdapterCoordinator(DataUpdateCoordinator):
                             device_states = self.state_manager.get_device_state(si)
                             if device_states:
                                 device["current_states"] = device_states
+                                if device.get("typeId") == 12:
+                                    self._apply_current_temperature(device)
                 
                 # 在主线程调度 set_updated_data，避免从MQTT线程触发
                 loop = asyncio.get_running_loop()
-                loop.call_soon_threadsafe(lambda: self.async_set_updated_data(updated_data))
+                loop.call_soon_threadsafe(
+                    self._async_set_changed_data, updated_data, changes.get("changed_devices")
+                )
         except Exception as err:
             _LOGGER.error(f"处理路由器更新失败: {err}")
 
+    def _async_set_changed_data(self, data: Dict, changed_devices: Optional[Set[int]]) -> None:
+        """推送增量数据：监听器执行期间可通过is_incremental_update判断是否为增量更新"""
+        self._changed_devices = changed_devices
+        try:
+            self.async_set_updated_data(data)
+        finally:
+            self._changed_devices = None
+        # 仅通知登记在变化设备上的回调
+        if changed_devices and self._device_listeners:
+            for si in changed_devices:
+                # 遍历副本：回调中实体被移除时会注销自身监听
+                for update_callback in tuple(self._device_listeners.get(si, ())):
+                    update_callback()
+    
+    @property
+    def is_incremental_update(self) -> bool:
+        """当前数据推送是否为增量更新（仅部分设备变化，已通过设备级回调通知）"""
+        return self._changed_devices is not None
+    
+    def async_add_device_listener(self, si: int, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """登记设备级增量推送回调，返回注销函数"""
+        listeners = self._device_listeners.setdefault(si, [])
+        listeners.append(update_callback)
+        
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+            if not listeners:
+                self._device_listeners.pop(si, None)
+        
+        return remove_listener
+
     async def _fetch_profile(self) -> None:
         """Fetch profile once to 'warm up' backend when states keep empty."""
         try:
@@ -546,29 +636,17 @@ class HYQWAdapterCoordinator(DataUpdateCoordinator):
         
         elif type_id == 12:  # 空调
             if 2 in current_states:  # fn=2 温度设置
-                temp_value = current_states[2]["fv"]
-                if temp_value and temp_value > 100:
-                    device["target_temperature"] = temp_value / 10
-                else:
-                    device["target_temperature"] = temp_value
+                device["target_temperature"] = scaled_temperature(current_states[2]["fv"])
             if 3 in current_states:  # fn=3 模式设置
                 device["hvac_mode"] = current_states[3]["fv"]
             if 4 in current_states:  # fn=4 风力设置
                 device["fan_speed"] = current_states[4]["fv"]
             if 5 in current_states:  # fn=5 当前温度
-                current_temp_value = current_states[5]["fv"]
-                if current_temp_value and current_temp_value > 100:
-                    device["current_temperature"] = current_temp_value / 10
-                else:
-                    device["current_temperature"] = current_temp_value
+                device["current_temperature"] = current_temperature(current_states[5]["fv"])
         
         elif type_id == 16:  # 地暖
             if 2 in current_states:  # fn=2 温度设置
-                temp_value = current_states[2]["fv"]
-                if temp_value and temp_value > 100:
-                    device["target_temperature"] = temp_value / 10
-                else:
-                    device["target_temperature"] = temp_value
+                device["target_temperature"] = scaled_temperature(current_states[2]["fv"])
         
         elif type_id == 36:  # 新风
             if 3 in current_states:  # fn=3 风力设置
@@ -881,9 +959,23 @@ class HYQWAdapterCoordinator(DataUpdateCoordinator):
                 return self._device_states[si]
             return self._device_states[si].get(fn)
     
+    async def async_stage_option(self, key: str, value: Any) -> None:
+        """暂存配置选项修改，短时间内的多次修改合并为一次写入"""
+        self.pending_options[key] = value
+        await self._options_debouncer.async_call()
+    
+    async def async_flush_options(self) -> None:
+        """将暂存的配置选项写入配置条目"""
+        self._options_debouncer.async_cancel()
+        if not self.pending_options:
+            return
+        options = {**self.entry.options, **self.pending_options}
+        self.pending_options.clear()
+        self.hass.config_entries.async_update_entry(self.entry, options=options)
+    
     def get_request_stats(self):
-        """Get API request statistics."""
-        return self._request_stats.copy()
+        """Get API request statistics (read-only view)."""
+        return self.request_stats
     
     # ===== 轮询总线管理方法 =====
     
@@ -891,7 +983,7 @@ class HYQWAdapterCoordinator(DataUpdateCoordinator):
         """获取轮询总线状态"""
         status = {
             "polling_bus_enabled": True,
-            "config": self.polling_config.copy(),
+            "config": self.polling_bus.config,
             "state_manager_stats": self.state_manager.get_stats(),
             "polling_bus_status": self.polling_bus.get_status(),
         }
@@ -1011,7 +1103,7 @@ async def _register_temperature_binding_service(hass: HomeAssistant, coordinator
             coordinator.temperature_binder.clear_bindings()
             
             # 重新处理绑定
-            coordinator.temperature_binder.process_all_devices(devices)
+            await coordinator.temperature_binder.async_process_all_devices(devices)
             
             # 记录绑定摘要
             binding_summary = coordinator.temperature_binder.get_binding_summary()
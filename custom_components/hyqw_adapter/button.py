@@ -11,11 +11,7 @@ from .const import DOMAIN
 from .mqtt_entities import (
     MqttApplyAndReconnectButton,
     MqttResetStatsButton,
-    StartCurtainFullRecordButton,
-    StartACFullRecordButton,
-    StartFloorFullRecordButton,
-    StartFreshAirFullRecordButton,
-    StartLightFullRecordButton,
+    create_full_record_buttons,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -32,11 +28,8 @@ async def async_setup_entry(
     entities = [
         MqttApplyAndReconnectButton(coordinator, config_entry),  # 应用配置并重连
         MqttResetStatsButton(coordinator, config_entry),         # 重置统计
-        StartCurtainFullRecordButton(coordinator, config_entry), # 开始窗帘全量录制
-        StartACFullRecordButton(coordinator, config_entry),      # 开始空调全量录制
-        StartFloorFullRecordButton(coordinator, config_entry),   # 开始地暖全量录制
-        StartFreshAirFullRecordButton(coordinator, config_entry),# 开始新风全量录制
-        StartLightFullRecordButton(coordinator, config_entry),   # 开始灯具全量录制
     ]
+    # 开始窗帘/空调/地暖/新风/灯具全量录制
+    entities.extend(create_full_record_buttons(coordinator, config_entry))
     
     async_add_entities(entities)
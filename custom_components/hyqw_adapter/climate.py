@@ -58,6 +58,7 @@ class HYQWAdapterClimate(CoordinatorEntity, ClimateEntity):
         super().__init__(coordinator)
         self._device = device
         self._device_id = device["deviceId"]
+        self._device_id_str = str(self._device_id)
         self._device_type = device.get("typeId")
         self._attr_unique_id = f"{DOMAIN}_{self._device_id}"
         # 只在初始化时设置一次名称，后续不再修改
@@ -147,7 +148,7 @@ class HYQWAdapterClimate(CoordinatorEntity, ClimateEntity):
         if self._device_type == 16:
             # 检查是否有绑定的温度传感器
             if hasattr(self.coordinator, 'temperature_binder'):
-                bound_sensor_id = self.coordinator.temperature_binder.get_bound_temperature_sensor(self._device_id)
+                bound_sensor_id = self.coordinator.temperature_binder.get_bound_temperature_sensor(self._device_id_str)
                 if bound_sensor_id:
                     # 从绑定的温度传感器获取温度值
                     bound_temp = self._get_bound_sensor_temperature(bound_sensor_id)
@@ -251,7 +252,7 @@ class HYQWAdapterClimate(CoordinatorEntity, ClimateEntity):
         
         # 对于地暖设备，添加温度传感器绑定信息
         if self._device_type == 16 and hasattr(self.coordinator, 'temperature_binder'):
-            bound_sensor_id = self.coordinator.temperature_binder.get_bound_temperature_sensor(self._device_id)
+            bound_sensor_id = self.coordinator.temperature_binder.get_bound_temperature_sensor(self._device_id_str)
             if bound_sensor_id:
                 attrs["bound_temperature_sensor"] = bound_sensor_id
                 # 获取绑定传感器的当前温度
@@ -447,11 +448,9 @@ class HYQWAdapterClimate(CoordinatorEntity, ClimateEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         # 更新设备信息
-        if self.coordinator.data and "devices" in self.coordinator.data:
-            for device in self.coordinator.data["devices"]:
-                if device["deviceId"] == self._device_id:
-                    self._device = device
-                    break
+        device = self.coordinator.get_device_by_id(self._device_id)
+        if device is not None:
+            self._device = device
         super()._handle_coordinator_update()
     
     async def async_added_to_hass(self) -> None:
@@ -45,8 +45,10 @@ class HYQWAdapterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 if not har_content:
                     errors["抓包HAR文件内容"] = "请粘贴HAR文件内容"
                 else:
-                    # 解析HAR文件
-                    parsed_data = parse_har_file(har_content)
+                    # 解析HAR文件（内容可能较大，放到执行器中避免阻塞事件循环）
+                    parsed_data = await self.hass.async_add_executor_job(
+                        parse_har_file, har_content
+                    )
                     
                     # 检查是否已经配置过同样的设备
                     device_sn = parsed_data["device_sn"]
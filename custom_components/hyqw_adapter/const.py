@@ -35,6 +35,7 @@ MQTT_CONFIG = {
     "default_keepalive": 60,
     "reconnect_intervals": [1, 2, 5, 10],  # 重连间隔序列(秒)
     "max_reconnect_interval": 10,  # 最大重连间隔(秒)
+    "client_reuse_attempts": 3,  # 复用现有客户端重连的连续失败上限，超过后重建客户端
     
     # 兜底巡检配置
     "fallback_check_intervals": {
@@ -55,6 +56,12 @@ MQTT_CONFIG = {
     # 本地广播配置
     "local_broadcast_interval": 15,  # 本地广播间隔(秒)
     "local_broadcast_topic": "SERVER/BROADCAST",  # 本地广播主题
+    
+    # 状态上报合并投递配置
+    "batch_count": 16,  # 累计多少条状态后立即投递
+    "idle_flush_ms": 50,  # 首条状态到达后最多等待多久投递(毫秒)
+    "ingress_queue_size": 1024,  # 入站消息队列上限
+    "ingress_batch_max": 32,  # 消费任务单次唤醒最多处理的消息数
 }
 
 # MQTT相关常量
@@ -293,11 +293,9 @@ class HYQWAdapterCover(CoordinatorEntity, CoverEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         # 更新设备信息
-        if self.coordinator.data and "devices" in self.coordinator.data:
-            for device in self.coordinator.data["devices"]:
-                if device["deviceId"] == self._device_id:
-                    self._device = device
-                    break
+        device = self.coordinator.get_device_by_id(self._device_id)
+        if device is not None:
+            self._device = device
         super()._handle_coordinator_update()
     
     async def async_added_to_hass(self) -> None:
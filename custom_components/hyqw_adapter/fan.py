@@ -19,6 +19,12 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# 新风控制功能码（模块加载时解析一次）
+_FAN_FUNCS = DEVICE_FUNCTIONS.get("fan", {})
+_FAN_ON = _FAN_FUNCS.get("turn_on")
+_FAN_OFF = _FAN_FUNCS.get("turn_off")
+_FAN_SPEED = _FAN_FUNCS.get("set_fan_speed")
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -29,11 +35,10 @@ async def async_setup_entry(
     coordinator: HYQWAdapterCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     
     entities = []
-    if coordinator.data and "devices" in coordinator.data:
-        for device in coordinator.data["devices"]:
-            # 检查是否为风扇设备 (新风36)
-            if device.get("typeId") == 36:
-                entities.append(HYQWAdapterFan(coordinator, device))
+    if coordinator.data and "devices_by_type" in coordinator.data:
+        # 风扇设备 (新风36)
+        for device in coordinator.data["devices_by_type"].get(36, ()):
+            entities.append(HYQWAdapterFan(coordinator, device))
     
     if entities:
         async_add_entities(entities)
@@ -52,6 +57,12 @@ class HYQWAdapterFan(CoordinatorEntity, FanEntity):
         # 只在初始化时设置一次名称，后续不再修改
         self._initial_name = device["deviceName"]
         self._attr_name = self._initial_name
+        # 控制指令的固定参数（st/si来自设备档案，初始化后不变）
+        self._control_base = {
+            "device_id": self._device_id,
+            "st": device["st"],
+            "si": device["si"],
+        }
         
         # 新风设备支持开关和风速调节
         self._attr_supported_features = (
@@ -62,17 +73,24 @@ class HYQWAdapterFan(CoordinatorEntity, FanEntity):
         
         # 支持的风速模式
         self._attr_speed_count = 4  # 0-3档风速
-    
-    @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information."""
-        return {
+        
+        # 设备信息与属性在初始化后不再变化，一次性赋值
+        self._attr_device_info = {
             "identifiers": {(DOMAIN, str(self._device_id))},
             "name": self._initial_name,  # 使用初始名称，避免重置用户自定义名称
             "manufacturer": "花语前湾",
-            "model": f"新风设备 (Type {self._device.get('typeId')})",
-            "sw_version": self._device.get("projectCode", "Unknown"),
-            "suggested_area": self._device.get("roomName"),
+            "model": f"新风设备 (Type {device.get('typeId')})",
+            "sw_version": device.get("projectCode", "Unknown"),
+            "suggested_area": device.get("roomName"),
+        }
+        self._attr_extra_state_attributes = {
+            "device_id": device.get("deviceId"),
+            "device_name": device.get("deviceName"),
+            "device_type": self._device_type,
+            "si": device.get("si"),
+            "room": device.get("roomName"),
+            # 新风设备使用立即控制，不经过节流总线
+            "control_mode": "immediate",
         }
     
     @property
@@ -108,22 +126,6 @@ class HYQWAdapterFan(CoordinatorEntity, FanEntity):
         """Return if entity is available."""
         return self.coordinator.last_update_success
     
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return entity specific state attributes."""
-        attrs = {
-            "device_id": self._device.get("deviceId"),
-            "device_name": self._device.get("deviceName"),
-            "device_type": self._device_type,
-            "si": self._device.get("si"),
-            "room": self._device.get("roomName"),
-        }
-        
-        # 新风设备使用立即控制，不经过节流总线
-        attrs["control_mode"] = "immediate"
-        
-        return attrs
-    
     def _update_device_state_immediately(self, fn: int, fv: int) -> None:
         """立即更新设备状态到目标值"""
         try:
@@ -148,10 +150,10 @@ class HYQWAdapterFan(CoordinatorEntity, FanEntity):
             
             device_name = self._attr_name
             device_si = self._device.get("si")
-            _LOGGER.info(f"新风设备 {device_name} (si={device_si}) state immediately updated: fn{fn}={fv}")
+            _LOGGER.info("新风设备 %s (si=%s) state immediately updated: fn%s=%s", device_name, device_si, fn, fv)
             
         except Exception as err:
-            _LOGGER.error(f"Failed to update fan device state immediately: {err}")
+            _LOGGER.error("Failed to update fan device state immediately: %s", err)
     
     async def async_turn_on(
         self,
@@ -160,21 +162,17 @@ class HYQWAdapterFan(CoordinatorEntity, FanEntity):
         **kwargs: Any,
     ) -> None:
         """Turn on the fan."""
-        device_functions = DEVICE_FUNCTIONS.get("fan", {})
-        
         # 开启电源
-        if "turn_on" in device_functions:
+        if _FAN_ON:
             success = await self.coordinator.async_control_device_immediate(
-                device_id=self._device_id,
-                st=self._device["st"],
-                si=self._device["si"],
-                fn=device_functions["turn_on"]["fn"],
-                fv=device_functions["turn_on"]["fv"],
+                **self._control_base,
+                fn=_FAN_ON["fn"],
+                fv=_FAN_ON["fv"],
                 entity_id=self.entity_id,
             )
             
             if success:
-                _LOGGER.info(f"Fan {self._attr_name} turned on")
+                _LOGGER.info("Fan %s turned on", self._attr_name)
                 # 立即更新电源状态
                 self._update_device_state_immediately(1, 1)
                 
@@ -184,20 +182,16 @@ class HYQWAdapterFan(CoordinatorEntity, FanEntity):
     
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the fan."""
-        device_functions = DEVICE_FUNCTIONS.get("fan", {})
-        
-        if "turn_off" in device_functions:
+        if _FAN_OFF:
             success = await self.coordinator.async_control_device_immediate(
-                device_id=self._device_id,
-                st=self._device["st"],
-                si=self._device["si"],
-                fn=device_functions["turn_off"]["fn"],
-                fv=device_functions["turn_off"]["fv"],
+                **self._control_base,
+                fn=_FAN_OFF["fn"],
+                fv=_FAN_OFF["fv"],
                 entity_id=self.entity_id,
             )
             
             if success:
-                _LOGGER.info(f"Fan {self._attr_name} turned off")
+                _LOGGER.info("Fan %s turned off", self._attr_name)
                 # 立即更新电源状态
                 self._update_device_state_immediately(1, 0)
     
@@ -216,31 +210,25 @@ class HYQWAdapterFan(CoordinatorEntity, FanEntity):
         else:
             fan_speed = 3
         
-        device_functions = DEVICE_FUNCTIONS.get("fan", {})
-        
-        if "set_fan_speed" in device_functions:
+        if _FAN_SPEED:
             success = await self.coordinator.async_control_device_immediate(
-                device_id=self._device_id,
-                st=self._device["st"],
-                si=self._device["si"],
-                fn=device_functions["set_fan_speed"]["fn"],
+                **self._control_base,
+                fn=_FAN_SPEED["fn"],
                 fv=fan_speed,
                 entity_id=self.entity_id,
             )
             
             if success:
-                _LOGGER.info(f"Fan {self._attr_name} speed set to {fan_speed} (percentage: {percentage}%)")
+                _LOGGER.info("Fan %s speed set to %s (percentage: %s%%)", self._attr_name, fan_speed, percentage)
                 # 立即更新风速状态
                 self._update_device_state_immediately(3, fan_speed)
     
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         # 更新设备信息
-        if self.coordinator.data and "devices" in self.coordinator.data:
-            for device in self.coordinator.data["devices"]:
-                if device["deviceId"] == self._device_id:
-                    self._device = device
-                    break
+        device = self.coordinator.get_device_by_id(self._device_id)
+        if device is not None:
+            self._device = device
         super()._handle_coordinator_update()
     
     async def async_added_to_hass(self) -> None:
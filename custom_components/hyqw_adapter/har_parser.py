@@ -10,6 +10,8 @@ _LOGGER = logging.getLogger(__name__)
 class HARParser:
     """Parser for HAR (HTTP Archive) files from HYQW Adapter app."""
     
+    __slots__ = ("har_data", "parsed_data")
+    
     def __init__(self, har_content: str) -> None:
         """Initialize the parser with HAR content."""
         self.har_data = json.loads(har_content)
@@ -17,6 +17,12 @@ from .const import DEVICE_FUNCTIONS, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+# 灯具开关功能码（模块加载时解析一次）
+_LIGHT_ON_FN = DEVICE_FUNCTIONS["light"]["turn_on"]["fn"]
+_LIGHT_ON_FV = DEVICE_FUNCTIONS["light"]["turn_on"]["fv"]
+_LIGHT_OFF_FN = DEVICE_FUNCTIONS["light"]["turn_off"]["fn"]
+_LIGHT_OFF_FV = DEVICE_FUNCTIONS["light"]["turn_off"]["fv"]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -27,11 +33,10 @@ async def async_setup_entry(
     coordinator: HYQWAdapterCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     
     entities = []
-    if coordinator.data and "devices" in coordinator.data:
-        for device in coordinator.data["devices"]:
-            # 检查是否为灯具设备 (typeId == 8)
-            if device.get("typeId") == 8:
-                entities.append(HYQWAdapterLight(coordinator, device))
+    if coordinator.data and "devices_by_type" in coordinator.data:
+        # 灯具设备 (typeId == 8)
+        for device in coordinator.data["devices_by_type"].get(8, ()):
+            entities.append(HYQWAdapterLight(coordinator, device))
     
     if entities:
         async_add_entities(entities)
@@ -47,40 +52,43 @@ class HYQWAdapterLight(CoordinatorEntity, LightEntity):
         self._device_id = device["deviceId"]
         self._attr_unique_id = f"{DOMAIN}_{self._device_id}"
         self._attr_name = device["deviceName"]
+        # 控制指令的固定参数（st/si来自设备档案，初始化后不变）
+        self._control_base = {
+            "device_id": self._device_id,
+            "st": device["st"],
+            "si": device["si"],
+        }
         
         # 设置支持的功能 - 仅支持开关，不支持亮度调节
         self._attr_supported_color_modes = {ColorMode.ONOFF}
         self._attr_color_mode = ColorMode.ONOFF
-    
-    @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information."""
-        return {
+        
+        # 设备信息与静态属性在初始化后不再变化，一次性赋值
+        self._attr_device_info = {
             "identifiers": {(DOMAIN, str(self._device_id))},
             "name": self._attr_name,
             "manufacturer": "花语前湾",
-            "model": f"Type {self._device.get('typeId')}",
-            "sw_version": self._device.get("projectCode", "Unknown"),
-            "suggested_area": self._device.get("roomName"),
+            "model": f"Type {device.get('typeId')}",
+            "sw_version": device.get("projectCode", "Unknown"),
+            "suggested_area": device.get("roomName"),
+        }
+        self._static_attributes = {
+            "device_id": device.get("deviceId"),
+            "device_name": device.get("deviceName"),
+            "si": device.get("si"),
+            "room": device.get("roomName"),
         }
     
     @property
     def is_on(self) -> bool:
         """Return if the light is on."""
-        device_si = self._device.get("si")
-        device_name = self._attr_name
-        
         # 优先使用实时状态数据
         current_states = self._device.get("current_states", {})
         if 1 in current_states:  # fn=1 是开关状态
-            is_on = current_states[1]["fv"] == 1
-            _LOGGER.debug(f"Light {device_name} (si={device_si}) using current_states: {'ON' if is_on else 'OFF'} (fv={current_states[1]['fv']})")
-            return is_on
+            return current_states[1]["fv"] == 1
         
         # 使用设备缓存状态
-        fallback_state = self._device.get("state", 0) == 1 or self._device.get("is_on", False)
-        _LOGGER.debug(f"Light {device_name} (si={device_si}) using fallback state: {'ON' if fallback_state else 'OFF'} (device.state={self._device.get('state')}, device.is_on={self._device.get('is_on')})")
-        return fallback_state
+        return self._device.get("state", 0) == 1 or self._device.get("is_on", False)
     
     @property
     def available(self) -> bool:
@@ -90,20 +98,12 @@ class HYQWAdapterLight(CoordinatorEntity, LightEntity):
     @property
     def extra_state_attributes(self) -> dict:
         """Return entity specific state attributes."""
-        attrs = {
-            "device_id": self._device.get("deviceId"),
-            "device_name": self._device.get("deviceName"),
-            "si": self._device.get("si"),
-            "room": self._device.get("roomName"),
-        }
-        
         # 添加processing状态
         if self.coordinator.is_entity_occupied(self.entity_id):
-            attrs["processing"] = True
-            attrs["status"] = "processing"
             # 可以在前端通过card-mod等插件使用这个状态添加动画效果
+            return {**self._static_attributes, "processing": True, "status": "processing"}
         
-        return attrs
+        return self._static_attributes
     
     def _update_device_state_immediately(self, target_state: int) -> None:
         """立即更新设备状态到目标值"""
@@ -127,21 +127,21 @@ class HYQWAdapterLight(CoordinatorEntity, LightEntity):
             device_name = self._attr_name
             device_si = self._device.get("si")
             state_text = "ON" if target_state == 1 else "OFF"
-            _LOGGER.info(f"Light {device_name} (si={device_si}) state immediately updated to {state_text}")
+            _LOGGER.info("Light %s (si=%s) state immediately updated to %s", device_name, device_si, state_text)
             
         except Exception as err:
-            _LOGGER.error(f"Failed to update light state immediately: {err}")
+            _LOGGER.error("Failed to update light state immediately: %s", err)
     
     def _schedule_delayed_sync(self) -> None:
         """安排2秒后的状态同步"""
         async def delayed_sync():
             try:
                 await asyncio.sleep(2)
-                _LOGGER.debug(f"Light {self._attr_name} starting delayed sync after 2 seconds")
+                _LOGGER.debug("Light %s starting delayed sync after 2 seconds", self._attr_name)
                 await self.coordinator.async_request_state_update()
-                _LOGGER.debug(f"Light {self._attr_name} delayed sync completed")
+                _LOGGER.debug("Light %s delayed sync completed", self._attr_name)
             except Exception as err:
-                _LOGGER.error(f"Light {self._attr_name} delayed sync failed: {err}")
+                _LOGGER.error("Light %s delayed sync failed: %s", self._attr_name, err)
         
         # 创建后台任务
         asyncio.create_task(delayed_sync())
@@ -150,16 +150,14 @@ class HYQWAdapterLight(CoordinatorEntity, LightEntity):
         """Turn the light on."""
         # 灯具只支持开/关，忽略亮度参数
         success = await self.coordinator.async_control_device(
-            device_id=self._device_id,
-            st=self._device["st"],
-            si=self._device["si"],
-            fn=DEVICE_FUNCTIONS["light"]["turn_on"]["fn"],
-            fv=DEVICE_FUNCTIONS["light"]["turn_on"]["fv"],
+            **self._control_base,
+            fn=_LIGHT_ON_FN,
+            fv=_LIGHT_ON_FV,
             entity_id=self.entity_id,  # 传递实体ID用于节流控制
         )
         
         if success:
-            _LOGGER.debug(f"Light {self._attr_name} turn on command sent")
+            _LOGGER.debug("Light %s turn on command sent", self._attr_name)
             # 1. 立即更新设备状态为目标值
             self._update_device_state_immediately(1)
             # 2. 安排2秒后的状态同步
@@ -168,16 +166,14 @@ class HYQWAdapterLight(CoordinatorEntity, LightEntity):
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
         success = await self.coordinator.async_control_device(
-            device_id=self._device_id,
-            st=self._device["st"],
-            si=self._device["si"],
-            fn=DEVICE_FUNCTIONS["light"]["turn_off"]["fn"],
-            fv=DEVICE_FUNCTIONS["light"]["turn_off"]["fv"],
+            **self._control_base,
+            fn=_LIGHT_OFF_FN,
+            fv=_LIGHT_OFF_FV,
             entity_id=self.entity_id,  # 传递实体ID用于节流控制
         )
         
         if success:
-            _LOGGER.debug(f"Light {self._attr_name} turn off command sent")
+            _LOGGER.debug("Light %s turn off command sent", self._attr_name)
             # 1. 立即更新设备状态为目标值
             self._update_device_state_immediately(0)
             # 2. 安排2秒后的状态同步
@@ -188,21 +184,18 @@ class HYQWAdapterLight(CoordinatorEntity, LightEntity):
         old_device = self._device.copy()
         
         # 更新设备信息
-        if self.coordinator.data and "devices" in self.coordinator.data:
-            for device in self.coordinator.data["devices"]:
-                if device["deviceId"] == self._device_id:
-                    self._device = device
-                    
-                    # 记录设备数据更新
-                    old_states = old_device.get("current_states", {})
-                    new_states = device.get("current_states", {})
-                    
-                    if old_states != new_states:
-                        _LOGGER.info(f"Light {self._attr_name} (si={device.get('si')}) device data updated")
-                        _LOGGER.debug(f"  Old states: {old_states}")
-                        _LOGGER.debug(f"  New states: {new_states}")
-                    
-                    break
+        device = self.coordinator.get_device_by_id(self._device_id)
+        if device is not None:
+            self._device = device
+            
+            # 记录设备数据更新
+            old_states = old_device.get("current_states", {})
+            new_states = device.get("current_states", {})
+            
+            if old_states != new_states:
+                _LOGGER.info("Light %s (si=%s) device data updated", self._attr_name, device.get('si'))
+                _LOGGER.debug("  Old states: %s", old_states)
+                _LOGGER.debug("  New states: %s", new_states)
         
         super()._handle_coordinator_update()
     
@@ -1,6 +1,6 @@
 """MQTT管理实体 - MQTT Management Entities for HYQW Adapter"""
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.components.text import TextEntity
@@ -31,6 +31,44 @@ from .replay_recorder import start_ac_full, start_floor_full, start_freshair_ful
 
 _LOGGER = logging.getLogger(__name__)
 
+# 每个配置条目共享同一份MQTT管理设备信息，避免每个实体重复构建
+_DEVICE_INFO_CACHE: Dict[str, DeviceInfo] = {}
+
+
+def _get_device_info(entry_id: str) -> DeviceInfo:
+    """获取（并缓存）指定配置条目的MQTT管理设备信息"""
+    device_info = _DEVICE_INFO_CACHE.get(entry_id)
+    if device_info is None:
+        device_info = _DEVICE_INFO_CACHE[entry_id] = DeviceInfo(
+            identifiers={(DOMAIN, f"{entry_id}_mqtt")},
+            name="HYQW MQTT管理",
+            manufacturer="HYQW Adapter",
+            model="MQTT Gateway",
+            # 移除 via_device 引用以避免引用不存在的设备
+            # via_device=(DOMAIN, entry_id),
+        )
+    return device_info
+
+
+# 兜底巡检间隔值 -> 选项名 的反向映射
+_FALLBACK_INTERVAL_TO_OPTION = {
+    value: option for option, value in MQTT_CONFIG["fallback_check_intervals"].items()
+}
+
+
+# 本地广播状态文本：(已启用, MQTT已连接) -> 状态
+_BROADCAST_STATUS = {
+    (True, True): "正在广播",
+    (True, False): "等待MQTT连接",
+    (False, True): "未启用",
+    (False, False): "未启用",
+}
+
+
+def clear_device_info_cache(entry_id: str) -> None:
+    """卸载配置条目时清除对应的设备信息缓存"""
+    _DEVICE_INFO_CACHE.pop(entry_id, None)
+
 
 async def async_setup_mqtt_entities(
     hass: HomeAssistant,
@@ -39,40 +77,8 @@ async def async_setup_mqtt_entities(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """设置MQTT管理实体"""
-    entities = []
-    
-    
-    # MQTT配置文本实体
-    entities.append(MqttHostText(coordinator, config_entry))
-    entities.append(MqttUsernameText(coordinator, config_entry))
-    entities.append(MqttPasswordText(coordinator, config_entry))
-    entities.append(MqttClientIdText(coordinator, config_entry))
-    
-    # MQTT选择实体
-    entities.append(MqttFallbackIntervalSelect(coordinator, config_entry))
-    
-    # 回放开关与录制控制（开关实体现在在switch.py中注册）
-    entities.append(StartCurtainFullRecordButton(coordinator, config_entry))
-    entities.append(RecordStatusSensor(coordinator, config_entry))
-    entities.append(RecordCurrentDeviceSensor(coordinator, config_entry))
-    entities.append(RecordCurrentCommandSensor(coordinator, config_entry))
-    entities.append(RecordCurrentStateSensor(coordinator, config_entry))
-    entities.append(RecordOverallProgressSensor(coordinator, config_entry))
-    entities.append(StartACFullRecordButton(coordinator, config_entry))
-    entities.append(StartFloorFullRecordButton(coordinator, config_entry))
-    entities.append(StartFreshAirFullRecordButton(coordinator, config_entry))
-    entities.append(StartLightFullRecordButton(coordinator, config_entry))
-    
-    # MQTT操作按钮
-    entities.append(MqttApplyAndReconnectButton(coordinator, config_entry))
-    entities.append(MqttResetStatsButton(coordinator, config_entry))
-    
-    # MQTT状态传感器
-    entities.append(MqttStatusSensor(coordinator, config_entry))
-    entities.append(MqttStatsSensor(coordinator, config_entry))
-    
-    # 实体名称设置按钮
-    entities.append(SetEntityNameButton(coordinator, config_entry))
+    entities = [cls(coordinator, config_entry) for cls in _MQTT_ENTITY_CLASSES]
+    entities.extend(create_full_record_buttons(coordinator, config_entry))
     
     async_add_entities(entities)
     _LOGGER.info(f"已添加{len(entities)}个MQTT管理实体")
@@ -81,68 +87,84 @@ async def async_setup_mqtt_entities(
 class MqttBaseEntity(Entity):
     """MQTT实体基类"""
     
+    _attr_entity_category = EntityCategory.CONFIG
+    # unique_id 后缀，实际 unique_id 为 "{entry_id}_{后缀}"
+    _unique_id_suffix: str = ""
+    
     def __init__(self, coordinator, config_entry: ConfigEntry):
         """初始化基类"""
         super().__init__()
         self.coordinator = coordinator
         self.config_entry = config_entry
         self.hass = coordinator.hass
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, f"{config_entry.entry_id}_mqtt")},
-            name="HYQW MQTT管理",
-            manufacturer="HYQW Adapter",
-            model="MQTT Gateway",
-            # 移除 via_device 引用以避免引用不存在的设备
-            # via_device=(DOMAIN, config_entry.entry_id),
+        self._attr_device_info = _get_device_info(config_entry.entry_id)
+        if self._unique_id_suffix:
+            self._attr_unique_id = f"{config_entry.entry_id}_{self._unique_id_suffix}"
+        # MQTT网关与状态同步路由器在协调器初始化时创建，之后不再替换
+        self.mqtt_gateway = getattr(coordinator, 'mqtt_gateway', None)
+        self.state_sync_router = getattr(coordinator, 'state_sync_router', None)
+        self._bind_options()
+    
+    def _bind_options(self) -> None:
+        """绑定当前配置选项的 get 方法（选项字典在每次更新时整体替换）"""
+        self._get_option = self.config_entry.options.get
+    
+    async def async_added_to_hass(self) -> None:
+        """注册配置更新监听，选项被替换后重新绑定"""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.config_entry.add_update_listener(self._async_options_updated)
         )
-        self._attr_entity_category = EntityCategory.CONFIG
     
-    @property
-    def mqtt_gateway(self):
-        """获取MQTT网关实例"""
-        return getattr(self.coordinator, 'mqtt_gateway', None)
+    async def _async_options_updated(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        self._bind_options()
     
-    @property
-    def state_sync_router(self):
-        """获取状态同步路由器实例"""
-        return getattr(self.coordinator, 'state_sync_router', None)
+    def _get_staged_option(self, key: str, default: Any = None) -> Any:
+        """获取配置选项值，优先返回尚未写入的暂存值"""
+        pending = self.coordinator.pending_options
+        if key in pending:
+            return pending[key]
+        return self._get_option(key, default)
+    
+    async def _stage_option(self, key: str, value: Any) -> None:
+        """暂存配置选项值，由协调器合并后统一写入"""
+        await self.coordinator.async_stage_option(key, value)
     
-    def _get_option(self, key: str, default: Any = None) -> Any:
-        """从配置选项中获取值"""
-        return self.config_entry.options.get(key, default)
+    async def _flush_staged_options(self) -> None:
+        """立即写入暂存的配置选项，并重新绑定以读到最新值"""
+        await self.coordinator.async_flush_options()
+        self._bind_options()
     
     async def _set_option(self, key: str, value: Any) -> None:
         """设置配置选项值"""
-        new_options = dict(self.config_entry.options)
-        new_options[key] = value
         self.hass.config_entries.async_update_entry(
-            self.config_entry, options=new_options
+            self.config_entry, options={**self.config_entry.options, key: value}
         )
+        # 更新监听为异步调度，先同步重新绑定以便本实体立即读到新值
+        self._bind_options()
 
 
 class MqttConnectionSwitch(MqttBaseEntity, SwitchEntity):
     """MQTT连接开关"""
     
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "08 MQTT连接"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_connection"
-        self._attr_icon = "mdi:mqtt"
+    _attr_name = "08 MQTT连接"
+    _attr_icon = "mdi:mqtt"
+    _unique_id_suffix = "mqtt_connection"
     
     @property
     def is_on(self) -> bool:
         """返回开关状态"""
-        if self.mqtt_gateway:
-            return self.mqtt_gateway.is_connected
-        return False
+        gateway = self.mqtt_gateway
+        return gateway.is_connected if gateway else False
     
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """返回额外状态属性"""
-        if not self.mqtt_gateway:
+        gateway = self.mqtt_gateway
+        if not gateway:
             return {"error": "MQTT网关未初始化"}
         
-        status = self.mqtt_gateway.get_status()
+        status = gateway.get_status_cached()
         return {
             "host": status.get("host"),
             "port": status.get("port"),
@@ -161,7 +183,8 @@ class MqttConnectionSwitch(MqttBaseEntity, SwitchEntity):
         
         _LOGGER.info("手动启动MQTT连接")
         
-        # 配置MQTT连接参数
+        # 配置MQTT连接参数（先写入暂存的文本配置）
+        await self._flush_staged_options()
         host = self._get_option(CONF_MQTT_HOST)
         port = self._get_option(CONF_MQTT_PORT, MQTT_CONFIG["default_port"])
         username = self._get_option(CONF_MQTT_USERNAME)
@@ -195,88 +218,81 @@ class MqttConnectionSwitch(MqttBaseEntity, SwitchEntity):
 class MqttHostText(MqttBaseEntity, TextEntity):
     """MQTT服务器地址文本实体"""
     
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "01 MQTT服务器"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_host"
-        self._attr_icon = "mdi:server"
+    _attr_name = "01 MQTT服务器"
+    _attr_icon = "mdi:server"
+    _unique_id_suffix = "mqtt_host"
     
     @property
     def native_value(self) -> str:
         """返回当前值"""
-        return self._get_option(CONF_MQTT_HOST, "")
+        return self._get_staged_option(CONF_MQTT_HOST, "")
     
     async def async_set_value(self, value: str) -> None:
         """设置值"""
-        await self._set_option(CONF_MQTT_HOST, value)
+        await self._stage_option(CONF_MQTT_HOST, value)
 
 
 class MqttUsernameText(MqttBaseEntity, TextEntity):
     """MQTT用户名文本实体"""
     
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "02 MQTT用户名"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_username"
-        self._attr_icon = "mdi:account"
+    _attr_name = "02 MQTT用户名"
+    _attr_icon = "mdi:account"
+    _unique_id_suffix = "mqtt_username"
     
     @property
     def native_value(self) -> str:
         """返回当前值"""
-        return self._get_option(CONF_MQTT_USERNAME, "")
+        return self._get_staged_option(CONF_MQTT_USERNAME, "")
     
     async def async_set_value(self, value: str) -> None:
         """设置值"""
-        await self._set_option(CONF_MQTT_USERNAME, value)
+        await self._stage_option(CONF_MQTT_USERNAME, value)
 
 
 class MqttPasswordText(MqttBaseEntity, TextEntity):
     """MQTT密码文本实体"""
     
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "03 MQTT密码"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_password"
-        self._attr_icon = "mdi:key"
-        self._attr_mode = "password"  # 密码模式
+    _attr_name = "03 MQTT密码"
+    _attr_icon = "mdi:key"
+    _attr_mode = "password"  # 密码模式
+    _unique_id_suffix = "mqtt_password"
     
     @property
     def native_value(self) -> str:
         """返回当前值"""
-        return self._get_option(CONF_MQTT_PASSWORD, "")
+        return self._get_staged_option(CONF_MQTT_PASSWORD, "")
     
     async def async_set_value(self, value: str) -> None:
         """设置值"""
-        await self._set_option(CONF_MQTT_PASSWORD, value)
+        await self._stage_option(CONF_MQTT_PASSWORD, value)
 
 
 class MqttClientIdText(MqttBaseEntity, TextEntity):
     """MQTT客户端ID文本实体"""
     
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "04 MQTT客户端ID"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_client_id"
-        self._attr_icon = "mdi:identifier"
+    _attr_name = "04 MQTT客户端ID"
+    _attr_icon = "mdi:identifier"
+    _unique_id_suffix = "mqtt_client_id"
     
     @property
     def native_value(self) -> str:
         """返回当前值"""
-        return self._get_option(CONF_MQTT_CLIENT_ID, "")
+        return self._get_staged_option(CONF_MQTT_CLIENT_ID, "")
     
     async def async_set_value(self, value: str) -> None:
         """设置值"""
-        await self._set_option(CONF_MQTT_CLIENT_ID, value)
+        await self._stage_option(CONF_MQTT_CLIENT_ID, value)
 
 
 class MqttFallbackIntervalSelect(MqttBaseEntity, SelectEntity):
     """MQTT兜底巡检间隔选择实体"""
     
+    _attr_name = "05 MQTT兜底巡检间隔"
+    _attr_icon = "mdi:timer"
+    _unique_id_suffix = "mqtt_fallback_interval"
+    
     def __init__(self, coordinator, config_entry: ConfigEntry):
         super().__init__(coordinator, config_entry)
-        self._attr_name = "05 MQTT兜底巡检间隔"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_fallback_interval"
-        self._attr_icon = "mdi:timer"
         self._attr_options = list(MQTT_CONFIG["fallback_check_intervals"].keys())
     
     @property
@@ -284,11 +300,8 @@ class MqttFallbackIntervalSelect(MqttBaseEntity, SelectEntity):
         """返回当前选项"""
         interval = self._get_option(CONF_MQTT_FALLBACK_INTERVAL, MQTT_CONFIG["default_fallback_interval"])
         
-        # 根据间隔值找到对应的选项
-        for option, value in MQTT_CONFIG["fallback_check_intervals"].items():
-            if value == interval:
-                return option
-        return "10m"  # 默认值
+        # 根据间隔值找到对应的选项，找不到时使用默认值
+        return _FALLBACK_INTERVAL_TO_OPTION.get(interval, "10m")
     
     async def async_select_option(self, option: str) -> None:
         """选择选项"""
@@ -303,11 +316,16 @@ class MqttFallbackIntervalSelect(MqttBaseEntity, SelectEntity):
 class MqttStartupEnableSwitch(MqttBaseEntity, SwitchEntity):
     """MQTT默认启动开关"""
     
+    _attr_name = "06 MQTT默认启动"
+    _attr_icon = "mdi:power-on"
+    _unique_id_suffix = "mqtt_startup_enable"
+    
     def __init__(self, coordinator, config_entry: ConfigEntry):
         super().__init__(coordinator, config_entry)
-        self._attr_name = "06 MQTT默认启动"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_startup_enable"
-        self._attr_icon = "mdi:power-on"
+        self._static_attrs = {
+            "description": "控制插件启动时是否默认启用MQTT连接",
+            "default_value": MQTT_CONFIG["default_startup_enable"],
+        }
     
     @property
     def is_on(self) -> bool:
@@ -317,11 +335,7 @@ class MqttStartupEnableSwitch(MqttBaseEntity, SwitchEntity):
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """返回额外状态属性"""
-        return {
-            "description": "控制插件启动时是否默认启用MQTT连接",
-            "default_value": MQTT_CONFIG["default_startup_enable"],
-            "current_value": self.is_on,
-        }
+        return {**self._static_attrs, "current_value": self.is_on}
     
     async def async_turn_on(self, **kwargs) -> None:
         """开启默认启动"""
@@ -337,11 +351,9 @@ class MqttStartupEnableSwitch(MqttBaseEntity, SwitchEntity):
 class MqttOptimisticEchoSwitch(MqttBaseEntity, SwitchEntity):
     """MQTT乐观回显开关"""
     
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "07 MQTT乐观回显"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_optimistic_echo"
-        self._attr_icon = "mdi:flash"
+    _attr_name = "07 MQTT乐观回显"
+    _attr_icon = "mdi:flash"
+    _unique_id_suffix = "mqtt_optimistic_echo"
     
     @property
     def is_on(self) -> bool:
@@ -363,12 +375,19 @@ class MqttOptimisticEchoSwitch(MqttBaseEntity, SwitchEntity):
 
 class MqttLocalBroadcastSwitch(MqttBaseEntity, SwitchEntity):
     """MQTT本地广播开关：启用后定期向配置的主题发送毫秒时间戳"""
+
+    _attr_name = "09 启用本地广播"
+    _attr_icon = "mdi:bullhorn"
+    _attr_available = True
+    _unique_id_suffix = "mqtt_local_broadcast"
+
     def __init__(self, coordinator, config_entry: ConfigEntry):
         super().__init__(coordinator, config_entry)
-        self._attr_name = "09 启用本地广播"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_local_broadcast"
-        self._attr_icon = "mdi:bullhorn"
-        self._attr_available = True
+        self._static_attrs = {
+            "description": f"启用后每{MQTT_CONFIG['local_broadcast_interval']}s向{MQTT_CONFIG['local_broadcast_topic']}发送毫秒时间戳",
+            "topic": MQTT_CONFIG['local_broadcast_topic'],
+            "interval": f"{MQTT_CONFIG['local_broadcast_interval']}秒",
+        }
 
     @property
     def is_on(self) -> bool:
@@ -377,20 +396,13 @@ class MqttLocalBroadcastSwitch(MqttBaseEntity, SwitchEntity):
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """返回额外状态属性"""
-        attrs = {
-            "description": f"启用后每{MQTT_CONFIG['local_broadcast_interval']}s向{MQTT_CONFIG['local_broadcast_topic']}发送毫秒时间戳",
-            "topic": MQTT_CONFIG['local_broadcast_topic'],
-            "interval": f"{MQTT_CONFIG['local_broadcast_interval']}秒",
-        }
+        attrs = dict(self._static_attrs)
         
-        if self.mqtt_gateway:
-            attrs["mqtt_connected"] = self.mqtt_gateway.is_connected
-            if self.is_on and self.mqtt_gateway.is_connected:
-                attrs["status"] = "正在广播"
-            elif self.is_on and not self.mqtt_gateway.is_connected:
-                attrs["status"] = "等待MQTT连接"
-            else:
-                attrs["status"] = "未启用"
+        gateway = self.mqtt_gateway
+        if gateway:
+            connected = gateway.is_connected
+            attrs["mqtt_connected"] = connected
+            attrs["status"] = _BROADCAST_STATUS[(bool(self.is_on), bool(connected))]
         else:
             attrs["status"] = "MQTT网关未初始化"
             
@@ -414,11 +426,10 @@ class MqttLocalBroadcastSwitch(MqttBaseEntity, SwitchEntity):
 
 class ReplayEnabledSwitch(MqttBaseEntity, SwitchEntity):
     """回放模式开关"""
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "10 报文重放模式"
-        self._attr_unique_id = f"{config_entry.entry_id}_replay_enabled"
-        self._attr_icon = "mdi:script-text-outline"
+
+    _attr_name = "10 报文重放模式"
+    _attr_icon = "mdi:script-text-outline"
+    _unique_id_suffix = "replay_enabled"
 
     @property
     def is_on(self) -> bool:
@@ -431,216 +442,183 @@ class ReplayEnabledSwitch(MqttBaseEntity, SwitchEntity):
         await self._set_option(CONF_REPLAY_ENABLED, False)
 
 
-class StartCurtainFullRecordButton(MqttBaseEntity, ButtonEntity):
-    """开始窗帘全量穷举录制"""
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "22 开始窗帘全量录制"
-        self._attr_unique_id = f"{config_entry.entry_id}_start_curtain_record"
-        self._attr_icon = "mdi:curtains"
-        self._attr_entity_category = EntityCategory.CONFIG
-
-    async def async_press(self) -> None:
-        try:
-            await self.coordinator.replay_recorder.start_curtain_full()
-        except Exception as err:
-            _LOGGER.error(f"启动窗帘录制失败: {err}")
+class FullRecordButton(MqttBaseEntity, ButtonEntity):
+    """开始某类设备的全量录制"""
 
+    _attr_entity_category = EntityCategory.CONFIG
 
-class StartACFullRecordButton(MqttBaseEntity, ButtonEntity):
-    """开始空调全量录制"""
-    def __init__(self, coordinator, config_entry: ConfigEntry):
+    def __init__(self, coordinator, config_entry: ConfigEntry, name: str, unique_suffix: str,
+                 icon: str, label: str, starter: Callable[[Any], Awaitable[None]]):
         super().__init__(coordinator, config_entry)
-        self._attr_name = "23 开始空调全量录制"
-        self._attr_unique_id = f"{config_entry.entry_id}_start_ac_record"
-        self._attr_icon = "mdi:air-conditioner"
-        self._attr_entity_category = EntityCategory.CONFIG
+        self._attr_name = name
+        self._attr_unique_id = f"{config_entry.entry_id}_{unique_suffix}"
+        self._attr_icon = icon
+        self._label = label
+        self._starter = starter
 
     async def async_press(self) -> None:
         try:
-            await start_ac_full(self.coordinator.replay_recorder)
+            await self._starter(self.coordinator.replay_recorder)
         except Exception as err:
-            _LOGGER.error(f"启动空调录制失败: {err}")
+            _LOGGER.error(f"启动{self._label}录制失败: {err}")
 
 
-class StartFloorFullRecordButton(MqttBaseEntity, ButtonEntity):
-    """开始地暖全量录制"""
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "24 开始地暖全量录制"
-        self._attr_unique_id = f"{config_entry.entry_id}_start_floor_record"
-        self._attr_icon = "mdi:radiator"
-        self._attr_entity_category = EntityCategory.CONFIG
+# 全量录制按钮定义：(名称, unique_id后缀, 图标, 设备类别, 启动函数)
+_FULL_RECORD_BUTTONS = (
+    ("22 开始窗帘全量录制", "start_curtain_record", "mdi:curtains", "窗帘",
+     lambda recorder: recorder.start_curtain_full()),
+    ("23 开始空调全量录制", "start_ac_record", "mdi:air-conditioner", "空调", start_ac_full),
+    ("24 开始地暖全量录制", "start_floor_record", "mdi:radiator", "地暖", start_floor_full),
+    ("25 开始新风全量录制", "start_freshair_record", "mdi:fan", "新风", start_freshair_full),
+    ("26 开始灯具全量录制", "start_light_record", "mdi:lightbulb-on", "灯具", start_light_full),
+)
 
-    async def async_press(self) -> None:
-        try:
-            await start_floor_full(self.coordinator.replay_recorder)
-        except Exception as err:
-            _LOGGER.error(f"启动地暖录制失败: {err}")
 
+def create_full_record_buttons(coordinator, config_entry: ConfigEntry) -> List[FullRecordButton]:
+    """按定义表创建全部全量录制按钮"""
+    return [
+        FullRecordButton(coordinator, config_entry, *spec)
+        for spec in _FULL_RECORD_BUTTONS
+    ]
 
-class StartFreshAirFullRecordButton(MqttBaseEntity, ButtonEntity):
-    """开始新风全量录制"""
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "25 开始新风全量录制"
-        self._attr_unique_id = f"{config_entry.entry_id}_start_freshair_record"
-        self._attr_icon = "mdi:fan"
-        self._attr_entity_category = EntityCategory.CONFIG
 
-    async def async_press(self) -> None:
-        try:
-            await start_freshair_full(self.coordinator.replay_recorder)
-        except Exception as err:
-            _LOGGER.error(f"启动新风录制失败: {err}")
+class RecordStatusSensor(MqttBaseEntity, SensorEntity):
+    """录制状态传感器"""
 
+    _attr_name = "92 录制状态"
+    _attr_icon = "mdi:progress-clock"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unique_id_suffix = "record_status"
 
-class StartLightFullRecordButton(MqttBaseEntity, ButtonEntity):
-    """开始灯具全量录制"""
     def __init__(self, coordinator, config_entry: ConfigEntry):
         super().__init__(coordinator, config_entry)
-        self._attr_name = "26 开始灯具全量录制"
-        self._attr_unique_id = f"{config_entry.entry_id}_start_light_record"
-        self._attr_icon = "mdi:lightbulb-on"
-        self._attr_entity_category = EntityCategory.CONFIG
-
-    async def async_press(self) -> None:
-        try:
-            await start_light_full(self.coordinator.replay_recorder)
-        except Exception as err:
-            _LOGGER.error(f"启动灯具录制失败: {err}")
-
+        self._recorder = getattr(coordinator, "replay_recorder", None)
 
-class RecordStatusSensor(MqttBaseEntity, SensorEntity):
-    """录制状态传感器"""
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "92 录制状态"
-        self._attr_unique_id = f"{config_entry.entry_id}_record_status"
-        self._attr_icon = "mdi:progress-clock"
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        # 订阅状态变化
-        try:
-            self.coordinator.replay_recorder.add_status_listener(self._schedule_update)
-        except Exception:
-            pass
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # 订阅状态变化（实体移除时自动取消）
+        if self._recorder is not None:
+            self._recorder.add_status_listener(self._schedule_update)
+            self.async_on_remove(
+                lambda: self._recorder.remove_status_listener(self._schedule_update)
+            )
 
     @property
     def native_value(self) -> str:
-        running = self.coordinator.replay_recorder.is_running() if hasattr(self.coordinator, 'replay_recorder') else False
+        running = self._recorder.is_running() if self._recorder is not None else False
         return "运行中" if running else "空闲"
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
-        try:
-            return {
-                "text": self.coordinator.replay_recorder.get_status_text(),
-                **self.coordinator.replay_recorder.get_status(),
-            }
-        except Exception:
+        if self._recorder is None:
             return {}
+        return {
+            "text": self._recorder.get_status_text(),
+            **self._recorder.get_status_snapshot(),
+        }
 
     def _schedule_update(self) -> None:
-        try:
-            self.async_schedule_update_ha_state()
-        except Exception:
-            pass
+        # 录制器已将通知合并到事件循环中执行，这里直接写入状态
+        self.async_write_ha_state()
 
 
 class _BaseRecordDiagSensor(MqttBaseEntity, SensorEntity):
-    """录制诊断传感器基类（挂到MQTT管理设备）"""
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        # 订阅状态变化
-        try:
-            self.coordinator.replay_recorder.add_status_listener(self._schedule_update)
-        except Exception:
-            pass
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+    """录制诊断传感器基类（挂到MQTT管理设备）
 
-    def _schedule_update(self) -> None:
-        try:
-            self.async_schedule_update_ha_state()
-        except Exception:
-            pass
+    子类实现 _compute_native()；值缓存在实例上，仅在变化时写入状态。
+    """
 
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-class RecordCurrentDeviceSensor(_BaseRecordDiagSensor):
     def __init__(self, coordinator, config_entry: ConfigEntry):
         super().__init__(coordinator, config_entry)
-        self._attr_name = "93 录制-当前设备"
-        self._attr_unique_id = f"{config_entry.entry_id}_record_current_device"
-        self._attr_icon = "mdi:tag"
+        # 录制器在协调器初始化时即已创建，这里只解析一次
+        self._recorder = getattr(coordinator, "replay_recorder", None)
+        self._cached_native = self._compute_native(self._status())
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # 订阅状态变化（实体移除时自动取消）
+        if self._recorder is not None:
+            self._recorder.add_status_listener(self._schedule_update)
+            self.async_on_remove(
+                lambda: self._recorder.remove_status_listener(self._schedule_update)
+            )
+
+    def _status(self) -> Dict[str, Any]:
+        """当前录制状态快照（录制器不存在时返回空字典）"""
+        if self._recorder is None:
+            return {}
+        return self._recorder.get_status_snapshot()
+
+    def _compute_native(self, s: Dict[str, Any]) -> str:
+        return "-"
 
     @property
     def native_value(self) -> str:
-        try:
-            s = self.coordinator.replay_recorder.get_status()
-            return s.get("current_device") or "-"
-        except Exception:
-            return "-"
+        return self._cached_native
+
+    def _schedule_update(self) -> None:
+        new_value = self._compute_native(self._status())
+        if new_value == self._cached_native:
+            return
+        self._cached_native = new_value
+        # 录制器已将通知合并到事件循环中执行，这里直接写入状态
+        self.async_write_ha_state()
+
+
+class RecordCurrentDeviceSensor(_BaseRecordDiagSensor):
+    _attr_name = "93 录制-当前设备"
+    _attr_icon = "mdi:tag"
+    _unique_id_suffix = "record_current_device"
+
+    def _compute_native(self, s: Dict[str, Any]) -> str:
+        return s.get("current_device") or "-"
 
 
 class RecordCurrentCommandSensor(_BaseRecordDiagSensor):
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "94 录制-请求指令"
-        self._attr_unique_id = f"{config_entry.entry_id}_record_current_command"
-        self._attr_icon = "mdi:code-tags"
+    _attr_name = "94 录制-请求指令"
+    _attr_icon = "mdi:code-tags"
+    _unique_id_suffix = "record_current_command"
 
-    @property
-    def native_value(self) -> str:
-        try:
-            s = self.coordinator.replay_recorder.get_status()
-            fn = s.get("current_fn")
-            fv = s.get("current_fv")
-            idx = s.get("current_cmd_index", 0)
-            total = s.get("current_cmd_total", 0)
-            return f"fn={fn},fv={fv} ( {idx} / {total} )"
-        except Exception:
+    def _compute_native(self, s: Dict[str, Any]) -> str:
+        if not s:
             return "-"
+        fn = s.get("current_fn")
+        fv = s.get("current_fv")
+        idx = s.get("current_cmd_index", 0)
+        total = s.get("current_cmd_total", 0)
+        return f"fn={fn},fv={fv} ( {idx} / {total} )"
 
 
 class RecordCurrentStateSensor(_BaseRecordDiagSensor):
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "95 录制-当前状态"
-        self._attr_unique_id = f"{config_entry.entry_id}_record_current_state"
-        self._attr_icon = "mdi:information-outline"
+    _attr_name = "95 录制-当前状态"
+    _attr_icon = "mdi:information-outline"
+    _unique_id_suffix = "record_current_state"
 
-    @property
-    def native_value(self) -> str:
-        try:
-            s = self.coordinator.replay_recorder.get_status()
-            return s.get("current_state") or "-"
-        except Exception:
-            return "-"
+    def _compute_native(self, s: Dict[str, Any]) -> str:
+        return s.get("current_state") or "-"
 
 
 class RecordOverallProgressSensor(_BaseRecordDiagSensor):
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "96 录制-总进度"
-        self._attr_unique_id = f"{config_entry.entry_id}_record_overall_progress"
-        self._attr_icon = "mdi:progress-check"
+    _attr_name = "96 录制-总进度"
+    _attr_icon = "mdi:progress-check"
+    _unique_id_suffix = "record_overall_progress"
 
-    @property
-    def native_value(self) -> str:
-        try:
-            s = self.coordinator.replay_recorder.get_status()
-            processed = s.get("processed_devices", 0)
-            total = s.get("total_devices", 0)
-            return f"{processed} / {total}"
-        except Exception:
-            return "0 / 0"
+    def _compute_native(self, s: Dict[str, Any]) -> str:
+        processed = s.get("processed_devices", 0)
+        total = s.get("total_devices", 0)
+        return f"{processed} / {total}"
 
 
 class RecordFailedCommandsSensor(_BaseRecordDiagSensor):
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "97 录制-失败指令"
-        self._attr_unique_id = f"{config_entry.entry_id}_record_failed_commands"
-        self._attr_icon = "mdi:alert-circle-outline"
+    _attr_name = "97 录制-失败指令"
+    _attr_icon = "mdi:alert-circle-outline"
+    _unique_id_suffix = "record_failed_commands"
+
+    def _schedule_update(self) -> None:
+        # 失败列表的内容可能在条数不变时更新，始终写入状态
+        self.async_write_ha_state()
 
     @property
     def native_value(self) -> str:
@@ -665,13 +643,11 @@ class RecordFailedCommandsSensor(_BaseRecordDiagSensor):
 class MqttApplyAndReconnectButton(MqttBaseEntity, ButtonEntity):
     """MQTT应用配置并重连按钮"""
     
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "20 MQTT应用配置并重连"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_apply_reconnect"
-        self._attr_icon = "mdi:refresh"
-        self._attr_available = True
-        self._attr_entity_category = EntityCategory.CONFIG
+    _attr_name = "20 MQTT应用配置并重连"
+    _attr_icon = "mdi:refresh"
+    _attr_available = True
+    _attr_entity_category = EntityCategory.CONFIG
+    _unique_id_suffix = "mqtt_apply_reconnect"
     
     async def async_press(self) -> None:
         """按钮被按下"""
@@ -681,7 +657,8 @@ class MqttApplyAndReconnectButton(MqttBaseEntity, ButtonEntity):
         
         _LOGGER.info("手动触发MQTT重连")
         
-        # 重新配置MQTT参数
+        # 重新配置MQTT参数（先写入暂存的文本配置）
+        await self._flush_staged_options()
         host = self._get_option(CONF_MQTT_HOST)
         port = self._get_option(CONF_MQTT_PORT, MQTT_CONFIG["default_port"])
         username = self._get_option(CONF_MQTT_USERNAME)
@@ -708,13 +685,11 @@ class MqttApplyAndReconnectButton(MqttBaseEntity, ButtonEntity):
 class MqttResetStatsButton(MqttBaseEntity, ButtonEntity):
     """MQTT重置统计按钮"""
     
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "21 MQTT重置统计"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_reset_stats"
-        self._attr_icon = "mdi:counter"
-        self._attr_available = True
-        self._attr_entity_category = EntityCategory.CONFIG
+    _attr_name = "21 MQTT重置统计"
+    _attr_icon = "mdi:counter"
+    _attr_available = True
+    _attr_entity_category = EntityCategory.CONFIG
+    _unique_id_suffix = "mqtt_reset_stats"
     
     async def async_press(self) -> None:
         """按钮被按下"""
@@ -730,21 +705,20 @@ class MqttResetStatsButton(MqttBaseEntity, ButtonEntity):
 class MqttStatusSensor(MqttBaseEntity, SensorEntity):
     """MQTT状态传感器"""
     
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "90 MQTT状态"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_status"
-        self._attr_icon = "mdi:information"
-        # 传感器应该使用 DIAGNOSTIC 而不是 CONFIG
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_name = "90 MQTT状态"
+    _attr_icon = "mdi:information"
+    # 传感器应该使用 DIAGNOSTIC 而不是 CONFIG
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unique_id_suffix = "mqtt_status"
     
     @property
     def native_value(self) -> str:
         """返回传感器值"""
-        if not self.mqtt_gateway:
+        gateway = self.mqtt_gateway
+        if not gateway:
             return "未初始化"
         
-        if self.mqtt_gateway.is_connected:
+        if gateway.is_connected:
             return "已连接"
         else:
             return "未连接"
@@ -752,11 +726,13 @@ class MqttStatusSensor(MqttBaseEntity, SensorEntity):
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """返回额外状态属性"""
-        if not self.mqtt_gateway or not self.state_sync_router:
+        gateway = self.mqtt_gateway
+        router = self.state_sync_router
+        if not gateway or not router:
             return {}
         
-        mqtt_status = self.mqtt_gateway.get_status()
-        router_status = self.state_sync_router.get_status()
+        mqtt_status = gateway.get_status_cached()
+        router_status = router.get_status()
         
         return {
             "current_mode": router_status.get("current_mode"),
@@ -773,35 +749,37 @@ class MqttStatusSensor(MqttBaseEntity, SensorEntity):
 class MqttStatsSensor(MqttBaseEntity, SensorEntity):
     """MQTT统计传感器"""
     
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "91 MQTT统计"
-        self._attr_unique_id = f"{config_entry.entry_id}_mqtt_stats"
-        self._attr_icon = "mdi:chart-line"
-        # 传感器应该使用 DIAGNOSTIC 而不是 CONFIG
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_name = "91 MQTT统计"
+    _attr_icon = "mdi:chart-line"
+    # 传感器应该使用 DIAGNOSTIC 而不是 CONFIG
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unique_id_suffix = "mqtt_stats"
     
     @property
     def native_value(self) -> int:
         """返回传感器值（消息总数）"""
-        if not self.mqtt_gateway:
+        gateway = self.mqtt_gateway
+        if not gateway:
             return 0
         
-        status = self.mqtt_gateway.get_status()
+        status = gateway.get_status_cached()
         return status.get("stats", {}).get("messages_received", 0)
     
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """返回额外状态属性"""
-        if not self.mqtt_gateway or not self.state_sync_router:
+        gateway = self.mqtt_gateway
+        router = self.state_sync_router
+        if not gateway or not router:
             return {}
         
-        mqtt_stats = self.mqtt_gateway.get_status().get("stats", {})
-        router_stats = self.state_sync_router.get_status().get("stats", {})
+        mqtt_stats = gateway.get_status_cached().get("stats", {})
+        router_stats = router.get_status().get("stats", {})
         
         return {
             "mqtt_messages_parsed": mqtt_stats.get("messages_parsed", 0),
             "mqtt_parse_errors": mqtt_stats.get("parse_errors", 0),
+            "mqtt_dropped_messages": mqtt_stats.get("dropped_messages", 0),
             "mqtt_reconnect_count": mqtt_stats.get("reconnect_count", 0),
             "router_mode_switches": router_stats.get("mode_switches", 0),
             "router_mqtt_updates": router_stats.get("mqtt_state_updates", 0),
@@ -813,12 +791,10 @@ class MqttStatsSensor(MqttBaseEntity, SensorEntity):
 class SetEntityNameButton(MqttBaseEntity, ButtonEntity):
     """设置实体名称按钮"""
     
-    def __init__(self, coordinator, config_entry: ConfigEntry):
-        super().__init__(coordinator, config_entry)
-        self._attr_name = "30 设置实体名称"
-        self._attr_unique_id = f"{config_entry.entry_id}_set_entity_name"
-        self._attr_icon = "mdi:rename-box"
-        self._attr_entity_category = EntityCategory.CONFIG
+    _attr_name = "30 设置实体名称"
+    _attr_icon = "mdi:rename-box"
+    _attr_entity_category = EntityCategory.CONFIG
+    _unique_id_suffix = "set_entity_name"
     
     async def async_press(self) -> None:
         """按钮被按下 - 显示设置实体名称的说明"""
@@ -837,3 +813,29 @@ class SetEntityNameButton(MqttBaseEntity, ButtonEntity):
         _LOGGER.info("")
         _LOGGER.info("注意：修改后的名称不会被插件重置，可以安全使用。")
         _LOGGER.info("=" * 60)
+
+
+# async_setup_mqtt_entities 创建的实体类（按注册顺序）
+_MQTT_ENTITY_CLASSES = (
+    # MQTT配置文本实体
+    MqttHostText,
+    MqttUsernameText,
+    MqttPasswordText,
+    MqttClientIdText,
+    # MQTT选择实体
+    MqttFallbackIntervalSelect,
+    # 录制状态传感器（开关实体在switch.py中注册，录制按钮由定义表创建）
+    RecordStatusSensor,
+    RecordCurrentDeviceSensor,
+    RecordCurrentCommandSensor,
+    RecordCurrentStateSensor,
+    RecordOverallProgressSensor,
+    # MQTT操作按钮
+    MqttApplyAndReconnectButton,
+    MqttResetStatsButton,
+    # MQTT状态传感器
+    MqttStatusSensor,
+    MqttStatsSensor,
+    # 实体名称设置按钮
+    SetEntityNameButton,
+)
@@ -3,11 +3,11 @@ import asyncio
 import json
 import logging
 import time
-import threading
 from typing import Callable, Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import paho.mqtt.client as mqtt
+from homeassistant.util.json import json_loads
 
 from .const import MQTT_CONFIG
 
@@ -52,22 +52,29 @@ class MqttGateway:
         self.client: Optional[mqtt.Client] = None
         self.connection_task: Optional[asyncio.Task] = None
         self._reconnect_task: Optional[asyncio.Task] = None
+        self._immediate_sync_task: Optional[asyncio.Task] = None
         self._should_reconnect = True
         self._main_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connected_event = asyncio.Event()  # 收到CONNACK(rc=0)时置位
+        self._disconnected_event = asyncio.Event()  # 连接断开时置位，连接循环据此退出
+        # 主事件循环就绪前提交的回调，start()记录循环后统一执行
+        self._pending_startup: List[Callable[[], None]] = []
         
         # 统计信息
         self.stats = {
             "connection_attempts": 0,
             "successful_connections": 0,
             "connection_failures": 0,
-            "messages_received": 0,
-            "messages_parsed": 0,
-            "parse_errors": 0,
-            "last_message_time": None,
             "last_error": None,
-            "uptime_start": None,
             "reconnect_count": 0,
         }
+        # 高频消息计数使用实例属性，时间使用单调时钟，仅在 get_status() 中转换
+        self._msg_count = 0
+        self._parsed_count = 0
+        self._parse_errors = 0
+        self._dropped_messages = 0  # 入站队列满时丢弃的消息数（背压），与解析错误分开统计
+        self._last_msg_mono = 0.0
+        self._uptime_start_mono: Optional[float] = None
         
         # 订阅主题（默认仅订阅状态上报）
         self.topics = [
@@ -78,12 +85,33 @@ class MqttGateway:
         self._recording_downstream = False
         self._down_message_callback = None  # type: Optional[Callable[[str, bytes], None]]
         
+        # 主题分发表：topic -> handler(topic, payload)，在主事件循环中调用
+        self._dispatch: Dict[str, Callable[[str, bytes], None]] = {
+            topic: self._handle_message for topic in self.topics
+        }
+        
+        # 统一入站队列：paho线程只投递(topic, payload)，由单个消费任务批量分发
+        self._ingress: asyncio.Queue = asyncio.Queue(maxsize=MQTT_CONFIG["ingress_queue_size"])
+        self._ingress_task: Optional[asyncio.Task] = None
+        
         # 本地广播相关
         self._local_broadcast_enabled: bool = False
         self._local_broadcast_task: Optional[asyncio.Task] = None
         self._local_broadcast_interval_seconds: int = MQTT_CONFIG["local_broadcast_interval"]
         self._local_broadcast_topic: str = MQTT_CONFIG["local_broadcast_topic"]
         
+        # 状态上报合并投递：短时间内的多条状态合并为一次回调
+        self._pending_states: List[Dict] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # 进行中的投递任务（同一时刻至多一个，持有引用防止被回收）
+        self._flush_task: Optional[asyncio.Task] = None
+        self._batch_count: int = MQTT_CONFIG["batch_count"]
+        self._idle_flush_seconds: float = MQTT_CONFIG["idle_flush_ms"] / 1000
+        
+        # 状态快照缓存（同一轮实体状态刷新内共享）
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_cache_time = 0.0
+        
         _LOGGER.info(f"MQTT网关初始化完成 - 项目:{project_code}, 设备:{device_sn}")
     
     def configure(self, host: str, port: int = None, username: str = None, 
@@ -163,7 +191,17 @@ class MqttGateway:
                 self._main_loop = asyncio.get_running_loop()
             except RuntimeError:
                 self._main_loop = None
+            if self._main_loop and (self._ingress_task is None or self._ingress_task.done()):
+                self._ingress_task = asyncio.create_task(
+                    self._ingress_consumer(), name="mqtt_ingress"
+                )
+            if self._main_loop and self._pending_startup:
+                pending, self._pending_startup = self._pending_startup, []
+                for fn in pending:
+                    self._main_loop.call_soon(fn)
             self.stats["connection_attempts"] += 1
+            self._connected_event.clear()
+            self._disconnected_event.clear()
             
             # 创建MQTT客户端
             _LOGGER.debug(f"创建MQTT客户端，客户端ID: '{self.client_id}'")
@@ -190,16 +228,15 @@ class MqttGateway:
             self.connection_task = asyncio.create_task(self._connection_loop())
             
             # 等待连接建立（最多10秒）
-            for i in range(100):  # 10秒 = 100 * 0.1秒
-                if self.is_connected:
-                    break
-                await asyncio.sleep(0.1)
-                if i % 10 == 0:  # 每秒打印一次状态
-                    _LOGGER.debug(f"等待MQTT连接建立... ({i/10:.1f}s)")
+            _LOGGER.debug("等待MQTT连接建立...")
+            try:
+                await asyncio.wait_for(self._connected_event.wait(), timeout=10.0)
+            except asyncio.TimeoutError:
+                pass
             
             if self.is_connected:
                 self.stats["successful_connections"] += 1
-                self.stats["uptime_start"] = datetime.now()
+                self._uptime_start_mono = time.monotonic()
                 self.stats["last_error"] = None
                 _LOGGER.info("MQTT连接成功建立")
                 return True
@@ -238,6 +275,15 @@ class MqttGateway:
             except asyncio.CancelledError:
                 pass
         
+        # 停止立即同步任务
+        if self._immediate_sync_task and not self._immediate_sync_task.done():
+            self._immediate_sync_task.cancel()
+            try:
+                await self._immediate_sync_task
+            except asyncio.CancelledError:
+                pass
+        self._immediate_sync_task = None
+        
         # 断开客户端
         if self.client:
             try:
@@ -253,9 +299,23 @@ class MqttGateway:
                 pass
         self._local_broadcast_task = None
         
+        # 停止入站消费任务
+        if self._ingress_task and not self._ingress_task.done():
+            self._ingress_task.cancel()
+            try:
+                await self._ingress_task
+            except asyncio.CancelledError:
+                pass
+        self._ingress_task = None
+        
+        # 等待进行中的投递完成，再投递尚未处理的状态
+        if self._flush_task is not None:
+            await asyncio.shield(self._flush_task)
+        await self._flush_pending_states()
+        
         self.is_connected = False
         self.client = None
-        self.stats["uptime_start"] = None
+        self._uptime_start_mono = None
         _LOGGER.info("MQTT连接已停止")
 
     # ===== 录制/回放辅助 =====
@@ -265,6 +325,10 @@ class MqttGateway:
         """
         self._recording_downstream = enabled
         self._down_message_callback = on_message
+        if enabled and on_message:
+            self._dispatch[self._down_topic] = self._handle_down_message
+        else:
+            self._dispatch.pop(self._down_topic, None)
         # 若已连接，则动态订阅/退订
         if self.client and self.is_connected:
             try:
@@ -324,22 +388,16 @@ class MqttGateway:
             self.client.loop_start()
             _LOGGER.debug("MQTT网络循环已启动")
             
-            # 等待连接建立
-            await asyncio.sleep(2)  # 增加等待时间
+            # 等待连接建立（订阅与立即同步由 _on_connect 在收到CONNACK时发起）
+            try:
+                await asyncio.wait_for(self._connected_event.wait(), timeout=10.0)
+            except asyncio.TimeoutError:
+                pass
             
             if self.is_connected:
-                _LOGGER.info("MQTT连接已建立，开始订阅主题")
-                # 订阅主题
-                for topic in self.topics:
-                    result = self.client.subscribe(topic)
-                    if result[0] == mqtt.MQTT_ERR_SUCCESS:
-                        _LOGGER.info(f"已订阅主题: {topic}")
-                    else:
-                        _LOGGER.error(f"订阅主题失败: {topic}, 错误码: {result[0]}")
-                
-                # 保持连接循环运行
-                while self._should_reconnect and self.is_connected:
-                    await asyncio.sleep(1)
+                _LOGGER.info("MQTT连接已建立")
+                # 挂起直至断开（stop()会直接取消本任务）
+                await self._disconnected_event.wait()
             else:
                 _LOGGER.error("MQTT连接建立失败")
                 self.stats["connection_failures"] += 1
@@ -351,63 +409,49 @@ class MqttGateway:
             self.stats["last_error"] = str(err)
             _LOGGER.error(f"MQTT连接循环出现异常: {err}")
         finally:
-            if self.client:
-                try:
-                    self.client.loop_stop()
-                except Exception as err:
-                    _LOGGER.debug(f"停止MQTT网络循环时出现异常: {err}")
-            self.is_connected = False
-            _LOGGER.info("MQTT连接循环已结束")
+            self._stop_network_loop()
+    
+    async def _keep_alive_loop(self) -> None:
+        """复用客户端重连后的连接循环：保持运行直至断开或停止"""
+        try:
+            await self._disconnected_event.wait()
+        except asyncio.CancelledError:
+            _LOGGER.debug("MQTT连接循环被取消")
+        finally:
+            self._stop_network_loop()
+    
+    def _stop_network_loop(self) -> None:
+        """停止paho网络循环并标记为未连接"""
+        if self.client:
+            try:
+                self.client.loop_stop()
+            except Exception as err:
+                _LOGGER.debug("停止MQTT网络循环时出现异常: %s", err)
+        self.is_connected = False
+        _LOGGER.info("MQTT连接循环已结束")
     
     def _on_connect(self, client, userdata, flags, rc):
         """MQTT连接回调"""
         if rc == 0:
             self.is_connected = True
+            if self._main_loop:
+                self._main_loop.call_soon_threadsafe(self._connected_event.set)
             _LOGGER.info("MQTT客户端连接成功")
             self.stats["successful_connections"] += 1
-            self.stats["uptime_start"] = datetime.now()
+            self._uptime_start_mono = time.monotonic()
             self.stats["last_error"] = None
             
-            # 连接成功后立即执行状态同步
+            # 连接成功后立即执行状态同步，与下面的主题订阅并行进行
             if self.fallback_callback:
-                # 始终通过线程切回主线程安全调度，避免在paho线程直接触碰事件循环
-                def schedule_on_main_thread():
-                    try:
-                        loop = asyncio.get_running_loop()
-                        loop.call_soon_threadsafe(lambda: asyncio.create_task(self._perform_immediate_sync()))
-                    except RuntimeError:
-                        # 主循环尚未就绪，稍后再试
-                        threading.Timer(1.0, schedule_on_main_thread).start()
-                threading.Timer(0.1, schedule_on_main_thread).start()
-            # 订阅必要主题
-            try:
-                # 永久订阅状态主题
-                for topic in self.topics:
-                    result = self.client.subscribe(topic)
-                    if result[0] == mqtt.MQTT_ERR_SUCCESS:
-                        _LOGGER.info(f"已订阅主题: {topic}")
-                    else:
-                        _LOGGER.error(f"订阅主题失败: {topic}, 错误码: {result[0]}")
-                # 录制时订阅下行控制主题
-                if self._recording_downstream:
-                    res = self.client.subscribe(self._down_topic)
-                    if res[0] == mqtt.MQTT_ERR_SUCCESS:
-                        _LOGGER.info(f"已订阅下行主题: {self._down_topic}")
-                    else:
-                        _LOGGER.error(f"订阅下行主题失败: {res[0]}")
-            except Exception as err:
-                _LOGGER.error(f"连接后订阅主题失败: {err}")
+                # 切回主事件循环调度，避免在paho线程直接触碰事件循环
+                self._call_on_main_loop(self._start_immediate_sync)
+            # 订阅必要主题（仅在此处订阅，连接循环不再重复订阅）
+            self._subscribe_all(client)
             # 若启用本地广播，确保任务运行
             try:
-                if getattr(self, "_local_broadcast_enabled", False):
+                if self._local_broadcast_enabled:
                     # 通过主事件循环启动任务，避免在paho线程中直接创建
-                    def _start_lb():
-                        try:
-                            loop = asyncio.get_running_loop()
-                            loop.call_soon_threadsafe(lambda: asyncio.create_task(self._local_broadcast_loop()))
-                        except RuntimeError:
-                            threading.Timer(1.0, _start_lb).start()
-                    _start_lb()
+                    self._call_on_main_loop(self._start_local_broadcast)
             except Exception as err:
                 _LOGGER.error(f"启动本地广播任务失败: {err}")
         else:
@@ -425,9 +469,25 @@ class MqttGateway:
             self.stats["connection_failures"] += 1
             self.stats["last_error"] = error_msg
     
+    def _subscribe_all(self, client) -> None:
+        """以一次SUBSCRIBE订阅状态主题；录制时同时订阅下行控制主题"""
+        subs = [(topic, 0) for topic in self.topics]
+        if self._recording_downstream:
+            subs.append((self._down_topic, 0))
+        try:
+            result = client.subscribe(subs)
+            if result[0] == mqtt.MQTT_ERR_SUCCESS:
+                _LOGGER.info("已订阅主题: %s", ", ".join(topic for topic, _ in subs))
+            else:
+                _LOGGER.error("订阅主题失败, 错误码: %s", result[0])
+        except Exception as err:
+            _LOGGER.error("连接后订阅主题失败: %s", err)
+    
     def _on_disconnect(self, client, userdata, rc):
         """MQTT断开连接回调"""
         self.is_connected = False
+        if self._main_loop:
+            self._main_loop.call_soon_threadsafe(self._disconnected_event.set)
         if rc != 0:
             # 详细的断开连接错误码说明
             disconnect_messages = {
@@ -444,70 +504,66 @@ class MqttGateway:
             self.stats["last_error"] = f"意外断开连接: {error_msg}"
             # 启动重连（使用线程安全的方式）
             if self._should_reconnect:
-                try:
-                    loop = asyncio.get_running_loop()
-                    # 如果有运行中的事件循环，使用call_soon_threadsafe，并在事件循环线程中做并发保护
-                    def _schedule_reconnect():
-                        # 仅允许存在一个重连任务
-                        if self._reconnect_task and not self._reconnect_task.done():
-                            _LOGGER.debug("已有自动重连任务在运行，跳过新建")
-                            return
-                        task = asyncio.create_task(self._auto_reconnect())
-                        self._reconnect_task = task
-                        # 任务完成后清理引用
-                        def _clear_ref(_):
-                            if self._reconnect_task is task:
-                                self._reconnect_task = None
-                        task.add_done_callback(_clear_ref)
-                    loop.call_soon_threadsafe(_schedule_reconnect)
-                except RuntimeError:
-                    # 没有运行中的事件循环，记录警告但不启动重连
-                    _LOGGER.warning("没有运行中的事件循环，无法启动自动重连")
+                # 切回主事件循环，在事件循环线程中做并发保护
+                self._call_on_main_loop(self._schedule_reconnect)
         else:
             _LOGGER.info("MQTT正常断开连接")
     
     def _on_message(self, client, userdata, msg):
-        """MQTT消息接收回调"""
+        """MQTT消息接收回调：已订阅主题的报文统一投递到入站队列"""
+        topic = msg.topic
+        if topic not in self._dispatch:
+            return
+        loop = self._main_loop
+        if loop and loop.is_running():
+            loop.call_soon_threadsafe(self._ingress_put, (topic, msg.payload))
+        else:
+            _LOGGER.debug("主事件循环未就绪，丢弃一条MQTT消息")
+    
+    def _ingress_put(self, item) -> None:
+        """入队（在主事件循环中调用）；队列满时丢弃并计数"""
         try:
-            # 创建消息对象以保持兼容性
-            class Message:
-                def __init__(self, topic, payload):
-                    self.topic = topic
-                    self.payload = payload
-            
-            message = Message(msg.topic, msg.payload)
-
-            # 录制期的下行报文：优先回调并直接返回（不进入JSON解析）
-            if self._recording_downstream and msg.topic == self._down_topic and self._down_message_callback:
+            self._ingress.put_nowait(item)
+        except asyncio.QueueFull:
+            self._dropped_messages += 1
+            _LOGGER.warning("MQTT入站队列已满，丢弃一条消息")
+    
+    async def _ingress_consumer(self) -> None:
+        """入站队列消费任务：一次唤醒处理多条消息，按主题分发"""
+        queue = self._ingress
+        batch_max = MQTT_CONFIG["ingress_batch_max"]
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < batch_max and not queue.empty():
+                batch.append(queue.get_nowait())
+            for topic, payload in batch:
+                handler = self._dispatch.get(topic)
+                if handler is None:
+                    continue
                 try:
-                    if self._main_loop and self._main_loop.is_running():
-                        self._main_loop.call_soon_threadsafe(lambda: self._down_message_callback(msg.topic, msg.payload))
-                    else:
-                        self._down_message_callback(msg.topic, msg.payload)
+                    handler(topic, payload)
                 except Exception as err:
-                    _LOGGER.error(f"处理下行录制回调失败: {err}")
-                return
-
-            # 其它消息：仅在主事件循环中处理，避免线程问题
-            if self._main_loop and self._main_loop.is_running():
-                self._main_loop.call_soon_threadsafe(
-                    lambda: asyncio.create_task(self._handle_message(message))
-                )
-            else:
-                _LOGGER.debug("主事件循环未就绪，丢弃一条MQTT消息")
-                
+                    _LOGGER.error("MQTT消息回调处理失败: %s", err)
+                    self._parse_errors += 1
+    
+    def _handle_down_message(self, topic: str, payload: bytes) -> None:
+        """录制期的下行报文：直接回调（不进入JSON解析）"""
+        callback = self._down_message_callback
+        if callback is None:
+            return
+        try:
+            callback(topic, payload)
         except Exception as err:
-            _LOGGER.error(f"MQTT消息回调处理失败: {err}")
-            self.stats["parse_errors"] += 1
+            _LOGGER.error("处理下行录制回调失败: %s", err)
     
     def _on_log(self, client, userdata, level, buf):
-        """MQTT日志回调"""
+        """MQTT日志回调（paho逐包输出，DEBUG未开启时直接跳过）"""
         if level == mqtt.MQTT_LOG_ERR:
-            _LOGGER.error(f"MQTT错误: {buf}")
+            _LOGGER.error("MQTT错误: %s", buf)
         elif level == mqtt.MQTT_LOG_WARNING:
-            _LOGGER.warning(f"MQTT警告: {buf}")
-        else:
-            _LOGGER.debug(f"MQTT日志: {buf}")
+            _LOGGER.warning("MQTT警告: %s", buf)
+        elif _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("MQTT日志: %s", buf)
 
     # ===== 本地广播支持 =====
     def set_local_broadcast_enabled(self, enabled: bool) -> None:
@@ -516,150 +572,168 @@ class MqttGateway:
         """
         self._local_broadcast_enabled = enabled
         if enabled:
-            # 确保任务运行
-            try:
-                loop = asyncio.get_running_loop()
-                loop.call_soon_threadsafe(lambda: asyncio.create_task(self._local_broadcast_loop()))
-            except RuntimeError:
-                # 若主循环未就绪，则稍后再试
-                def _delayed_start():
-                    try:
-                        loop2 = asyncio.get_running_loop()
-                        loop2.call_soon_threadsafe(lambda: asyncio.create_task(self._local_broadcast_loop()))
-                    except RuntimeError:
-                        threading.Timer(1.0, _delayed_start).start()
-                threading.Timer(0.2, _delayed_start).start()
+            # 确保任务运行（主循环未就绪时由start()补执行）
+            self._call_on_main_loop(self._start_local_broadcast)
             _LOGGER.info("本地广播已启用")
         else:
             _LOGGER.info("本地广播已禁用")
 
+    def _call_on_main_loop(self, fn: Callable[[], None]) -> None:
+        """在主事件循环中执行fn；循环尚未就绪时暂存，由start()统一执行"""
+        loop = self._main_loop
+        if loop and loop.is_running():
+            loop.call_soon_threadsafe(fn)
+        else:
+            self._pending_startup.append(fn)
+
+    def _schedule_reconnect(self) -> None:
+        """在事件循环中创建自动重连任务（仅允许存在一个）"""
+        if self._reconnect_task and not self._reconnect_task.done():
+            _LOGGER.debug("已有自动重连任务在运行，跳过新建")
+            return
+        self._reconnect_task = asyncio.create_task(
+            self._auto_reconnect(), name="mqtt_auto_reconnect"
+        )
+
+    def _start_local_broadcast(self) -> None:
+        """在事件循环中创建本地广播任务（已在运行时跳过）"""
+        if self._local_broadcast_task and not self._local_broadcast_task.done():
+            return
+        self._local_broadcast_task = asyncio.create_task(
+            self._local_broadcast_loop(), name="mqtt_local_broadcast"
+        )
+
+    def _start_immediate_sync(self) -> None:
+        """在事件循环中创建连接后的立即同步任务（已在运行时跳过）"""
+        if self._immediate_sync_task and not self._immediate_sync_task.done():
+            return
+        self._immediate_sync_task = asyncio.create_task(
+            self._perform_immediate_sync(), name="mqtt_immediate_sync"
+        )
+
     async def _local_broadcast_loop(self) -> None:
         """循环发送本地广播（毫秒时间戳）。
-        注意：允许存在多个并行启动请求，但循环开始时会自我去重。
+        任务引用由 _start_local_broadcast 维护并负责去重。
         """
-        # 去重：若已有运行中的任务引用，直接返回（尽量避免重复任务）
-        if getattr(self, "_local_broadcast_task", None) and not self._local_broadcast_task.done():
-            return
-        self._local_broadcast_task = asyncio.current_task()
+        # 主题与间隔在运行期间不变；client 会随重连替换，每次循环重新读取
+        topic = self._local_broadcast_topic
+        interval = self._local_broadcast_interval_seconds
         try:
-            while getattr(self, "_local_broadcast_enabled", False):
+            while self._local_broadcast_enabled:
                 try:
-                    if self.client and self.is_connected:
-                        millis = int(time.time() * 1000)
-                        payload = str(millis)
-                        info = self.client.publish(self._local_broadcast_topic, payload, qos=0, retain=False)
+                    client = self.client
+                    if client and self.is_connected:
+                        millis = time.time_ns() // 1_000_000
+                        payload = str(millis).encode("ascii")
+                        info = client.publish(topic, payload, qos=0, retain=False)
                         if info.rc == mqtt.MQTT_ERR_SUCCESS:
-                            _LOGGER.debug(f"已发送本地广播: {payload}")
+                            _LOGGER.debug("已发送本地广播: %s", millis)
                         else:
                             _LOGGER.warning(f"发送本地广播失败 rc={info.rc}")
                     else:
                         _LOGGER.debug("未连接MQTT，跳过一次本地广播")
                 except Exception as err:
                     _LOGGER.error(f"本地广播发送异常: {err}")
-                await asyncio.sleep(getattr(self, "_local_broadcast_interval_seconds", 15))
+                await asyncio.sleep(interval)
         except asyncio.CancelledError:
             pass
         finally:
-            # 退出时清理引用
-            if getattr(self, "_local_broadcast_task", None) is asyncio.current_task():
-                self._local_broadcast_task = None
+            self._local_broadcast_task = None
             _LOGGER.debug("本地广播任务结束")
     
     async def _auto_reconnect(self):
-        """自动重连"""
-        if not self._should_reconnect:
-            return
-        
-        reconnect_intervals = MQTT_CONFIG["reconnect_intervals"]
-        max_interval = MQTT_CONFIG["max_reconnect_interval"]
+        """自动重连
         
-        for interval in reconnect_intervals:
+        优先复用现有paho客户端重连，连续失败达到上限后再通过start()重建客户端。
+        """
+        try:
             if not self._should_reconnect:
-                break
-            
-            _LOGGER.info(f"MQTT自动重连，等待{interval}秒...")
-            await asyncio.sleep(interval)
+                return
             
-            if not self._should_reconnect:
-                break
+            reconnect_intervals = MQTT_CONFIG["reconnect_intervals"]
+            max_interval = MQTT_CONFIG["max_reconnect_interval"]
+            reuse_attempts = MQTT_CONFIG["client_reuse_attempts"]
+            failures = 0
+            attempt = 0
             
+            while self._should_reconnect:
+                if attempt < len(reconnect_intervals):
+                    interval = reconnect_intervals[attempt]
+                    _LOGGER.info("MQTT自动重连，等待%s秒...", interval)
+                else:
+                    interval = max_interval
+                    _LOGGER.info("MQTT重连失败，等待%s秒后重试...", interval)
+                attempt += 1
+                await asyncio.sleep(interval)
+                
+                if not self._should_reconnect:
+                    break
+                
+                try:
+                    if self.client is not None and failures < reuse_attempts:
+                        ok = await self._reconnect_existing_client()
+                    else:
+                        ok = await self.start()
+                    if ok:
+                        _LOGGER.info("MQTT自动重连成功")
+                        self.stats["reconnect_count"] += 1
+                        return
+                except Exception as err:
+                    _LOGGER.error("MQTT自动重连失败: %s", err)
+                failures += 1
+        finally:
+            # 结束后释放任务引用
+            self._reconnect_task = None
+    
+    async def _reconnect_existing_client(self) -> bool:
+        """复用现有paho客户端重连（保留回调与内部状态，避免重建客户端）"""
+        client = self.client
+        # 等待上一轮连接循环退出，避免其收尾的loop_stop与本次重连交错
+        if self.connection_task and not self.connection_task.done():
             try:
-                if await self.start():
-                    _LOGGER.info("MQTT自动重连成功")
-                    self.stats["reconnect_count"] += 1
-                    return
-            except Exception as err:
-                _LOGGER.error(f"MQTT自动重连失败: {err}")
+                await self.connection_task
+            except asyncio.CancelledError:
+                pass
         
-        # 如果所有重连间隔都失败，使用最大间隔继续重连
-        while self._should_reconnect:
-            _LOGGER.info(f"MQTT重连失败，等待{max_interval}秒后重试...")
-            await asyncio.sleep(max_interval)
-            
-            if not self._should_reconnect:
-                break
-            
-            try:
-                if await self.start():
-                    _LOGGER.info("MQTT自动重连成功")
-                    self.stats["reconnect_count"] += 1
-                    return
-            except Exception as err:
-                _LOGGER.error(f"MQTT自动重连失败: {err}")
-    
-    async def _handle_message(self, message) -> None:
-        """处理接收到的MQTT消息（异步版本）"""
-        self.stats["messages_received"] += 1
-        self.stats["last_message_time"] = datetime.now()
+        self.stats["connection_attempts"] += 1
+        self._connected_event.clear()
+        self._disconnected_event.clear()
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, client.reconnect)
+        except Exception as err:
+            self.stats["connection_failures"] += 1
+            self.stats["last_error"] = str(err)
+            _LOGGER.debug("复用MQTT客户端重连失败: %s", err)
+            return False
         
-        topic = message.topic
-        payload = message.payload.decode('utf-8')
+        client.loop_start()
+        try:
+            await asyncio.wait_for(self._connected_event.wait(), timeout=10.0)
+        except asyncio.TimeoutError:
+            pass
         
-        _LOGGER.debug(f"收到MQTT消息 - 主题:{topic}, 载荷:{payload}")
+        if not self.is_connected:
+            client.loop_stop()
+            self.stats["connection_failures"] += 1
+            self.stats["last_error"] = "连接超时"
+            return False
         
-        try:
-            # 解析JSON载荷
-            data = json.loads(payload)
-            
-            # 提取状态数据
-            if "payload" in data and isinstance(data["payload"], dict):
-                payload_data = data["payload"]
-                
-                # 标准化状态数据
-                state_data = self._normalize_state_data(payload_data)
-                
-                if state_data:
-                    self.stats["messages_parsed"] += 1
-                    _LOGGER.debug(f"解析状态数据: {state_data}")
-                    
-                    # 回调状态更新
-                    if self.state_callback:
-                        await self._safe_callback([state_data])
-                else:
-                    _LOGGER.debug("消息载荷不包含有效状态数据")
-            else:
-                _LOGGER.debug("消息格式不符合预期")
-                
-        except json.JSONDecodeError as err:
-            _LOGGER.error(f"JSON解析失败: {err}")
-            self.stats["parse_errors"] += 1
-        except Exception as err:
-            _LOGGER.error(f"消息处理异常: {err}")
-            self.stats["parse_errors"] += 1
+        # 由连接循环维持运行并负责收尾
+        self.connection_task = asyncio.create_task(self._keep_alive_loop())
+        return True
     
-    def _handle_message_sync(self, message) -> None:
-        """处理接收到的MQTT消息（同步版本）"""
-        self.stats["messages_received"] += 1
-        self.stats["last_message_time"] = datetime.now()
-        
-        topic = message.topic
-        payload = message.payload.decode('utf-8')
+    def _handle_message(self, topic: str, payload: bytes) -> None:
+        """处理接收到的MQTT消息（在主事件循环中调用）"""
+        self._msg_count += 1
+        self._last_msg_mono = time.monotonic()
         
-        _LOGGER.debug(f"收到MQTT消息 - 主题:{topic}, 载荷:{payload}")
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            _LOGGER.debug("收到MQTT消息 - 主题:%s, 载荷:%s", topic, payload)
         
         try:
-            # 解析JSON载荷
-            data = json.loads(payload)
+            # 解析JSON载荷（orjson 直接解析 bytes，无需先解码）
+            data = json_loads(payload)
             
             # 提取状态数据
             if "payload" in data and isinstance(data["payload"], dict):
@@ -669,37 +743,24 @@ class MqttGateway:
                 state_data = self._normalize_state_data(payload_data)
                 
                 if state_data:
-                    self.stats["messages_parsed"] += 1
-                    _LOGGER.debug(f"解析状态数据: {state_data}")
+                    self._parsed_count += 1
+                    if debug:
+                        _LOGGER.debug("解析状态数据: %s", state_data)
                     
-                    # 回调状态更新（同步调用）
+                    # 暂存后合并回调状态更新
                     if self.state_callback:
-                        try:
-                            if asyncio.iscoroutinefunction(self.state_callback):
-                                # 如果是异步回调，尝试在新的事件循环中运行
-                                try:
-                                    loop = asyncio.new_event_loop()
-                                    asyncio.set_event_loop(loop)
-                                    loop.run_until_complete(self._safe_callback([state_data]))
-                                    loop.close()
-                                except Exception as err:
-                                    _LOGGER.error(f"异步回调执行失败: {err}")
-                            else:
-                                # 同步回调直接调用
-                                self.state_callback([state_data])
-                        except Exception as err:
-                            _LOGGER.error(f"状态回调执行失败: {err}")
+                        self._enqueue_state(state_data)
                 else:
                     _LOGGER.debug("消息载荷不包含有效状态数据")
             else:
                 _LOGGER.debug("消息格式不符合预期")
                 
         except json.JSONDecodeError as err:
-            _LOGGER.error(f"JSON解析失败: {err}")
-            self.stats["parse_errors"] += 1
+            _LOGGER.error("JSON解析失败: %s", err)
+            self._parse_errors += 1
         except Exception as err:
-            _LOGGER.error(f"消息处理异常: {err}")
-            self.stats["parse_errors"] += 1
+            _LOGGER.error("消息处理异常: %s", err)
+            self._parse_errors += 1
     
     def _normalize_state_data(self, payload_data: Dict) -> Optional[Dict]:
         """标准化状态数据
@@ -710,29 +771,15 @@ class MqttGateway:
         Returns:
             标准化的状态数据或None
         """
-        try:
-            # 提取必需字段
-            st = payload_data.get("st")
-            si = payload_data.get("si")  
-            fn = payload_data.get("fn")
-            fv = payload_data.get("fv")
-            
-            # 验证必需字段
-            if st is None or si is None or fn is None or fv is None:
-                _LOGGER.debug(f"状态数据缺少必需字段: st={st}, si={si}, fn={fn}, fv={fv}")
-                return None
-            
-            # 返回标准化数据
-            return {
-                "st": st,
-                "si": si,
-                "fn": fn,
-                "fv": fv,
-            }
-            
-        except Exception as err:
-            _LOGGER.error(f"状态数据标准化失败: {err}")
+        get = payload_data.get
+        st, si, fn, fv = get("st"), get("si"), get("fn"), get("fv")
+        
+        # 验证必需字段（dict.get 不会抛异常，无需 try/except）
+        if st is None or si is None or fn is None or fv is None:
+            _LOGGER.debug("状态数据缺少必需字段: st=%s, si=%s, fn=%s, fv=%s", st, si, fn, fv)
             return None
+        
+        return {"st": st, "si": si, "fn": fn, "fv": fv}
     
     async def _perform_immediate_sync(self) -> None:
         """MQTT连接成功后立即执行状态同步"""
@@ -761,6 +808,45 @@ class MqttGateway:
         except Exception as err:
             _LOGGER.error(f"立即状态同步失败: {err}")
     
+    def _enqueue_state(self, state_data: Dict) -> None:
+        """暂存一条状态，达到批量上限或等待超时后统一投递"""
+        self._pending_states.append(state_data)
+        if self._flush_task is not None:
+            # 进行中的投递任务结束前会一并投递新暂存的状态
+            return
+        if len(self._pending_states) >= self._batch_count:
+            self._start_flush()
+        elif self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self._idle_flush_seconds, self._start_flush)
+    
+    def _start_flush(self) -> None:
+        """启动投递任务（已有任务在进行时不重复创建）"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is None and self._pending_states:
+            self._flush_task = asyncio.get_running_loop().create_task(self._run_flush())
+    
+    async def _run_flush(self) -> None:
+        """投递任务：循环投递直到暂存为空"""
+        try:
+            while self._pending_states:
+                await self._flush_pending_states()
+        finally:
+            self._flush_task = None
+    
+    async def _flush_pending_states(self) -> None:
+        """投递所有暂存的状态"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending_states:
+            return
+        batch = self._pending_states
+        self._pending_states = []
+        await self._safe_callback(batch)
+    
     async def _safe_callback(self, states: List[Dict]) -> None:
         """安全调用状态回调"""
         try:
@@ -773,31 +859,60 @@ class MqttGateway:
     
     def get_status(self) -> Dict[str, Any]:
         """获取MQTT网关状态"""
+        now_mono = time.monotonic()
+        now = datetime.now()
+        uptime_start = self._uptime_start_mono
+        last_msg = self._last_msg_mono
+        stats = self.stats.copy()
+        stats["messages_received"] = self._msg_count
+        stats["messages_parsed"] = self._parsed_count
+        stats["parse_errors"] = self._parse_errors
+        stats["dropped_messages"] = self._dropped_messages
+        stats["last_message_time"] = (
+            now - timedelta(seconds=now_mono - last_msg) if last_msg else None
+        )
+        stats["uptime_start"] = (
+            now - timedelta(seconds=now_mono - uptime_start)
+            if uptime_start is not None else None
+        )
         status = {
             "connected": self.is_connected,
             "host": self.host,
             "port": self.port,
             "client_id": self.client_id,
             "topics": self.topics,
-            "stats": self.stats.copy(),
+            "stats": stats,
         }
         
-        if self.is_connected and self.stats["uptime_start"]:
-            uptime = datetime.now() - self.stats["uptime_start"]
-            status["uptime_seconds"] = uptime.total_seconds()
+        if self.is_connected and uptime_start is not None:
+            status["uptime_seconds"] = now_mono - uptime_start
         
         return status
     
+    def get_status_cached(self, max_age: float = 1.0) -> Dict[str, Any]:
+        """获取MQTT网关状态的共享快照（只读）
+        
+        多个诊断实体在同一轮刷新中读取状态时复用同一份快照，
+        超过 max_age 秒后重新生成。
+        """
+        now = time.monotonic()
+        if self._status_cache is None or now - self._status_cache_time > max_age:
+            self._status_cache = self.get_status()
+            self._status_cache_time = now
+        return self._status_cache
+    
     def reset_stats(self) -> None:
         """重置统计信息"""
         self.stats.update({
             "connection_attempts": 0,
             "successful_connections": 0,
             "connection_failures": 0,
-            "messages_received": 0,
-            "messages_parsed": 0,
-            "parse_errors": 0,
-            "last_message_time": None,
             "reconnect_count": 0,
         })
+        self._msg_count = 0
+        self._parsed_count = 0
+        self._parse_errors = 0
+        self._dropped_messages = 0
+        self._last_msg_mono = 0.0
+        self._status_cache = None
         _LOGGER.info("MQTT网关统计信息已重置")
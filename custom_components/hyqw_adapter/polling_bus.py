@@ -2,12 +2,33 @@
 import asyncio
 import logging
 import time
+from dataclasses import asdict, dataclass
+from types import MappingProxyType
 from typing import Callable, Dict, Any, Optional
 from datetime import datetime, timedelta
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _wall_time(mono: float) -> str:
+    """将单调时钟时间点换算为本地时钟字符串（仅用于日志与状态展示）"""
+    return datetime.fromtimestamp(time.time() + mono - time.monotonic()).strftime('%H:%M:%S')
+
+
+@dataclass(slots=True)
+class PollingStats:
+    """轮询统计信息"""
+    long_polling_count: int = 0
+    short_polling_count: int = 0
+    mode_switches: int = 0
+    last_poll_time: Optional[datetime] = None
+    current_mode: str = "long"
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """返回统计信息的字典副本"""
+        return asdict(self)
+
+
 class PollingBus:
     """智能轮询总线类
     
@@ -25,31 +46,32 @@ class PollingBus:
             config: 轮询配置参数
             state_query_callback: 状态查询回调函数
         """
-        self.config = config.copy()
+        # 配置在运行期间不再修改，保存为只读映射，状态查询时无需复制
+        self.config = MappingProxyType(dict(config))
         self.state_query_callback = state_query_callback
         
         # 轮询状态
         self.is_running = False
         self.current_mode = "long"  # long | short
         self.polling_task: Optional[asyncio.Task] = None
+        # 到达下次轮询时间（或轮询时间被提前/推后）时唤醒轮询循环
+        self._wakeup = asyncio.Event()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # 短轮询结束时间点c到达时切换回长轮询
+        self._end_short_handle: Optional[asyncio.TimerHandle] = None
         
-        # 时间戳管理
+        # 时间戳管理（time.monotonic()时间点，不受系统时钟调整影响）
         self.last_operation_time = 0.0
         self.short_polling_end_time = 0.0  # c时间点
         self.next_poll_time = 0.0  # d时间点
         
         # 统计信息
-        self.stats = {
-            "long_polling_count": 0,
-            "short_polling_count": 0,
-            "mode_switches": 0,
-            "last_poll_time": None,
-            "current_mode": "long",
-        }
+        self.stats = PollingStats()
         
-        _LOGGER.info(f"轮询总线初始化完成 - 长轮询:{self.config['long_polling_interval']}s, "
-                    f"短轮询:{self.config['short_polling_interval']}s, "
-                    f"持续时间:{self.config['short_polling_duration']}s")
+        _LOGGER.info("轮询总线初始化完成 - 长轮询:%ss, 短轮询:%ss, 持续时间:%ss",
+                     self.config['long_polling_interval'],
+                     self.config['short_polling_interval'],
+                     self.config['short_polling_duration'])
     
     
     async def start(self) -> None:
@@ -59,7 +81,7 @@ class PollingBus:
             return
         
         self.is_running = True
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # 初始化为长轮询模式
         self.current_mode = "long"
@@ -68,11 +90,13 @@ class PollingBus:
         # 启动轮询任务
         self.polling_task = asyncio.create_task(self._polling_loop())
         
-        _LOGGER.info(f"轮询总线已启动 - 首次轮询将在{self.config['long_polling_interval']}秒后进行")
+        _LOGGER.info("轮询总线已启动 - 首次轮询将在%s秒后进行", self.config['long_polling_interval'])
     
     async def stop(self) -> None:
         """停止轮询总线"""
         self.is_running = False
+        self._cancel_timer()
+        self._cancel_end_short()
         
         if self.polling_task and not self.polling_task.done():
             self.polling_task.cancel()
@@ -88,7 +112,7 @@ class PollingBus:
         
         在用户主动操作设备后调用，启动高频查询模式
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         self.last_operation_time = current_time
         
         # 计算关键时间点
@@ -102,13 +126,17 @@ class PollingBus:
         old_mode = self.current_mode
         self.current_mode = "short"
         
+        # 轮询时间提前，重新定时唤醒轮询循环（否则要等到原长轮询时间点）
+        self._reschedule()
+        self._schedule_end_short(b)
+        
         if old_mode != "short":
-            self.stats["mode_switches"] += 1
-            _LOGGER.info(f"切换到短轮询模式 - 持续{b}秒, 每{a}秒查询一次, "
-                        f"首次查询:{datetime.fromtimestamp(self.next_poll_time).strftime('%H:%M:%S')}, "
-                        f"结束时间:{datetime.fromtimestamp(self.short_polling_end_time).strftime('%H:%M:%S')}")
-        else:
-            _LOGGER.debug(f"延长短轮询模式 - 新结束时间:{datetime.fromtimestamp(self.short_polling_end_time).strftime('%H:%M:%S')}")
+            self.stats.mode_switches += 1
+            if _LOGGER.isEnabledFor(logging.INFO):
+                _LOGGER.info("切换到短轮询模式 - 持续%s秒, 每%s秒查询一次, 首次查询:%s, 结束时间:%s",
+                             b, a, _wall_time(self.next_poll_time), _wall_time(self.short_polling_end_time))
+        elif _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("延长短轮询模式 - 新结束时间:%s", _wall_time(self.short_polling_end_time))
     
     def extend_short_polling(self) -> None:
         """延长短轮询模式
@@ -120,14 +148,16 @@ class PollingBus:
             self.trigger_short_polling()
             return
         
-        current_time = time.time()
+        current_time = time.monotonic()
         self.last_operation_time = current_time
         
         # 更新结束时间点c
         b = self.config["short_polling_duration"]
         self.short_polling_end_time = current_time + b
+        self._schedule_end_short(b)
         
-        _LOGGER.debug(f"延长短轮询模式 - 新的结束时间:{datetime.fromtimestamp(self.short_polling_end_time).strftime('%H:%M:%S')}")
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("延长短轮询模式 - 新的结束时间:%s", _wall_time(self.short_polling_end_time))
     
     def set_short_polling_mode(self) -> None:
         """设置短轮询模式（智能判断当前状态）
@@ -147,17 +177,19 @@ class PollingBus:
     
     async def _polling_loop(self) -> None:
         """轮询主循环"""
+        wakeup = self._wakeup
         try:
             while self.is_running:
-                current_time = time.time()
-                
-                # 等待到下次轮询时间
-                sleep_time = self.next_poll_time - current_time
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
-                
-                if not self.is_running:
-                    break
+                # 等待到下次轮询时间；期间轮询时间被调整时定时器会重新设置
+                if self.next_poll_time > time.monotonic():
+                    self._reschedule()
+                    await wakeup.wait()
+                    
+                    if not self.is_running:
+                        break
+                    # 被提前唤醒（轮询时间已推后）时继续等待
+                    if self.next_poll_time > time.monotonic():
+                        continue
                 
                 # 执行状态查询
                 await self._execute_poll()
@@ -169,94 +201,121 @@ class PollingBus:
             _LOGGER.debug("轮询循环被取消")
             raise
         except Exception as err:
-            _LOGGER.error(f"轮询循环异常: {err}", exc_info=True)
+            _LOGGER.error("轮询循环异常: %s", err, exc_info=True)
+        finally:
+            self._cancel_timer()
+    
+    def _reschedule(self) -> None:
+        """按next_poll_time重新设置唤醒定时器"""
+        if not self.is_running:
+            return
+        self._cancel_timer()
+        self._wakeup.clear()
+        delay = max(0.0, self.next_poll_time - time.monotonic())
+        self._timer = asyncio.get_running_loop().call_later(delay, self._wakeup.set)
+    
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+    
+    def _schedule_end_short(self, duration: float) -> None:
+        """在短轮询结束时间点c安排一次性切换，替代每次轮询检查剩余时间"""
+        if not self.is_running:
+            return
+        self._cancel_end_short()
+        self._end_short_handle = asyncio.get_running_loop().call_later(duration, self._switch_to_long_mode)
+    
+    def _cancel_end_short(self) -> None:
+        if self._end_short_handle is not None:
+            self._end_short_handle.cancel()
+            self._end_short_handle = None
+    
+    def _switch_to_long_mode(self) -> None:
+        """短轮询结束，切换到长轮询"""
+        self._end_short_handle = None
+        if self.current_mode != "short":
+            return
+        self.current_mode = "long"
+        self.next_poll_time = time.monotonic() + self.config["long_polling_interval"]
+        self._reschedule()
+        
+        self.stats.mode_switches += 1
+        if _LOGGER.isEnabledFor(logging.INFO):
+            _LOGGER.info("短轮询结束，切换到长轮询模式 - 下次查询:%s", _wall_time(self.next_poll_time))
     
     async def _execute_poll(self) -> None:
         """执行状态查询"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         try:
             # 更新统计信息
             if self.current_mode == "long":
-                self.stats["long_polling_count"] += 1
+                self.stats.long_polling_count += 1
                 poll_type = "长轮询"
             else:
-                self.stats["short_polling_count"] += 1
+                self.stats.short_polling_count += 1
                 poll_type = "短轮询"
             
-            self.stats["last_poll_time"] = datetime.fromtimestamp(current_time)
-            self.stats["current_mode"] = self.current_mode
+            self.stats.last_poll_time = datetime.now()
+            self.stats.current_mode = self.current_mode
             
             # 短轮询时显示详细信息
             if self.current_mode == "short":
                 remaining_time = self.short_polling_end_time - current_time
-                _LOGGER.info(f"执行{poll_type}查询 - 第{self.stats['short_polling_count']}次, "
-                           f"剩余时间:{remaining_time:.1f}秒")
+                _LOGGER.info("执行%s查询 - 第%s次, 剩余时间:%.1f秒",
+                             poll_type, self.stats.short_polling_count, remaining_time)
             else:
-                _LOGGER.debug(f"执行{poll_type}查询 - 总计{self.stats['long_polling_count']}次")
+                _LOGGER.debug("执行%s查询 - 总计%s次", poll_type, self.stats.long_polling_count)
             
             # 调用状态查询回调
             await self.state_query_callback()
             
         except Exception as err:
-            _LOGGER.error(f"状态查询执行失败: {err}", exc_info=True)
+            _LOGGER.error("状态查询执行失败: %s", err, exc_info=True)
     
     def _calculate_next_poll_time(self) -> None:
         """计算下次轮询时间"""
-        current_time = time.time()
-        
+        # 短轮询的结束由_switch_to_long_mode定时切换，这里只按当前模式取间隔
         if self.current_mode == "short":
-            # 检查是否应该结束短轮询
-            remaining_time = self.short_polling_end_time - current_time
-            if remaining_time <= 0:
-                # 短轮询结束，切换到长轮询
-                self.current_mode = "long"
-                self.next_poll_time = current_time + self.config["long_polling_interval"]
-                
-                self.stats["mode_switches"] += 1
-                _LOGGER.info(f"短轮询结束，切换到长轮询模式 - "
-                           f"下次查询:{datetime.fromtimestamp(self.next_poll_time).strftime('%H:%M:%S')}")
-            else:
-                # 继续短轮询
-                self.next_poll_time = current_time + self.config["short_polling_interval"]
-                _LOGGER.debug(f"继续短轮询 - 下次查询:{datetime.fromtimestamp(self.next_poll_time).strftime('%H:%M:%S')}, "
-                            f"剩余时间:{remaining_time:.1f}秒")
+            self.next_poll_time = time.monotonic() + self.config["short_polling_interval"]
         else:
-            # 长轮询模式
-            self.next_poll_time = current_time + self.config["long_polling_interval"]
-            _LOGGER.debug(f"长轮询模式 - 下次查询:{datetime.fromtimestamp(self.next_poll_time).strftime('%H:%M:%S')}")
+            self.next_poll_time = time.monotonic() + self.config["long_polling_interval"]
+        
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s轮询模式 - 下次查询:%s",
+                          "短" if self.current_mode == "short" else "长", _wall_time(self.next_poll_time))
     
     def get_status(self) -> Dict[str, Any]:
         """获取轮询总线状态"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         status = {
             "is_running": self.is_running,
             "current_mode": self.current_mode,
-            "config": self.config.copy(),
-            "stats": self.stats.copy(),
+            "config": self.config,
+            "stats": self.stats.snapshot(),
         }
         
         if self.is_running:
             status.update({
                 "next_poll_in_seconds": max(0, self.next_poll_time - current_time),
-                "next_poll_time": datetime.fromtimestamp(self.next_poll_time).strftime('%H:%M:%S'),
+                "next_poll_time": _wall_time(self.next_poll_time),
             })
             
             if self.current_mode == "short":
                 status.update({
                     "short_polling_ends_in_seconds": max(0, self.short_polling_end_time - current_time),
-                    "short_polling_end_time": datetime.fromtimestamp(self.short_polling_end_time).strftime('%H:%M:%S'),
+                    "short_polling_end_time": _wall_time(self.short_polling_end_time),
                 })
         
         return status
     
     def reset_stats(self) -> None:
         """重置统计信息"""
-        self.stats.update({
-            "long_polling_count": 0,
-            "short_polling_count": 0,
-            "mode_switches": 0,
-            "last_poll_time": None,
-        })
+        stats = self.stats
+        stats.long_polling_count = 0
+        stats.short_polling_count = 0
+        stats.mode_switches = 0
+        stats.last_poll_time = None
         _LOGGER.info("轮询统计信息已重置")
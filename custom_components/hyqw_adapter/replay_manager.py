@@ -2,7 +2,8 @@
 import asyncio
 import logging
 import os
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 
 import yaml
 
@@ -10,6 +11,18 @@ from .const import REPLAY_STORAGE_FILENAME
 
 _LOGGER = logging.getLogger(__name__)
 
+# 录制期间多次修改合并为一次写盘的延迟（秒）
+_SAVE_DELAY = 1.0
+
+# 优先使用libyaml的C实现，未编译libyaml时回退到纯Python实现
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+@lru_cache(maxsize=256)
+def _hex_decode(payload_hex: str) -> bytes:
+    """解码录制的payload_hex；同一指令重复回放时直接复用解码结果"""
+    return bytes.fromhex(payload_hex)
+
 
 class ReplayStorage:
     """YAML 存储封装"""
@@ -29,7 +42,7 @@ class ReplayStorage:
         try:
             await self.hass.async_add_executor_job(self._sync_load)
         except Exception as err:
-            _LOGGER.error(f"加载回放YAML失败: {err}")
+            _LOGGER.error("加载回放YAML失败: %s", err)
             self._data = {}
 
     def _sync_save(self) -> None:
@@ -37,13 +50,13 @@ class ReplayStorage:
         if base_dir and not os.path.exists(base_dir):
             os.makedirs(base_dir, exist_ok=True)
         with open(self._path, "w", encoding="utf-8") as f:
-            yaml.safe_dump(self._data, f, allow_unicode=True, sort_keys=False)
+            yaml.dump(self._data, f, Dumper=_YAML_DUMPER, allow_unicode=True, sort_keys=False)
 
     async def async_save(self) -> None:
         try:
             await self.hass.async_add_executor_job(self._sync_save)
         except Exception as err:
-            _LOGGER.error(f"保存回放YAML失败: {err}")
+            _LOGGER.error("保存回放YAML失败: %s", err)
 
     def get(self) -> Dict[str, Any]:
         return self._data
@@ -66,9 +79,14 @@ class ReplayManager:
         self.storage = ReplayStorage(hass, hass.config.path("."))
         self._loaded = False
         self._recording = False
-        self._record_event: Optional[asyncio.Event] = None
+        self._capture_future: Optional[asyncio.Future] = None
         self._last_down_payload: Optional[bytes] = None
         self._last_down_topic: Optional[str] = None
+        # si -> 存储中的设备条目（与YAML数据共享同一字典）
+        self._si_index: Dict[int, Dict[str, Any]] = {}
+        # (si, fn, fv) -> 失败列表中的条目（YAML中仍以列表保存）
+        self._failed_index: Dict[Tuple[Any, Any, Any], Dict[str, Any]] = {}
+        self._save_handle: Optional[asyncio.TimerHandle] = None
 
         # 延迟加载，等待 async_setup_entry 调用 async_load()
     async def async_load(self) -> None:
@@ -84,16 +102,27 @@ class ReplayManager:
             }
             self.storage.set(data)
             await self.storage.async_save()
+        self._si_index = {}
+        for dev in data["replay"].get("devices") or []:
+            # 与原线性查找一致：同一si出现多次时以首个条目为准
+            self._si_index.setdefault(dev.get("si"), dev)
+        self._failed_index = {}
+        failed_commands = data["replay"].setdefault("failed_commands", [])
+        for cmd in failed_commands:
+            self._failed_index.setdefault((cmd.get("si"), cmd.get("fn"), cmd.get("fv")), cmd)
+        if len(self._failed_index) != len(failed_commands):
+            # 旧文件中可能存在重复条目，保留每个指令的首个条目
+            failed_commands[:] = self._failed_index.values()
         self._loaded = True
 
     # ====== 回放查询与执行 ======
     def _ensure_device_entry(self, si: int, st: int, type_id: int, name: str) -> Dict[str, Any]:
+        dev = self._si_index.get(si)
+        if dev is not None:
+            return dev
         data = self.storage.get()
         replay = data.setdefault("replay", {})
         devices = replay.setdefault("devices", [])
-        for dev in devices:
-            if dev.get("si") == si:
-                return dev
         new_dev = {
             "si": si,
             "type_id": type_id,
@@ -103,38 +132,36 @@ class ReplayManager:
             "commands": {},
         }
         devices.append(new_dev)
+        self._si_index[si] = new_dev
         return new_dev
 
     def record_command(self, si: int, st: int, type_id: int, name: str, fn: int, fv: int, payload_hex: str, qos: int = 0) -> None:
         dev = self._ensure_device_entry(si, st, type_id, name)
         key = f"fn={fn};fv={fv}"
-        dev.setdefault("commands", {})[key] = {
+        commands = dev.setdefault("commands", {})
+        command = {
             "payload_hex": payload_hex,
             "qos": qos,
         }
         # 成功录制时，从失败列表中删除对应条目
         self._remove_failed_command(si, fn, fv)
-        # 异步持久化
-        try:
-            self.hass.async_create_task(self.storage.async_save())
-        except Exception:
-            pass
+        # 重录得到相同报文时无需写盘
+        if commands.get(key) != command:
+            commands[key] = command
+            self._schedule_save()
 
     def find_command(self, si: int, fn: int, fv: int) -> Optional[Dict[str, Any]]:
-        data = self.storage.get()
-        replay = data.get("replay", {})
-        devices = replay.get("devices", [])
-        for dev in devices:
-            if dev.get("si") == si:
-                key = f"fn={fn};fv={fv}"
-                cmd = dev.get("commands", {}).get(key)
-                if cmd:
-                    return {"topic": dev.get("topic"), **cmd}
+        dev = self._si_index.get(si)
+        if dev is None:
+            return None
+        cmd = dev.get("commands", {}).get(f"fn={fn};fv={fv}")
+        if cmd:
+            return {"topic": dev.get("topic"), **cmd}
         return None
 
     def replay(self, topic: str, payload_hex: str, qos: int = 0) -> bool:
         try:
-            payload = bytes.fromhex(payload_hex)
+            payload = _hex_decode(payload_hex)
         except ValueError:
             _LOGGER.error("回放payload_hex格式错误")
             return False
@@ -158,41 +185,46 @@ class ReplayManager:
             "timestamp": self.hass.config.time_zone.now().isoformat(),
         }
         
-        # 检查是否已存在，避免重复添加
-        for existing in failed_commands:
-            if (existing.get("si") == si and 
-                existing.get("fn") == fn and 
-                existing.get("fv") == fv):
-                # 更新现有条目
-                existing.update(failed_cmd)
-                break
+        # 已存在则更新现有条目，避免重复添加
+        existing = self._failed_index.get((si, fn, fv))
+        if existing is not None:
+            existing.update(failed_cmd)
         else:
-            # 添加新条目
             failed_commands.append(failed_cmd)
+            self._failed_index[(si, fn, fv)] = failed_cmd
         
-        # 异步持久化
-        try:
-            self.hass.async_create_task(self.storage.async_save())
-        except Exception:
-            pass
+        # 合并写盘
+        self._schedule_save()
 
     def _remove_failed_command(self, si: int, fn: int, fv: int) -> None:
         """从失败列表中删除指定指令"""
-        data = self.storage.get()
-        replay = data.get("replay", {})
-        failed_commands = replay.get("failed_commands", [])
-        
-        # 删除匹配的条目
-        failed_commands[:] = [
-            cmd for cmd in failed_commands
-            if not (cmd.get("si") == si and cmd.get("fn") == fn and cmd.get("fv") == fv)
-        ]
-        
-        # 异步持久化
-        try:
-            self.hass.async_create_task(self.storage.async_save())
-        except Exception:
-            pass
+        cmd = self._failed_index.pop((si, fn, fv), None)
+        # 不在失败列表中（最常见情况）时无需遍历列表或写盘
+        if cmd is None:
+            return
+        failed_commands = self.storage.get().get("replay", {}).get("failed_commands", [])
+        for index, existing in enumerate(failed_commands):
+            if existing is cmd:
+                del failed_commands[index]
+                break
+        self._schedule_save()
+
+    # ====== 持久化 ======
+    def _schedule_save(self) -> None:
+        """登记一次延迟写盘；已有待写时不重复登记，最长延迟_SAVE_DELAY秒落盘"""
+        if self._save_handle is None:
+            self._save_handle = self.hass.loop.call_later(_SAVE_DELAY, self._flush_save)
+
+    def _flush_save(self) -> None:
+        self._save_handle = None
+        self.hass.async_create_task(self.storage.async_save())
+
+    async def async_flush(self) -> None:
+        """立即写入尚未落盘的修改（卸载时调用）"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+            await self.storage.async_save()
 
     def get_failed_commands(self) -> List[Dict[str, Any]]:
         """获取失败指令列表"""
@@ -205,8 +237,9 @@ class ReplayManager:
         # 保存最近一次下行，用于和发出的控制配对
         self._last_down_topic = topic
         self._last_down_payload = payload
-        if self._record_event:
-            self._record_event.set()
+        fut = self._capture_future
+        if fut is not None and not fut.done():
+            fut.set_result(payload)
 
     def start_recording(self) -> None:
         self._recording = True
@@ -220,17 +253,41 @@ class ReplayManager:
         self.mqtt_gateway.enable_downstream_recording(False, None)
         _LOGGER.info("已关闭下行报文录制模式")
 
-    async def capture_next_down(self, timeout: float = 2.0) -> Optional[str]:
-        self._record_event = asyncio.Event()
-        try:
+    def arm_capture(self) -> asyncio.Future:
+        """在发送控制前预先登记下行捕获，避免下行先于等待到达而丢失"""
+        fut = asyncio.get_running_loop().create_future()
+        self._capture_future = fut
+        return fut
+
+    def disarm_capture(self, fut: asyncio.Future) -> None:
+        if self._capture_future is fut:
+            self._capture_future = None
+        if not fut.done():
+            fut.cancel()
+
+    async def wait_capture(self, fut: asyncio.Future, timeout: float = 2.0) -> Optional[str]:
+        """等待预先登记的下行捕获；超时返回None（定时器直接结束Future，不额外创建Task）"""
+        if fut.done() and not fut.cancelled():
+            # 快速路径：下行已在控制请求返回前到达，无需挂起或创建定时器
+            payload = fut.result()
+            if self._capture_future is fut:
+                self._capture_future = None
+        else:
+            handle = asyncio.get_running_loop().call_later(timeout, _expire_capture, fut)
             try:
-                await asyncio.wait_for(self._record_event.wait(), timeout=timeout)
-            except asyncio.TimeoutError:
-                return None
-            if self._last_down_payload is None:
-                return None
-            return self._last_down_payload.hex().upper()
-        finally:
-            self._record_event = None
+                payload = await fut
+            finally:
+                handle.cancel()
+                if self._capture_future is fut:
+                    self._capture_future = None
+        if payload is None:
+            return None
+        return payload.hex().upper()
+
+    async def capture_next_down(self, timeout: float = 2.0) -> Optional[str]:
+        return await self.wait_capture(self.arm_capture(), timeout)
 
 
+def _expire_capture(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
@@ -1,173 +1,68 @@
 """报文穷举录制器 - 支持窗帘/空调/地暖/新风/灯具全量穷举"""
 import asyncio
+import contextlib
 import logging
-from typing import Dict, Any, List, Callable, Optional
+from collections import deque
+from statistics import median
+from types import MappingProxyType
+from typing import Deque, Dict, Any, List, Callable, Mapping, Optional, Sequence, Tuple
 
 from .replay_manager import ReplayManager
 
 _LOGGER = logging.getLogger(__name__)
 
-
-class CurtainEnumerator:
-    """窗帘穷举执行器"""
-
-    def __init__(self, coordinator, replay: ReplayManager, status_updater: Optional[Callable[[Dict[str, Any]], None]] = None):
-        self.coordinator = coordinator
-        self.replay = replay
-        self._update_status = status_updater or (lambda d: None)
-        self._running = False
-        self._status: Dict[str, Any] = {
-            "device_count": 0,
-            "processed_devices": 0,
-            "current_device": None,
-            "sent": 0,
-            "recorded": 0,
-            "timeouts": 0,
-        }
-
-    def status(self) -> Dict[str, Any]:
-        return dict(self._status)
-
-    async def run(self) -> None:
-        self._running = True
-        try:
-            # 重置内部计数，避免多次启动时继承上次的统计导致进度异常
-            self._status["processed_devices"] = 0
-            self._status["sent"] = 0
-            self._status["recorded"] = 0
-            self._status["timeouts"] = 0
-            self._status["current_device"] = None
-            # 仅挑选窗帘设备，并按 si 去重，避免同一物理设备被重复录制
-            raw_devices = [d for d in (self.coordinator.data or {}).get("devices", []) if d.get("typeId") == 14]
-            devices = []
-            seen_si = set()
-            for d in raw_devices:
-                si = d.get("si")
-                if si in seen_si:
-                    continue
-                seen_si.add(si)
-                devices.append(d)
-            self._status["device_count"] = len(devices)
-            self.replay.start_recording()
-            self._update_status({
-                "running": True,
-                "total_devices": len(devices),
-                "processed_devices": 0,
-                "current_device": None,
-                "current_fn": None,
-                "current_fv": None,
-                "current_cmd_index": 0,
-                "current_cmd_total": 0,
-                "current_state": "就绪",
-            })
-
-            for dev in devices:
-                if not self._running:
-                    break
-                await self._enumerate_device(dev)
-                self._status["processed_devices"] += 1
-                self._update_status({
-                    "processed_devices": self._status["processed_devices"],
-                })
-        finally:
-            self.replay.stop_recording()
-            self._running = False
-            self._update_status({"running": False})
-
-    async def stop(self) -> None:
-        self._running = False
-
-    async def _enumerate_device(self, device: Dict[str, Any]) -> None:
-        self._status["current_device"] = device.get("deviceName")
-        si = device["si"]
-        st = 20201  # 窗帘控制st固定
-        type_id = device.get("typeId", 14)
-        name = device.get("deviceName", str(si))
-        total_cmds = 3 + 101
-        current_index = 0
-        self._update_status({
-            "current_device": name,
-            "current_cmd_total": total_cmds,
-            "current_cmd_index": 0,
-        })
-
-        # 1) fn1: 0,1,2
-        for fv in (0, 1, 2):
-            if not self._running:
-                return
-            current_index += 1
-            self._update_status({
-                "current_fn": 1,
-                "current_fv": fv,
-                "current_cmd_index": current_index,
-                "current_state": "发送控制",
-            })
-            await self._send_and_record(device, st, si, type_id, name, fn=1, fv=fv)
-
-        # 2) fn2: 0..100 全量
-        for fv in range(0, 101):
-            if not self._running:
-                return
-            current_index += 1
-            self._update_status({
-                "current_fn": 2,
-                "current_fv": fv,
-                "current_cmd_index": current_index,
-                "current_state": "发送控制",
-            })
-            await self._send_and_record(device, st, si, type_id, name, fn=2, fv=fv)
-
-    async def _send_and_record(self, device: Dict[str, Any], st: int, si: int, type_id: int, name: str, fn: int, fv: int) -> None:
-        max_retries = 2
-        for attempt in range(max_retries + 1):  # 总共尝试3次（初次 + 2次重试）
-            # 通过立即控制触发云端下发
-            ok = await self.coordinator.async_control_device_immediate(
-                device_id=device["deviceId"],
-                st=st,
-                si=si,
-                fn=fn,
-                fv=fv,
-                entity_id=f"replay_recorder:{si}:{fn}:{fv}",
-            )
-            self._status["sent"] += 1
-            
-            if not ok:
-                if attempt < max_retries:
-                    _LOGGER.warning(f"设备si={si} fn={fn} fv={fv} 控制失败，第{attempt + 1}次重试...")
-                    self._update_status({"current_state": f"控制失败，重试{attempt + 1}"})
-                    await asyncio.sleep(1.0)  # 重试前等待1秒
-                    continue
-                else:
-                    _LOGGER.error(f"设备si={si} fn={fn} fv={fv} 控制失败，已重试{max_retries}次，跳过")
-                    self.replay.add_failed_command(si=si, st=st, type_id=type_id, name=name, fn=fn, fv=fv, reason="control_failed")
-                    self._update_status({"current_state": "控制失败"})
-                    return
-
-            # 等待下行报文
-            payload_hex = await self.replay.capture_next_down(timeout=8.0)
-            if not payload_hex:
-                if attempt < max_retries:
-                    _LOGGER.warning(f"设备si={si} fn={fn} fv={fv} 等待下行超时，第{attempt + 1}次重试...")
-                    self._update_status({"current_state": f"录制超时，重试{attempt + 1}"})
-                    await asyncio.sleep(1.0)  # 重试前等待1秒
-                    continue
-                else:
-                    self._status["timeouts"] += 1
-                    _LOGGER.error(f"设备si={si} fn={fn} fv={fv} 等待下行超时，已重试{max_retries}次，跳过")
-                    # 添加失败指令到失败列表
-                    self.replay.add_failed_command(si=si, st=st, type_id=type_id, name=name, fn=fn, fv=fv, reason="timeout")
-                    self._update_status({"current_state": "录制超时"})
-                    return
-
-            # 记录样本成功
-            self.replay.record_command(si=si, st=st, type_id=type_id, name=name, fn=fn, fv=fv, payload_hex=payload_hex, qos=0)
-            self._status["recorded"] += 1
-            _LOGGER.info(f"已录制 si={si} fn={fn} fv={fv} 的下行报文")
-            self._update_status({"current_state": "已录制"})
-            
-            # 成功录制后等待0.5秒立即发送下一指令
-            await asyncio.sleep(0.5)
-            return  # 成功后直接返回
+# 状态通知合并窗口(秒)：每条指令会产生多次状态更新，合并后再通知实体刷新
+_NOTIFY_DELAY = 0.1
+
+# 录制成功后的指令间隔(秒)：按下行时延自适应，上限沿用原固定间隔
+_MIN_RECORD_DELAY = 0.1
+_MAX_RECORD_DELAY = 0.5
+_LATENCY_WINDOW = 16
+
+# 同一设备连续失败（重试耗尽）的指令数达到该值后跳过该设备的剩余指令
+_OFFLINE_FAILURE_LIMIT = 3
+
+# 录制状态文本模板
+_STATUS_TEXT_TMPL = (
+    "当前设备： {current_device}\n"
+    "请求指令：fn={fn},fv={fv} （ {idx} / {total} ）\n"
+    "当前状态：{state}\n"
+    "总进度：{processed} / {total_dev}"
+)
+
+# 各类型设备的穷举计划：typeId -> ((fn, fv序列), ...)
+_ENUM_PLANS: Dict[int, Tuple[Tuple[int, Sequence[int]], ...]] = {
+    14: ((1, (0, 1, 2)), (2, range(0, 101))),  # 窗帘：开/关/停 + 开度0-100
+    12: ((1, (0, 1)), (2, range(18, 30)), (3, range(0, 4)), (4, range(0, 4))),  # 空调：开关/温度/模式/风速
+    16: ((1, (0, 1)), (2, range(5, 36))),  # 地暖：开关/温度
+    36: ((1, (0, 1)), (3, range(0, 4))),  # 新风：开关/风速
+    8: ((1, (0, 1)),),  # 灯具：开关
+}
+# 展开后的指令序列：typeId -> ((fn, fv, 序号), ...)，模块加载时构建一次
+_ENUM_CMDS: Dict[int, Tuple[Tuple[int, int, int], ...]] = {
+    type_id: tuple(
+        (fn, fv, index)
+        for index, (fn, fv) in enumerate(((fn, fv) for fn, fvs in plan for fv in fvs), start=1)
+    )
+    for type_id, plan in _ENUM_PLANS.items()
+}
+
+
+def _post_record_delay(latencies: Deque[float]) -> float:
+    """录制成功后的间隔：取最近下行时延中位数的一半，限制在[0.1, 0.5]秒"""
+    if not latencies:
+        return _MAX_RECORD_DELAY
+    return min(_MAX_RECORD_DELAY, max(_MIN_RECORD_DELAY, median(latencies) * 0.5))
+
+
+def _build_device_index(devices: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+    """按 typeId 分组设备，并在组内按 si 去重，避免同一物理设备被重复录制"""
+    by_type: Dict[int, Dict[Any, Dict[str, Any]]] = {}
+    for d in devices:
+        si = d.get("si")
+        if si is not None:
+            by_type.setdefault(d.get("typeId"), {})[si] = d
+    return {type_id: list(by_si.values()) for type_id, by_si in by_type.items()}
 
 
 class ReplayRecorder:
@@ -191,57 +86,80 @@ class ReplayRecorder:
             "current_cmd_total": 0,
             "current_state": "空闲",
         }
-        self._listeners: List[Callable[[], None]] = []
+        self._status_view = MappingProxyType(self._status)
+        # 写时复制：增删监听者时重建元组，通知时直接遍历无需拷贝
+        self._listeners: Tuple[Callable[[], None], ...] = ()
+        # 状态快照缓存（状态更新时失效）与延迟通知句柄
+        self._status_snapshot: Optional[Dict[str, Any]] = None
+        self._status_text: Optional[str] = None
+        self._notify_handle: Optional[asyncio.TimerHandle] = None
 
     def is_running(self) -> bool:
         return self._task is not None and not self._task.done()
 
-    def get_status(self) -> Dict[str, Any]:
-        return dict(self._status)
+    def get_status(self) -> Mapping[str, Any]:
+        """返回状态的只读视图（无需拷贝；需修改时由调用方自行 dict()）"""
+        return self._status_view
+
+    def _build_device_index(self) -> Dict[int, List[Dict[str, Any]]]:
+        """对当前协调器设备做一次分组去重，供本次录制的枚举器共用"""
+        return _build_device_index((self.coordinator.data or {}).get("devices", []))
+
+    def get_status_snapshot(self) -> Dict[str, Any]:
+        """返回共享的只读状态快照，同一次状态更新内多个读者复用同一份字典"""
+        if self._status_snapshot is None:
+            self._status_snapshot = dict(self._status)
+        return self._status_snapshot
 
     def get_status_text(self) -> str:
-        s = self._status
-        current_device = s.get("current_device") or "-"
-        fn = s.get("current_fn")
-        fv = s.get("current_fv")
-        idx = s.get("current_cmd_index", 0)
-        total = s.get("current_cmd_total", 0)
-        state = s.get("current_state") or "-"
-        processed = s.get("processed_devices", 0)
-        total_dev = s.get("total_devices", 0)
-        return (
-            f"当前设备： {current_device}\n"
-            f"请求指令：fn={fn},fv={fv} （ {idx} / {total} ）\n"
-            f"当前状态：{state}\n"
-            f"总进度：{processed} / {total_dev}"
-        )
+        # 状态未变化时直接返回上次渲染结果
+        if self._status_text is None:
+            s = self._status
+            self._status_text = _STATUS_TEXT_TMPL.format(
+                current_device=s.get("current_device") or "-",
+                fn=s.get("current_fn"),
+                fv=s.get("current_fv"),
+                idx=s.get("current_cmd_index", 0),
+                total=s.get("current_cmd_total", 0),
+                state=s.get("current_state") or "-",
+                processed=s.get("processed_devices", 0),
+                total_dev=s.get("total_devices", 0),
+            )
+        return self._status_text
 
     def add_status_listener(self, cb: Callable[[], None]) -> None:
         if cb not in self._listeners:
-            self._listeners.append(cb)
+            self._listeners = self._listeners + (cb,)
 
     def remove_status_listener(self, cb: Callable[[], None]) -> None:
         if cb in self._listeners:
-            self._listeners.remove(cb)
+            self._listeners = tuple(x for x in self._listeners if x != cb)
 
     def _notify_listeners(self) -> None:
-        for cb in list(self._listeners):
+        for cb in self._listeners:
             try:
                 # 监听者负责在主线程调用 async_write_ha_state
                 cb()
             except Exception:
                 pass
 
+    def _flush_notify(self) -> None:
+        self._notify_handle = None
+        self._notify_listeners()
+
     def _update_status(self, partial: Dict[str, Any]) -> None:
         self._status.update(partial)
-        # 调度通知（无需跨线程）
+        self._status_snapshot = None
+        self._status_text = None
+        # 调度通知（无需跨线程）；窗口期内的多次更新只合并通知一次
         loop = None
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError:
             loop = None
         if loop and loop.is_running():
-            loop.call_soon(self._notify_listeners)
+            if self._notify_handle is None:
+                self._notify_handle = loop.call_later(_NOTIFY_DELAY, self._flush_notify)
         else:
             self._notify_listeners()
 
@@ -250,29 +168,38 @@ class ReplayRecorder:
             _LOGGER.warning("录制器已在运行，忽略启动请求")
             return
         self._current_runner = self._curtain
+        self._curtain.devices = self._build_device_index().get(14, [])
         self._task = asyncio.create_task(self._curtain.run())
 
     async def stop(self) -> None:
-        await self._curtain.stop()
+        # 停止当前运行的枚举器（不限于窗帘）
+        if self._current_runner is not None:
+            await self._current_runner.stop()
         if self._task and not self._task.done():
-            self._task.cancel()
-            try:
+            self._task.cancel(msg="录制器停止")
+            with contextlib.suppress(asyncio.CancelledError):
                 await self._task
-            except asyncio.CancelledError:
-                pass
         self._task = None
         self._current_runner = None
 
 
-# ===== 其它设备枚举器 =====
+# ===== 设备枚举器 =====
 
 class BaseEnumerator:
+    """设备穷举执行器：按 _ENUM_PLANS 中对应 typeId 的计划逐条发送并录制"""
+
+    _fixed_st: Optional[int] = None  # 控制st固定的设备类型（如窗帘）在子类中覆盖
+
     def __init__(self, coordinator, replay: ReplayManager, type_id: int, status_updater: Optional[Callable[[Dict[str, Any]], None]] = None):
         self.coordinator = coordinator
         self.replay = replay
         self.type_id = type_id
         self._update_status = status_updater or (lambda d: None)
         self._running = False
+        self.devices: Optional[List[Dict[str, Any]]] = None  # 由 ReplayRecorder 在启动前注入
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)  # 最近的下行时延(秒)
+        self._device_failures = 0  # 当前设备连续失败的指令数，达到上限视为离线
+        self._next_send_time = 0.0  # loop.time() 时间轴上允许发送下一条指令的最早时刻
         self._status: Dict[str, Any] = {
             "device_count": 0,
             "processed_devices": 0,
@@ -281,9 +208,10 @@ class BaseEnumerator:
             "recorded": 0,
             "timeouts": 0,
         }
+        self._status_view = MappingProxyType(self._status)
 
-    def status(self) -> Dict[str, Any]:
-        return dict(self._status)
+    def status(self) -> Mapping[str, Any]:
+        return self._status_view
 
     async def run(self) -> None:
         self._running = True
@@ -295,16 +223,10 @@ class BaseEnumerator:
             self._status["timeouts"] = 0
             self._status["current_device"] = None
             
-            # 获取指定类型的设备，并按 si 去重，避免同一物理设备被重复录制
-            raw_devices = [d for d in (self.coordinator.data or {}).get("devices", []) if d.get("typeId") == self.type_id]
-            devices = []
-            seen_si = set()
-            for d in raw_devices:
-                si = d.get("si")
-                if si in seen_si:
-                    continue
-                seen_si.add(si)
-                devices.append(d)
+            # 优先使用启动时预先分好组的设备列表
+            devices = self.devices
+            if devices is None:
+                devices = _build_device_index((self.coordinator.data or {}).get("devices", [])).get(self.type_id, [])
             
             self._status["device_count"] = len(devices)
             self.replay.start_recording()
@@ -338,262 +260,117 @@ class BaseEnumerator:
     async def stop(self) -> None:
         self._running = False
 
-    async def _send_and_record(self, device: Dict[str, Any], st: int, si: int, type_id: int, name: str, fn: int, fv: int) -> None:
+    async def _enumerate_device(self, device: Dict[str, Any]) -> None:
+        self._status["current_device"] = device.get("deviceName")
+        si = device["si"]
+        st = self._fixed_st or device.get("st", 10101)
+        type_id = device.get("typeId", self.type_id)
+        name = device.get("deviceName", str(si))
+        await self._run_plan(device["deviceId"], st, si, type_id, name)
+
+    async def _run_plan(self, device_id: Any, st: int, si: int, type_id: int, name: str) -> None:
+        """按穷举计划逐条发送并录制"""
+        cmds = _ENUM_CMDS[self.type_id]
+        self._update_status({
+            "current_device": name,
+            "current_cmd_total": len(cmds),
+            "current_cmd_index": 0,
+        })
+
+        self._device_failures = 0
+        for fn, fv, index in cmds:
+            if not self._running:
+                return
+            if self._device_failures >= _OFFLINE_FAILURE_LIMIT:
+                # 连续多条指令重试后仍失败，设备大概率离线，跳过其余指令
+                _LOGGER.warning("设备si=%s 连续%s条指令失败，视为离线，跳过剩余%s条指令",
+                                si, self._device_failures, len(cmds) - index + 1)
+                self._update_status({"current_state": "设备离线，已跳过"})
+                return
+            self._update_status({
+                "current_fn": fn,
+                "current_fv": fv,
+                "current_cmd_index": index,
+                "current_state": "发送控制",
+            })
+            await self._send_and_record(
+                device_id, st, si, type_id, name, fn=fn, fv=fv,
+                entity_id=f"replay_recorder:{si}:{fn}:{fv}",
+            )
+
+    async def _send_and_record(self, device_id: Any, st: int, si: int, type_id: int, name: str, fn: int, fv: int, entity_id: str) -> None:
         max_retries = 2
+        loop = asyncio.get_running_loop()
+        # 距上次录制成功不足间隔时才等待；前序处理已耗尽间隔则直接发送
+        delay = self._next_send_time - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
         for attempt in range(max_retries + 1):  # 总共尝试3次（初次 + 2次重试）
-            # 通过立即控制触发云端下发
+            # 先登记下行捕获再触发云端下发，下行可能先于HTTP响应到达
+            capture = self.replay.arm_capture()
+            t0 = loop.time()
             ok = await self.coordinator.async_control_device_immediate(
-                device_id=device["deviceId"],
+                device_id=device_id,
                 st=st,
                 si=si,
                 fn=fn,
                 fv=fv,
-                entity_id=f"replay_recorder:{si}:{fn}:{fv}",
+                entity_id=entity_id,
             )
             self._status["sent"] += 1
             
             if not ok:
+                self.replay.disarm_capture(capture)
                 if attempt < max_retries:
-                    _LOGGER.warning(f"设备si={si} fn={fn} fv={fv} 控制失败，第{attempt + 1}次重试...")
+                    _LOGGER.warning("设备si=%s fn=%s fv=%s 控制失败，第%s次重试...", si, fn, fv, attempt + 1)
                     self._update_status({"current_state": f"控制失败，重试{attempt + 1}"})
                     await asyncio.sleep(1.0)  # 重试前等待1秒
                     continue
                 else:
-                    _LOGGER.error(f"设备si={si} fn={fn} fv={fv} 控制失败，已重试{max_retries}次，跳过")
+                    _LOGGER.error("设备si=%s fn=%s fv=%s 控制失败，已重试%s次，跳过", si, fn, fv, max_retries)
                     self.replay.add_failed_command(si=si, st=st, type_id=type_id, name=name, fn=fn, fv=fv, reason="control_failed")
                     self._update_status({"current_state": "控制失败"})
+                    self._device_failures += 1
                     return
 
             # 等待下行报文
-            payload_hex = await self.replay.capture_next_down(timeout=8.0)
+            payload_hex = await self.replay.wait_capture(capture, timeout=8.0)
             if not payload_hex:
                 if attempt < max_retries:
-                    _LOGGER.warning(f"设备si={si} fn={fn} fv={fv} 等待下行超时，第{attempt + 1}次重试...")
+                    _LOGGER.warning("设备si=%s fn=%s fv=%s 等待下行超时，第%s次重试...", si, fn, fv, attempt + 1)
                     self._update_status({"current_state": f"录制超时，重试{attempt + 1}"})
                     await asyncio.sleep(1.0)  # 重试前等待1秒
                     continue
                 else:
                     self._status["timeouts"] += 1
-                    _LOGGER.error(f"设备si={si} fn={fn} fv={fv} 等待下行超时，已重试{max_retries}次，跳过")
+                    _LOGGER.error("设备si=%s fn=%s fv=%s 等待下行超时，已重试%s次，跳过", si, fn, fv, max_retries)
                     # 添加失败指令到失败列表
                     self.replay.add_failed_command(si=si, st=st, type_id=type_id, name=name, fn=fn, fv=fv, reason="timeout")
                     self._update_status({"current_state": "录制超时"})
+                    self._device_failures += 1
                     return
 
             # 记录样本成功
+            self._latencies.append(loop.time() - t0)
             self.replay.record_command(si=si, st=st, type_id=type_id, name=name, fn=fn, fv=fv, payload_hex=payload_hex, qos=0)
             self._status["recorded"] += 1
-            _LOGGER.info(f"已录制 si={si} fn={fn} fv={fv} 的下行报文")
+            if _LOGGER.isEnabledFor(logging.INFO):
+                _LOGGER.info("已录制 si=%s fn=%s fv=%s 的下行报文", si, fn, fv)
             self._update_status({"current_state": "已录制"})
+            self._device_failures = 0
             
-            # 成功录制后等待0.5秒立即发送下一指令
-            await asyncio.sleep(0.5)
+            # 成功录制后按观测到的下行时延确定下一指令的最早发送时刻
+            self._next_send_time = loop.time() + _post_record_delay(self._latencies)
             return  # 成功后直接返回
 
 
-class ACEnumerator(BaseEnumerator):
-    def __init__(self, coordinator, replay: ReplayManager, status_updater: Optional[Callable[[Dict[str, Any]], None]] = None):
-        super().__init__(coordinator, replay, type_id=12, status_updater=status_updater)
-
-    async def _enumerate_device(self, device: Dict[str, Any]) -> None:
-        self._status["current_device"] = device.get("deviceName")
-        si = device["si"]
-        st = device.get("st", 10101)
-        type_id = device.get("typeId", 12)
-        name = device.get("deviceName", str(si))
-        
-        # 计算总命令数：fn1(2个) + fn2(12个) + fn3(4个) + fn4(4个) = 22个
-        total_cmds = 2 + 12 + 4 + 4
-        current_index = 0
-        
-        self._update_status({
-            "current_device": name,
-            "current_cmd_total": total_cmds,
-            "current_cmd_index": 0,
-        })
-
-        # fn1: 开关 (0,1)
-        for fv in (0, 1):
-            if not self._running:
-                return
-            current_index += 1
-            self._update_status({
-                "current_fn": 1,
-                "current_fv": fv,
-                "current_cmd_index": current_index,
-                "current_state": "发送控制",
-            })
-            await self._send_and_record(device, st, si, type_id, name, fn=1, fv=fv)
-
-        # fn2: 温度设置 (18-29)
-        for fv in range(18, 30):
-            if not self._running:
-                return
-            current_index += 1
-            self._update_status({
-                "current_fn": 2,
-                "current_fv": fv,
-                "current_cmd_index": current_index,
-                "current_state": "发送控制",
-            })
-            await self._send_and_record(device, st, si, type_id, name, fn=2, fv=fv)
-
-        # fn3: 模式设置 (0-3)
-        for fv in range(0, 4):
-            if not self._running:
-                return
-            current_index += 1
-            self._update_status({
-                "current_fn": 3,
-                "current_fv": fv,
-                "current_cmd_index": current_index,
-                "current_state": "发送控制",
-            })
-            await self._send_and_record(device, st, si, type_id, name, fn=3, fv=fv)
-
-        # fn4: 风速设置 (0-3)
-        for fv in range(0, 4):
-            if not self._running:
-                return
-            current_index += 1
-            self._update_status({
-                "current_fn": 4,
-                "current_fv": fv,
-                "current_cmd_index": current_index,
-                "current_state": "发送控制",
-            })
-            await self._send_and_record(device, st, si, type_id, name, fn=4, fv=fv)
-
-
-class FloorHeatingEnumerator(BaseEnumerator):
-    def __init__(self, coordinator, replay: ReplayManager, status_updater: Optional[Callable[[Dict[str, Any]], None]] = None):
-        super().__init__(coordinator, replay, type_id=16, status_updater=status_updater)
-
-    async def _enumerate_device(self, device: Dict[str, Any]) -> None:
-        self._status["current_device"] = device.get("deviceName")
-        si = device["si"]
-        st = device.get("st", 10101)
-        type_id = device.get("typeId", 16)
-        name = device.get("deviceName", str(si))
-        
-        # 计算总命令数：fn1(2个) + fn2(31个) = 33个
-        total_cmds = 2 + 31
-        current_index = 0
-        
-        self._update_status({
-            "current_device": name,
-            "current_cmd_total": total_cmds,
-            "current_cmd_index": 0,
-        })
-
-        # fn1: 开关 (0,1)
-        for fv in (0, 1):
-            if not self._running:
-                return
-            current_index += 1
-            self._update_status({
-                "current_fn": 1,
-                "current_fv": fv,
-                "current_cmd_index": current_index,
-                "current_state": "发送控制",
-            })
-            await self._send_and_record(device, st, si, type_id, name, fn=1, fv=fv)
-
-        # fn2: 温度设置 (5-35)
-        for fv in range(5, 36):
-            if not self._running:
-                return
-            current_index += 1
-            self._update_status({
-                "current_fn": 2,
-                "current_fv": fv,
-                "current_cmd_index": current_index,
-                "current_state": "发送控制",
-            })
-            await self._send_and_record(device, st, si, type_id, name, fn=2, fv=fv)
-
-
-class FreshAirEnumerator(BaseEnumerator):
-    def __init__(self, coordinator, replay: ReplayManager, status_updater: Optional[Callable[[Dict[str, Any]], None]] = None):
-        super().__init__(coordinator, replay, type_id=36, status_updater=status_updater)
-
-    async def _enumerate_device(self, device: Dict[str, Any]) -> None:
-        self._status["current_device"] = device.get("deviceName")
-        si = device["si"]
-        st = device.get("st", 10101)
-        type_id = device.get("typeId", 36)
-        name = device.get("deviceName", str(si))
-        
-        # 计算总命令数：fn1(2个) + fn3(4个) = 6个
-        total_cmds = 2 + 4
-        current_index = 0
-        
-        self._update_status({
-            "current_device": name,
-            "current_cmd_total": total_cmds,
-            "current_cmd_index": 0,
-        })
-
-        # fn1: 开关 (0,1)
-        for fv in (0, 1):
-            if not self._running:
-                return
-            current_index += 1
-            self._update_status({
-                "current_fn": 1,
-                "current_fv": fv,
-                "current_cmd_index": current_index,
-                "current_state": "发送控制",
-            })
-            await self._send_and_record(device, st, si, type_id, name, fn=1, fv=fv)
-
-        # fn3: 风速设置 (0-3)
-        for fv in range(0, 4):
-            if not self._running:
-                return
-            current_index += 1
-            self._update_status({
-                "current_fn": 3,
-                "current_fv": fv,
-                "current_cmd_index": current_index,
-                "current_state": "发送控制",
-            })
-            await self._send_and_record(device, st, si, type_id, name, fn=3, fv=fv)
+class CurtainEnumerator(BaseEnumerator):
+    """窗帘穷举执行器"""
 
+    _fixed_st = 20201  # 窗帘控制st固定
 
-class LightEnumerator(BaseEnumerator):
     def __init__(self, coordinator, replay: ReplayManager, status_updater: Optional[Callable[[Dict[str, Any]], None]] = None):
-        super().__init__(coordinator, replay, type_id=8, status_updater=status_updater)
-
-    async def _enumerate_device(self, device: Dict[str, Any]) -> None:
-        self._status["current_device"] = device.get("deviceName")
-        si = device["si"]
-        st = device.get("st", 10101)
-        type_id = device.get("typeId", 8)
-        name = device.get("deviceName", str(si))
-        
-        # 计算总命令数：fn1(2个) = 2个
-        total_cmds = 2
-        current_index = 0
-        
-        self._update_status({
-            "current_device": name,
-            "current_cmd_total": total_cmds,
-            "current_cmd_index": 0,
-        })
-
-        # fn1: 开关 (0,1)
-        for fv in (0, 1):
-            if not self._running:
-                return
-            current_index += 1
-            self._update_status({
-                "current_fn": 1,
-                "current_fv": fv,
-                "current_cmd_index": current_index,
-                "current_state": "发送控制",
-            })
-            await self._send_and_record(device, st, si, type_id, name, fn=1, fv=fv)
+        super().__init__(coordinator, replay, type_id=14, status_updater=status_updater)
 
 
 # 为 ReplayRecorder 增加启动接口
@@ -602,22 +379,23 @@ async def _start_runner(recorder: "ReplayRecorder", runner) -> None:
         _LOGGER.warning("录制器已在运行，忽略启动请求")
         return
     recorder._current_runner = runner
+    runner.devices = recorder._build_device_index().get(runner.type_id, [])
     recorder._task = asyncio.create_task(runner.run())
 
 
 async def start_ac_full(recorder: "ReplayRecorder") -> None:
-    await _start_runner(recorder, ACEnumerator(recorder.coordinator, recorder.replay, recorder._update_status))
+    await _start_runner(recorder, BaseEnumerator(recorder.coordinator, recorder.replay, 12, recorder._update_status))
 
 
 async def start_floor_full(recorder: "ReplayRecorder") -> None:
-    await _start_runner(recorder, FloorHeatingEnumerator(recorder.coordinator, recorder.replay, recorder._update_status))
+    await _start_runner(recorder, BaseEnumerator(recorder.coordinator, recorder.replay, 16, recorder._update_status))
 
 
 async def start_freshair_full(recorder: "ReplayRecorder") -> None:
-    await _start_runner(recorder, FreshAirEnumerator(recorder.coordinator, recorder.replay, recorder._update_status))
+    await _start_runner(recorder, BaseEnumerator(recorder.coordinator, recorder.replay, 36, recorder._update_status))
 
 
 async def start_light_full(recorder: "ReplayRecorder") -> None:
-    await _start_runner(recorder, LightEnumerator(recorder.coordinator, recorder.replay, recorder._update_status))
+    await _start_runner(recorder, BaseEnumerator(recorder.coordinator, recorder.replay, 8, recorder._update_status))
 
 
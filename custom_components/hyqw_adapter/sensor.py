@@ -1,6 +1,6 @@
 """Support for HYQW Adapter sensors."""
 import logging
-from typing import Any, Optional
+from typing import Optional
 from datetime import datetime, timezone
 
 from homeassistant.components.sensor import (
@@ -29,6 +29,20 @@ from .mqtt_entities import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# 诊断类传感器所属的虚拟设备信息不随实体变化，模块加载时构建一次，各实体共享引用
+_API_DEVICE_INFO = {
+    "identifiers": {(DOMAIN, "hyqw_adapter_api")},
+    "name": "花语前湾 API",
+    "manufacturer": "花语前湾",
+    "model": "API Client",
+}
+_POLLING_BUS_DEVICE_INFO = {
+    "identifiers": {(DOMAIN, "hyqw_adapter_polling_bus")},
+    "name": "花语前湾 轮询总线",
+    "manufacturer": "花语前湾",
+    "model": "Polling Bus",
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -72,13 +86,13 @@ async def async_setup_entry(
             HYQWAdapterPollingStatsSensor(coordinator, "mode_switches", "模式切换次数"),
         ])
     
-    if coordinator.data and "devices" in coordinator.data:
-        for device in coordinator.data["devices"]:
-            # 为空调设备创建温度传感器
-            if device.get("typeId") == 12:  # 空调
-                entities.append(HYQWAdapterTemperatureSensor(coordinator, device))
-            
-            # 新风设备(typeId=36)现在作为fan设备，不需要额外的传感器
+    if coordinator.data and "devices_by_type" in coordinator.data:
+        # 为空调设备(typeId=12)创建温度传感器
+        # 新风设备(typeId=36)现在作为fan设备，不需要额外的传感器
+        entities.extend(
+            HYQWAdapterTemperatureSensor(coordinator, device)
+            for device in coordinator.data["devices_by_type"].get(12, ())
+        )
     
     # 注意：避免重复添加相同的MQTT管理传感器（已在上方添加）
     
@@ -86,6 +100,32 @@ async def async_setup_entry(
         async_add_entities(entities)
 
 
+# 最后请求状态 -> 图标：先精确匹配，再按前缀匹配（api_error_xxx、http_error_xxx等）
+_STATUS_ICON_DEFAULT = "mdi:help-circle-outline"
+_STATUS_ICON_EXACT = {
+    "success": "mdi:check-circle-outline",
+    "timeout": "mdi:clock-alert-outline",
+}
+_STATUS_ICON_PREFIXES = (
+    ("api_error", "mdi:alert-circle-outline"),
+    ("http_error", "mdi:web-remove"),
+    ("exception", "mdi:alert-outline"),
+)
+
+
+def _status_icon(status: Optional[str]) -> str:
+    """根据最后请求状态查表得到图标"""
+    if not status:
+        return _STATUS_ICON_DEFAULT
+    icon = _STATUS_ICON_EXACT.get(status)
+    if icon is not None:
+        return icon
+    for prefix, icon in _STATUS_ICON_PREFIXES:
+        if status.startswith(prefix):
+            return icon
+    return _STATUS_ICON_DEFAULT
+
+
 class HYQWAdapterTemperatureSensor(CoordinatorEntity, SensorEntity):
     """Representation of a HYQW Adapter temperature sensor."""
     
@@ -104,51 +144,54 @@ class HYQWAdapterTemperatureSensor(CoordinatorEntity, SensorEntity):
         self._attr_state_class = SensorStateClass.MEASUREMENT
         self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
         self._attr_icon = "mdi:thermometer"
-    
-    @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information."""
-        return {
+        
+        # 设备信息在初始化后不再变化，一次性赋值
+        self._attr_device_info = {
             "identifiers": {(DOMAIN, str(self._device_id))},
-            "name": self._device["deviceName"],  # 温度传感器使用设备原始名称
+            "name": device["deviceName"],  # 温度传感器使用设备原始名称
             "manufacturer": "花语前湾",
-            "model": f"Type {self._device.get('typeId')}",
-            "sw_version": self._device.get("projectCode", "Unknown"),
-            "suggested_area": self._device.get("roomName"),
+            "model": f"Type {device.get('typeId')}",
+            "sw_version": device.get("projectCode", "Unknown"),
+            "suggested_area": device.get("roomName"),
         }
     
     @property
     def native_value(self) -> Optional[float]:
         """Return the state of the sensor."""
-        # 首先检查从设备属性获取的当前温度
-        if self._device.get("current_temperature"):
-            return self._device.get("current_temperature")
-        
-        # 对于空调，检查fn5是否为当前温度
-        if self._device.get("typeId") == 12:
-            current_states = self._device.get("current_states", {})
-            if 5 in current_states:
-                temp_value = current_states[5]["fv"]
-                if temp_value and temp_value > 100:
-                    return float(temp_value) / 10
-                elif temp_value:
-                    return float(temp_value)
-        
-        return None
+        # 当前温度已由coordinator在数据入口处换算好
+        return self._device.get("current_temperature")
     
     @property
     def available(self) -> bool:
         """Return if entity is available."""
         return self.coordinator.last_update_success
     
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        # 登记设备级推送：路由器增量更新只在本设备变化时回调
+        self.async_on_remove(
+            self.coordinator.async_add_device_listener(
+                self._device.get("si"), self._handle_device_update
+            )
+        )
+    
+    def _handle_device_update(self) -> None:
+        """本设备状态变化时由coordinator直接推送"""
+        device = self.coordinator.get_device_by_id(self._device_id)
+        if device is not None:
+            self._device = device
+        self.async_write_ha_state()
+    
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        # 增量更新已通过设备级推送处理，这里只响应全量刷新
+        if self.coordinator.is_incremental_update:
+            return
         # 更新设备信息
-        if self.coordinator.data and "devices" in self.coordinator.data:
-            for device in self.coordinator.data["devices"]:
-                if device["deviceId"] == self._device_id:
-                    self._device = device
-                    break
+        device = self.coordinator.get_device_by_id(self._device_id)
+        if device is not None:
+            self._device = device
         super()._handle_coordinator_update()
 
 
@@ -169,21 +212,12 @@ class HYQWAdapterRequestStatsSensor(CoordinatorEntity, SensorEntity):
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
         self._attr_icon = "mdi:api"
-    
-    @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, "hyqw_adapter_api")},
-            "name": "花语前湾 API",
-            "manufacturer": "花语前湾",
-            "model": "API Client",
-        }
+        self._attr_device_info = _API_DEVICE_INFO
     
     @property
     def native_value(self) -> Optional[int]:
         """Return the state of the sensor."""
-        stats = self.coordinator.get_request_stats()
+        stats = self.coordinator.request_stats
         return stats.get(self._stat_type, 0)
     
     @property
@@ -203,21 +237,12 @@ class HYQWAdapterLastRequestTimeSensor(CoordinatorEntity, SensorEntity):
         self._attr_device_class = SensorDeviceClass.TIMESTAMP
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
         self._attr_icon = "mdi:clock-outline"
-    
-    @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, "hyqw_adapter_api")},
-            "name": "花语前湾 API",
-            "manufacturer": "花语前湾",
-            "model": "API Client",
-        }
+        self._attr_device_info = _API_DEVICE_INFO
     
     @property
     def native_value(self) -> Optional[datetime]:
         """Return the state of the sensor."""
-        stats = self.coordinator.get_request_stats()
+        stats = self.coordinator.request_stats
         last_request_time = stats.get("last_request_time")
         if last_request_time:
             return datetime.fromtimestamp(last_request_time, tz=timezone.utc)
@@ -238,40 +263,25 @@ class HYQWAdapterLastRequestStatusSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{DOMAIN}_request_last_status"
         self._attr_name = "花语前湾 最后请求状态"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        self._attr_icon = "mdi:check-circle-outline"
-    
-    @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, "hyqw_adapter_api")},
-            "name": "花语前湾 API",
-            "manufacturer": "花语前湾",
-            "model": "API Client",
-        }
+        self._attr_device_info = _API_DEVICE_INFO
+        self._icon_status: Optional[str] = None
+        self._status_icon = _STATUS_ICON_DEFAULT
     
     @property
     def native_value(self) -> Optional[str]:
         """Return the state of the sensor."""
-        stats = self.coordinator.get_request_stats()
+        stats = self.coordinator.request_stats
         return stats.get("last_request_status")
     
     @property
     def icon(self) -> str:
         """Return the icon for the sensor based on status."""
         status = self.native_value
-        if status == "success":
-            return "mdi:check-circle-outline"
-        elif status and status.startswith("api_error"):
-            return "mdi:alert-circle-outline"
-        elif status and status.startswith("http_error"):
-            return "mdi:web-remove"
-        elif status == "timeout":
-            return "mdi:clock-alert-outline"
-        elif status and status.startswith("exception"):
-            return "mdi:alert-outline"
-        else:
-            return "mdi:help-circle-outline"
+        # 状态很少变化，仅在状态字符串变化时重新查表
+        if status != self._icon_status:
+            self._icon_status = status
+            self._status_icon = _status_icon(status)
+        return self._status_icon
     
     @property
     def available(self) -> bool:
@@ -289,16 +299,7 @@ class HYQWAdapterPollingModeSensor(CoordinatorEntity, SensorEntity):
         self._attr_name = "花语前湾 轮询模式"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
         self._attr_icon = "mdi:refresh-auto"
-    
-    @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, "hyqw_adapter_polling_bus")},
-            "name": "花语前湾 轮询总线",
-            "manufacturer": "花语前湾",
-            "model": "Polling Bus",
-        }
+        self._attr_device_info = _POLLING_BUS_DEVICE_INFO
     
     @property
     def native_value(self) -> Optional[str]:
@@ -337,23 +338,13 @@ class HYQWAdapterPollingStatsSensor(CoordinatorEntity, SensorEntity):
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
         self._attr_icon = "mdi:chart-line"
-    
-    @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, "hyqw_adapter_polling_bus")},
-            "name": "花语前湾 轮询总线",
-            "manufacturer": "花语前湾",
-            "model": "Polling Bus",
-        }
+        self._attr_device_info = _POLLING_BUS_DEVICE_INFO
     
     @property
     def native_value(self) -> Optional[int]:
         """Return the state of the sensor."""
         if self.coordinator.polling_bus:
-            stats = self.coordinator.polling_bus.stats
-            return stats.get(self._stat_type, 0)
+            return getattr(self.coordinator.polling_stats, self._stat_type, 0)
         return 0
     
     @property
@@ -1,12 +1,94 @@
 """状态差分更新管理器 - State Differential Update Manager"""
 import asyncio
 import logging
-import copy
-from typing import Dict, List, Any, Optional, Set, Tuple
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
 _LOGGER = logging.getLogger(__name__)
 
+# 状态变化通知的合并窗口（秒），窗口内的多次更新合并为一次通知
+_NOTIFY_DELAY = 0.05
+
+
+def scaled_temperature(value: Any) -> Any:
+    """温度值大于100时按0.1℃为单位换算"""
+    if value and value > 100:
+        return value / 10
+    return value
+
+
+def current_temperature(value: Any) -> Optional[float]:
+    """空调当前温度（fn5）：无读数（缺失或0）时为None，否则换算后取float"""
+    if not value:
+        return None
+    return float(scaled_temperature(value))
+
+
+def _apply_generic(device: Dict, states: Dict) -> None:
+    """通用开关状态（所有设备类型）"""
+    if 1 in states:
+        device["is_on"] = states[1]["fv"] == 1
+
+
+def _apply_light(device: Dict, states: Dict) -> None:
+    """灯具设备 (typeId=8)"""
+    _apply_generic(device, states)
+    if 2 in states:
+        device["brightness"] = states[2]["fv"]
+
+
+def _apply_ac(device: Dict, states: Dict) -> None:
+    """空调设备 (typeId=12)"""
+    _apply_generic(device, states)
+    if 2 in states:
+        device["target_temperature"] = scaled_temperature(states[2]["fv"])
+    if 3 in states:
+        device["hvac_mode"] = states[3]["fv"]
+    if 4 in states:
+        device["fan_speed"] = states[4]["fv"]
+    if 5 in states:
+        device["current_temperature"] = current_temperature(states[5]["fv"])
+
+
+def _apply_floor_heating(device: Dict, states: Dict) -> None:
+    """地暖设备 (typeId=16)"""
+    _apply_generic(device, states)
+    if 2 in states:
+        device["target_temperature"] = scaled_temperature(states[2]["fv"])
+
+
+def _apply_fresh_air(device: Dict, states: Dict) -> None:
+    """新风设备 (typeId=36)"""
+    _apply_generic(device, states)
+    if 3 in states:
+        device["fan_speed"] = states[3]["fv"]
+
+
+# 窗帘控制状态 -> 运动状态
+_CURTAIN_MOVING_STATES = {2: "stopped", 1: "opening", 0: "closing"}
+
+
+def _apply_curtain(device: Dict, states: Dict) -> None:
+    """窗帘设备 (typeId=14)"""
+    _apply_generic(device, states)
+    if 2 in states:
+        device["position"] = states[2]["fv"]
+    if 1 in states:
+        moving_state = _CURTAIN_MOVING_STATES.get(states[1]["fv"])
+        if moving_state is not None:
+            device["moving_state"] = moving_state
+
+
+# 设备类型 -> 属性更新函数（未列出的类型使用_apply_generic）
+_TYPE_HANDLERS: Dict[int, Callable[[Dict, Dict], None]] = {
+    8: _apply_light,
+    12: _apply_ac,
+    14: _apply_curtain,
+    16: _apply_floor_heating,
+    36: _apply_fresh_air,
+}
+
 
 class StateManager:
     """状态差分更新管理器
@@ -20,14 +102,36 @@ class StateManager:
     
     def __init__(self):
         """初始化状态管理器"""
-        # 设备状态缓存 {si: {fn: {fv: value, st: status, timestamp: time}}}
+        # 设备状态缓存 {si: {fn: {fv: value, st: status, timestamp: time.monotonic()}}}
+        # 状态记录写入后只读：更新时整体替换为新字典，从不原地修改，
+        # 因此可在设备current_states与各查询结果之间直接共享
         self._device_states_cache = {}
         
         # 设备信息缓存 {device_id: device_info}
         self._devices_cache = {}
         
-        # 状态变化监听者
+        # si -> 设备信息索引（指向_devices_cache中的同一对象）
+        self._si_to_device: Dict[int, Dict] = {}
+        # si -> 属性更新函数（加载设备信息时按typeId解析一次）
+        self._si_to_handler: Dict[int, Callable[[Dict, Dict], None]] = {}
+        
+        # 状态缓存修订号，缓存每次被修改时递增
+        self.revision = 0
+        
+        # 上一批状态数据的 (si, fn, fv) 序列及处理后的缓存修订号：相同输入作用于未变化的缓存必然没有差异
+        self._last_batch_key: Optional[Tuple] = None
+        self._last_batch_revision = -1
+        
+        # 状态变化监听者（添加时按同步/异步分组，通知时无需逐个判断）
+        # 通知中的updated_devices为设备信息缓存本身，监听者只读不得修改
         self._state_listeners = []
+        self._sync_listeners = []
+        self._async_listeners = []
+        
+        # 待发送的合并通知及其定时器
+        self._pending_changes: Optional[Dict] = None
+        self._pending_devices: Dict[Any, Dict] = {}
+        self._notify_handle: Optional[asyncio.TimerHandle] = None
         
         # 统计信息
         self._stats = {
@@ -43,13 +147,21 @@ class StateManager:
     def add_state_listener(self, listener_callback) -> None:
         """添加状态变化监听者"""
         self._state_listeners.append(listener_callback)
-        _LOGGER.debug(f"添加状态监听者，当前监听者数量: {len(self._state_listeners)}")
+        if asyncio.iscoroutinefunction(listener_callback):
+            self._async_listeners.append(listener_callback)
+        else:
+            self._sync_listeners.append(listener_callback)
+        _LOGGER.debug("添加状态监听者，当前监听者数量: %s", len(self._state_listeners))
     
     def remove_state_listener(self, listener_callback) -> None:
         """移除状态变化监听者"""
         if listener_callback in self._state_listeners:
             self._state_listeners.remove(listener_callback)
-            _LOGGER.debug(f"移除状态监听者，当前监听者数量: {len(self._state_listeners)}")
+            if listener_callback in self._async_listeners:
+                self._async_listeners.remove(listener_callback)
+            else:
+                self._sync_listeners.remove(listener_callback)
+            _LOGGER.debug("移除状态监听者，当前监听者数量: %s", len(self._state_listeners))
     
     def update_devices_info(self, devices: List[Dict]) -> None:
         """更新设备信息缓存"""
@@ -60,11 +172,23 @@ class StateManager:
             if device_id:
                 self._devices_cache[device_id] = device.copy()
         
+        # 重建si索引；同一si对应多个设备时保留缓存中的第一个
+        si_index: Dict[int, Dict] = {}
+        for device in self._devices_cache.values():
+            si = device.get("si")
+            if si is not None:
+                si_index.setdefault(si, device)
+        self._si_to_device = si_index
+        self._si_to_handler = {
+            si: _TYPE_HANDLERS.get(device.get("typeId"), _apply_generic)
+            for si, device in si_index.items()
+        }
+        
         new_count = len(self._devices_cache)
         self._stats["cached_devices"] = new_count
         
         if new_count != old_count:
-            _LOGGER.info(f"设备信息缓存已更新: {old_count} -> {new_count} 个设备")
+            _LOGGER.info("设备信息缓存已更新: %s -> %s 个设备", old_count, new_count)
     
     def process_state_update(self, new_states_data: List[Dict]) -> Tuple[bool, Dict]:
         """处理状态更新数据
@@ -79,62 +203,82 @@ class StateManager:
             _LOGGER.debug("状态数据为空，跳过更新")
             return False, {}
         
+        # 逐项比较而非比较哈希值，避免哈希碰撞（如hash(-1) == hash(-2)）吞掉真实的状态变化
+        batch_key = tuple((s.get("si"), s.get("fn"), s.get("fv")) for s in new_states_data)
+        if batch_key == self._last_batch_key and self.revision == self._last_batch_revision:
+            _LOGGER.debug("状态数据与上一批相同，跳过差分")
+            return False, {}
+        # 先清空，处理完成后再记录，避免异常中断的批次被误判为已处理
+        self._last_batch_key = None
+        
         self._stats["total_updates"] += 1
         self._stats["last_update_time"] = datetime.now()
         
         # 组织新状态数据
         new_device_states = self._organize_states_data(new_states_data)
         
-        # 比较状态差异
-        changes = self._compare_states(new_device_states)
+        # 比较状态差异，同时更新缓存与设备属性
+        updated_devices: List[Dict] = []
+        changes = self._compare_and_apply(new_device_states, updated_devices)
         
         if not changes["has_changes"]:
+            self._remember_batch(batch_key)
             _LOGGER.debug("状态未发生变化")
             return False, changes
         
-        # 更新缓存
-        self._update_states_cache(new_device_states, changes)
-        
-        # 更新设备属性
-        updated_devices = self._update_device_properties(changes)
+        self.revision += 1
+        self._remember_batch(batch_key)
+        _LOGGER.debug("状态缓存与设备属性已更新 - 缓存设备数:%s, 更新设备:%s个",
+                      len(self._device_states_cache), len(updated_devices))
         
         # 推送状态变化
         self._notify_state_listeners(changes, updated_devices)
         
         # 更新统计信息
-        self._stats["devices_changed"] += len(changes["changed_devices"])
-        self._stats["functions_changed"] += sum(len(funcs) for funcs in changes["changed_functions"].values())
+        devices_changed = len(changes["changed_devices"])
+        functions_changed = sum(len(funcs) for funcs in changes["changed_functions"].values())
+        self._stats["devices_changed"] += devices_changed
+        self._stats["functions_changed"] += functions_changed
         
-        _LOGGER.info(f"状态差分更新完成 - 设备变化:{len(changes['changed_devices'])}个, "
-                    f"功能变化:{sum(len(funcs) for funcs in changes['changed_functions'].values())}个")
+        _LOGGER.info("状态差分更新完成 - 设备变化:%s个, 功能变化:%s个", devices_changed, functions_changed)
         
         return True, changes
     
+    def _remember_batch(self, batch_key: Tuple) -> None:
+        """记录刚处理完的状态批次及处理后的缓存修订号"""
+        self._last_batch_key = batch_key
+        self._last_batch_revision = self.revision
+    
     def _organize_states_data(self, states_data: List[Dict]) -> Dict[int, Dict[int, Dict]]:
         """组织状态数据按设备索引"""
         organized = {}
+        # 同一批状态点共用一个时间戳（time.monotonic()）
+        timestamp = time.monotonic()
         
         for state in states_data:
             si = state.get("si")
             fn = state.get("fn")
-            fv = state.get("fv")
-            st = state.get("st")
             
             if si is not None and fn is not None:
-                if si not in organized:
-                    organized[si] = {}
+                functions = organized.get(si)
+                if functions is None:
+                    functions = organized[si] = {}
                 
-                organized[si][fn] = {
-                    "fv": fv,
-                    "st": st,
-                    "timestamp": datetime.now().timestamp()
+                functions[fn] = {
+                    "fv": state.get("fv"),
+                    "st": state.get("st"),
+                    "timestamp": timestamp,
                 }
         
-        _LOGGER.debug(f"组织状态数据完成 - {len(organized)}个设备, {len(states_data)}个状态点")
+        _LOGGER.debug("组织状态数据完成 - %s个设备, %s个状态点", len(organized), len(states_data))
         return organized
     
-    def _compare_states(self, new_states: Dict[int, Dict[int, Dict]]) -> Dict:
-        """比较新旧状态差异"""
+    def _compare_and_apply(self, new_states: Dict[int, Dict[int, Dict]], updated_devices: List[Dict]) -> Dict:
+        """比较新旧状态差异，并在同一遍历中更新状态缓存与设备属性
+        
+        有变化的设备会写入状态缓存、合并到设备信息的current_states，
+        并追加到updated_devices。
+        """
         changes = {
             "has_changes": False,
             "changed_devices": set(),
@@ -142,6 +286,7 @@ class StateManager:
             "new_devices": set(),
             "new_functions": {},  # {si: [fn]}
         }
+        states_cache = self._device_states_cache
         
         # 比较每个设备的状态
         for si, functions in new_states.items():
@@ -150,180 +295,170 @@ class StateManager:
             device_new_functions = []
             
             # 检查是否为新设备
-            if si not in self._device_states_cache:
+            old_functions = states_cache.get(si)
+            if old_functions is None:
                 changes["new_devices"].add(si)
                 device_changed = True
-                _LOGGER.debug(f"发现新设备: si={si}")
+                old_functions = {}
+                _LOGGER.debug("发现新设备: si=%s", si)
+                # 新设备的全部状态都需要写入缓存
+                writes = functions
+            else:
+                # 只写入fv或st有变化的状态，仅时间戳不同的沿用缓存中的原对象
+                writes = {}
             
             # 比较每个功能的状态
             for fn, new_state in functions.items():
                 new_fv = new_state["fv"]
-                
-                # 获取旧状态
-                old_state = self._device_states_cache.get(si, {}).get(fn, {})
-                old_fv = old_state.get("fv")
+                old_state = old_functions.get(fn)
                 
                 # 检查是否为新功能
-                if si not in self._device_states_cache or fn not in self._device_states_cache[si]:
+                if old_state is None:
                     device_new_functions.append(fn)
                     device_changed = True
-                    _LOGGER.debug(f"设备si={si}新增功能: fn={fn}, fv={new_fv}")
+                    writes[fn] = new_state
+                    _LOGGER.debug("设备si=%s新增功能: fn=%s, fv=%s", si, fn, new_fv)
+                    continue
                 
                 # 检查功能值是否变化
-                elif old_fv != new_fv:
+                old_fv = old_state.get("fv")
+                if old_fv != new_fv:
                     device_function_changes[fn] = (old_fv, new_fv)
                     device_changed = True
-                    _LOGGER.debug(f"设备si={si}功能变化: fn={fn}, {old_fv} -> {new_fv}")
+                    writes[fn] = new_state
+                    _LOGGER.debug("设备si=%s功能变化: fn=%s, %s -> %s", si, fn, old_fv, new_fv)
+                elif old_state.get("st") != new_state["st"]:
+                    writes[fn] = new_state
+            
+            if not device_changed:
+                continue
             
             # 记录设备级别的变化
-            if device_changed:
-                changes["has_changes"] = True
-                changes["changed_devices"].add(si)
-                
-                if device_function_changes:
-                    changes["changed_functions"][si] = device_function_changes
-                
-                if device_new_functions:
-                    changes["new_functions"][si] = device_new_functions
-        
-        return changes
-    
-    def _update_states_cache(self, new_states: Dict[int, Dict[int, Dict]], changes: Dict) -> None:
-        """更新状态缓存"""
-        for si in changes["changed_devices"]:
-            if si in new_states:
-                if si not in self._device_states_cache:
-                    self._device_states_cache[si] = {}
-                
-                # 更新变化的功能状态
-                for fn, state_info in new_states[si].items():
-                    self._device_states_cache[si][fn] = state_info.copy()
-        
-        _LOGGER.debug(f"状态缓存已更新 - 缓存设备数:{len(self._device_states_cache)}")
-    
-    def _update_device_properties(self, changes: Dict) -> List[Dict]:
-        """更新设备属性"""
-        updated_devices = []
-        
-        for si in changes["changed_devices"]:
-            # 查找对应的设备信息
-            device_info = None
-            for device in self._devices_cache.values():
-                if device.get("si") == si:
-                    device_info = device
-                    break
+            changes["has_changes"] = True
+            changes["changed_devices"].add(si)
+            
+            if device_function_changes:
+                changes["changed_functions"][si] = device_function_changes
+            
+            if device_new_functions:
+                changes["new_functions"][si] = device_new_functions
             
+            # 更新状态缓存（状态字典由本批次新建，无需再复制）
+            current_states = states_cache.get(si)
+            if current_states is None:
+                current_states = states_cache[si] = {}
+            current_states.update(writes)
+            
+            # 查找对应的设备信息
+            device_info = self._si_to_device.get(si)
             if not device_info:
-                _LOGGER.warning(f"未找到设备si={si}的信息")
+                _LOGGER.warning("未找到设备si=%s的信息", si)
                 continue
             
             # 更新设备状态属性 - 合并而不是覆盖
-            current_states = self._device_states_cache.get(si, {})
-            
-            # 如果设备已有current_states，则合并新状态
-            if "current_states" in device_info:
-                existing_states = device_info["current_states"]
-                # 合并新状态到现有状态中
-                for fn, state_info in current_states.items():
-                    existing_states[fn] = state_info
-                device_info["current_states"] = existing_states
-            else:
-                # 如果没有现有状态，直接设置
-                device_info["current_states"] = current_states
+            device_states = device_info.setdefault("current_states", {})
+            device_states.update(current_states)
             
             # 根据设备类型更新特定属性
-            self._update_device_specific_properties(device_info, device_info["current_states"])
+            self._si_to_handler[si](device_info, device_states)
             
-            updated_devices.append(device_info.copy())
+            # 直接传递缓存中的设备信息，监听者只读不得修改
+            updated_devices.append(device_info)
         
-        _LOGGER.debug(f"设备属性更新完成 - {len(updated_devices)}个设备")
-        return updated_devices
-    
-    def _update_device_specific_properties(self, device: Dict, current_states: Dict) -> None:
-        """更新设备特定属性"""
-        type_id = device.get("typeId")
-        
-        # 通用开关状态
-        if 1 in current_states:
-            device["is_on"] = current_states[1]["fv"] == 1
-        
-        # 灯具设备 (typeId=8)
-        if type_id == 8:
-            if 2 in current_states:
-                device["brightness"] = current_states[2]["fv"]
-        
-        # 空调设备 (typeId=12)
-        elif type_id == 12:
-            if 2 in current_states:
-                temp_value = current_states[2]["fv"]
-                if temp_value and temp_value > 100:
-                    device["target_temperature"] = temp_value / 10
-                else:
-                    device["target_temperature"] = temp_value
-            
-            if 3 in current_states:
-                device["hvac_mode"] = current_states[3]["fv"]
-            
-            if 4 in current_states:
-                device["fan_speed"] = current_states[4]["fv"]
-            
-            if 5 in current_states:
-                current_temp = current_states[5]["fv"]
-                if current_temp and current_temp > 100:
-                    device["current_temperature"] = current_temp / 10
-                else:
-                    device["current_temperature"] = current_temp
-        
-        # 地暖设备 (typeId=16)
-        elif type_id == 16:
-            if 2 in current_states:
-                temp_value = current_states[2]["fv"]
-                if temp_value and temp_value > 100:
-                    device["target_temperature"] = temp_value / 10
-                else:
-                    device["target_temperature"] = temp_value
-        
-        # 新风设备 (typeId=36)
-        elif type_id == 36:
-            if 3 in current_states:
-                device["fan_speed"] = current_states[3]["fv"]
-        
-        # 窗帘设备 (typeId=14)
-        elif type_id == 14:
-            if 2 in current_states:
-                device["position"] = current_states[2]["fv"]
-            
-            if 1 in current_states:
-                control_state = current_states[1]["fv"]
-                if control_state == 2:
-                    device["moving_state"] = "stopped"
-                elif control_state == 1:
-                    device["moving_state"] = "opening"
-                elif control_state == 0:
-                    device["moving_state"] = "closing"
+        return changes
     
     def _notify_state_listeners(self, changes: Dict, updated_devices: List[Dict]) -> None:
-        """通知状态变化监听者"""
+        """通知状态变化监听者
+        
+        短时间内的多次状态变化先合并，在合并窗口结束时一次性通知，
+        同一设备功能多次变化时保留最早的旧值和最新的新值。
+        """
         if not self._state_listeners:
             return
         
+        self._merge_pending_changes(changes, updated_devices)
+        if self._notify_handle is not None:
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 不在事件循环中时立即通知
+            self._flush_state_notifications()
+            return
+        self._notify_handle = loop.call_later(_NOTIFY_DELAY, self._flush_state_notifications)
+    
+    def _merge_pending_changes(self, changes: Dict, updated_devices: List[Dict]) -> None:
+        """将一次状态变化合并到待发送的通知中（不修改传入的changes）"""
+        pending = self._pending_changes
+        if pending is None:
+            pending = self._pending_changes = {
+                "has_changes": True,
+                "changed_devices": set(),
+                "changed_functions": {},
+                "new_devices": set(),
+                "new_functions": {},
+            }
+        
+        pending["changed_devices"].update(changes.get("changed_devices", ()))
+        pending["new_devices"].update(changes.get("new_devices", ()))
+        
+        pending_functions = pending["changed_functions"]
+        for si, functions in changes.get("changed_functions", {}).items():
+            merged = pending_functions.setdefault(si, {})
+            for fn, (old_fv, new_fv) in functions.items():
+                previous = merged.get(fn)
+                merged[fn] = (previous[0] if previous else old_fv, new_fv)
+        
+        pending_new_functions = pending["new_functions"]
+        for si, fns in changes.get("new_functions", {}).items():
+            merged = pending_new_functions.setdefault(si, [])
+            merged.extend(fn for fn in fns if fn not in merged)
+        
+        # 同一设备只保留最新的设备信息
+        for device in updated_devices:
+            self._pending_devices[device.get("si", id(device))] = device
+    
+    def _flush_state_notifications(self) -> None:
+        """发送合并后的状态变化通知"""
+        self._notify_handle = None
+        changes = self._pending_changes
+        if changes is None:
+            return
+        updated_devices = list(self._pending_devices.values())
+        self._pending_changes = None
+        self._pending_devices = {}
+        
         notification_data = {
             "changes": changes,
             "updated_devices": updated_devices,
             "timestamp": datetime.now(),
         }
         
-        for listener in self._state_listeners:
+        for listener in self._sync_listeners:
             try:
-                if asyncio.iscoroutinefunction(listener):
-                    # 异步监听者需要在事件循环中调用
-                    asyncio.create_task(listener(notification_data))
-                else:
-                    listener(notification_data)
+                listener(notification_data)
             except Exception as err:
-                _LOGGER.error(f"通知状态监听者失败: {err}", exc_info=True)
+                _LOGGER.error("通知状态监听者失败: %s", err, exc_info=True)
         
-        _LOGGER.debug(f"已通知{len(self._state_listeners)}个状态监听者")
+        # 异步监听者合并为一个任务并发执行，避免每个监听者各建一个任务
+        if self._async_listeners:
+            try:
+                asyncio.create_task(self._notify_async_listeners(list(self._async_listeners), notification_data))
+            except Exception as err:
+                _LOGGER.error("通知状态监听者失败: %s", err, exc_info=True)
+        
+        _LOGGER.debug("已通知%s个状态监听者", len(self._state_listeners))
+    
+    @staticmethod
+    async def _notify_async_listeners(listeners: List, notification_data: Dict) -> None:
+        """并发调用异步监听者"""
+        results = await asyncio.gather(
+            *(listener(notification_data) for listener in listeners), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error("通知状态监听者失败: %s", result, exc_info=result)
     
     def get_device_state(self, si: int, fn: Optional[int] = None) -> Optional[Dict]:
         """获取设备状态"""
@@ -336,8 +471,8 @@ class StateManager:
         return self._device_states_cache[si].get(fn, {}).copy()
     
     def get_all_states(self) -> Dict[int, Dict[int, Dict]]:
-        """获取所有状态缓存"""
-        return copy.deepcopy(self._device_states_cache)
+        """获取所有状态缓存（按设备复制外两层，状态记录只读共享）"""
+        return {si: dict(functions) for si, functions in self._device_states_cache.items()}
     
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息"""
@@ -347,6 +482,16 @@ class StateManager:
         """清空状态缓存"""
         self._device_states_cache.clear()
         self._devices_cache.clear()
+        self._si_to_device.clear()
+        self._si_to_handler.clear()
+        self.revision += 1
+        
+        # 丢弃尚未发送的合并通知
+        if self._notify_handle is not None:
+            self._notify_handle.cancel()
+            self._notify_handle = None
+        self._pending_changes = None
+        self._pending_devices = {}
         
         self._stats.update({
             "total_updates": 0,
@@ -363,33 +508,33 @@ class StateManager:
             self._device_states_cache[si] = {}
         
         old_fv = self._device_states_cache[si].get(fn, {}).get("fv")
+        self.revision += 1
         
         self._device_states_cache[si][fn] = {
             "fv": fv,
             "st": 10101,  # 默认状态码
-            "timestamp": datetime.now().timestamp()
+            "timestamp": time.monotonic(),
         }
         
-        _LOGGER.info(f"强制更新设备状态: si={si}, fn={fn}, {old_fv} -> {fv}")
+        _LOGGER.info("强制更新设备状态: si=%s, fn=%s, %s -> %s", si, fn, old_fv, fv)
         
         # 查找并更新对应设备信息
-        for device in self._devices_cache.values():
-            if device.get("si") == si:
-                # 合并状态而不是覆盖
-                if "current_states" in device:
-                    device["current_states"][fn] = self._device_states_cache[si][fn]
-                else:
-                    device["current_states"] = self._device_states_cache[si].copy()
-                
-                self._update_device_specific_properties(device, device["current_states"])
-                
-                # 通知监听者
-                changes = {
-                    "has_changes": True,
-                    "changed_devices": {si},
-                    "changed_functions": {si: {fn: (old_fv, fv)}},
-                    "new_devices": set(),
-                    "new_functions": {},
-                }
-                self._notify_state_listeners(changes, [device])
-                break
+        device = self._si_to_device.get(si)
+        if device is not None:
+            # 合并状态而不是覆盖
+            if "current_states" in device:
+                device["current_states"][fn] = self._device_states_cache[si][fn]
+            else:
+                device["current_states"] = self._device_states_cache[si].copy()
+            
+            self._si_to_handler[si](device, device["current_states"])
+            
+            # 通知监听者
+            changes = {
+                "has_changes": True,
+                "changed_devices": {si},
+                "changed_functions": {si: {fn: (old_fv, fv)}},
+                "new_devices": set(),
+                "new_functions": {},
+            }
+            self._notify_state_listeners(changes, [device])
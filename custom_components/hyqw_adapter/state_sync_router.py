@@ -1,13 +1,28 @@
 """状态同步路由器 - State Sync Router for HYQW Adapter"""
 import asyncio
+import contextlib
 import logging
+import time
 from typing import Callable, Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from .const import MQTT_CONFIG
 
 _LOGGER = logging.getLogger(__name__)
 
+_TIMESTAMP_KEYS = ("last_mode_switch", "last_state_update", "last_fallback_check")
+
+
+def _as_async(callback: Callable) -> Callable:
+    """将回调统一为协程函数，注册时判断一次，调用处无需再检查"""
+    if asyncio.iscoroutinefunction(callback):
+        return callback
+    
+    async def _call(*args):
+        return callback(*args)
+    
+    return _call
+
 
 class StateSyncRouter:
     """状态同步路由器
@@ -30,6 +45,7 @@ class StateSyncRouter:
         self.state_manager = state_manager
         self.polling_bus = polling_bus
         self.update_callback = update_callback
+        self._update_callback_async = _as_async(update_callback) if update_callback else None
         
         # 路由模式
         self.current_mode = "polling"  # polling | mqtt
@@ -40,11 +56,16 @@ class StateSyncRouter:
         self.fallback_interval = MQTT_CONFIG["default_fallback_interval"]  # 默认10分钟
         self.fallback_task: Optional[asyncio.Task] = None
         self.fallback_callback: Optional[Callable] = None
+        self._fallback_callback_async: Optional[Callable] = None
+        self._fallback_reconfig = asyncio.Event()
+        # 进行中的兜底状态拉取（多个调用方共享同一次请求）及模式切换后的后台立即同步任务
+        self._fallback_fetch: Optional[asyncio.Task] = None
+        self._immediate_sync_task: Optional[asyncio.Task] = None
         
         # 乐观回显设置
         self.optimistic_echo_enabled = MQTT_CONFIG["default_optimistic_echo"]
         
-        # 统计信息
+        # 统计信息（last_*时间戳记录为time.monotonic()，在get_status中换算为datetime）
         self.stats = {
             "mode_switches": 0,
             "mqtt_state_updates": 0,
@@ -60,6 +81,7 @@ class StateSyncRouter:
     def set_fallback_callback(self, callback: Callable) -> None:
         """设置兜底巡检回调函数"""
         self.fallback_callback = callback
+        self._fallback_callback_async = _as_async(callback) if callback else None
         _LOGGER.debug("兜底巡检回调已设置")
     
     def configure_fallback(self, interval: int) -> None:
@@ -74,9 +96,9 @@ class StateSyncRouter:
         if old_interval != interval:
             _LOGGER.info(f"兜底巡检间隔已更新: {old_interval}s -> {interval}s")
             
-            # 如果正在MQTT模式且兜底巡检在运行，重启兜底任务
-            if self.current_mode == "mqtt" and self.fallback_task:
-                asyncio.create_task(self._restart_fallback_task())
+            # 如果兜底巡检在运行，唤醒循环按新间隔重新计时（无需重启任务）
+            if self.fallback_task and not self.fallback_task.done():
+                self._fallback_reconfig.set()
     
     def set_optimistic_echo(self, enabled: bool) -> None:
         """设置乐观回显开关"""
@@ -110,12 +132,12 @@ class StateSyncRouter:
         # 启动兜底巡检
         await self._start_fallback_task()
         
-        # 立即执行一次状态同步
-        await self._perform_immediate_sync()
+        # 立即执行一次状态同步（后台执行，不让模式切换等待HTTP请求）
+        self._start_immediate_sync()
         
         # 更新统计
         self.stats["mode_switches"] += 1
-        self.stats["last_mode_switch"] = datetime.now()
+        self.stats["last_mode_switch"] = time.monotonic()
         
         _LOGGER.info(f"模式切换完成: {old_mode} -> mqtt")
     
@@ -131,6 +153,7 @@ class StateSyncRouter:
         self.mqtt_active = False
         
         # 停止兜底巡检
+        await self._cancel_immediate_sync()
         await self._stop_fallback_task()
         
         # 启动轮询总线
@@ -142,7 +165,7 @@ class StateSyncRouter:
         
         # 更新统计
         self.stats["mode_switches"] += 1
-        self.stats["last_mode_switch"] = datetime.now()
+        self.stats["last_mode_switch"] = time.monotonic()
         
         _LOGGER.info(f"模式切换完成: {old_mode} -> polling")
     
@@ -176,7 +199,7 @@ class StateSyncRouter:
             
             if has_changes:
                 self.stats["mqtt_state_updates"] += 1
-                self.stats["last_state_update"] = datetime.now()
+                self.stats["last_state_update"] = time.monotonic()
                 
                 _LOGGER.info(f"MQTT状态更新 - {len(changes.get('changed_devices', set()))}个设备有变化")
                 
@@ -206,7 +229,7 @@ class StateSyncRouter:
             
             if has_changes:
                 self.stats["polling_state_updates"] += 1
-                self.stats["last_state_update"] = datetime.now()
+                self.stats["last_state_update"] = time.monotonic()
                 
                 _LOGGER.info(f"轮询状态更新 - {len(changes.get('changed_devices', set()))}个设备有变化")
                 
@@ -236,7 +259,7 @@ class StateSyncRouter:
             
             if has_changes:
                 self.stats["fallback_checks"] += 1
-                self.stats["last_fallback_check"] = datetime.now()
+                self.stats["last_fallback_check"] = time.monotonic()
                 
                 _LOGGER.info(f"兜底巡检发现状态差异 - {len(changes.get('changed_devices', set()))}个设备有变化")
                 
@@ -250,12 +273,12 @@ class StateSyncRouter:
     
     async def _trigger_coordinator_update(self, changes: Dict) -> None:
         """触发coordinator数据更新"""
+        # 没有可观察的设备变化时不通知，避免所有实体无意义地重写状态
+        if not changes.get("changed_devices"):
+            return
         try:
-            if self.update_callback:
-                if asyncio.iscoroutinefunction(self.update_callback):
-                    await self.update_callback(changes)
-                else:
-                    self.update_callback(changes)
+            if self._update_callback_async:
+                await self._update_callback_async(changes)
         except Exception as err:
             _LOGGER.error(f"触发coordinator更新失败: {err}")
     
@@ -276,22 +299,38 @@ class StateSyncRouter:
         """停止兜底巡检任务"""
         if self.fallback_task and not self.fallback_task.done():
             self.fallback_task.cancel()
-            try:
+            with contextlib.suppress(asyncio.CancelledError):
                 await self.fallback_task
-            except asyncio.CancelledError:
-                pass
             _LOGGER.info("兜底巡检任务已停止")
         
         self.fallback_task = None
     
-    async def _restart_fallback_task(self) -> None:
-        """重启兜底巡检任务"""
-        await self._stop_fallback_task()
-        await self._start_fallback_task()
+    def _start_immediate_sync(self) -> None:
+        """在后台启动立即状态同步（已有同步在进行时不重复启动）"""
+        task = self._immediate_sync_task
+        if task is None or task.done():
+            self._immediate_sync_task = asyncio.create_task(self._perform_immediate_sync())
+    
+    async def _cancel_immediate_sync(self) -> None:
+        """取消尚未完成的后台立即同步"""
+        task = self._immediate_sync_task
+        self._immediate_sync_task = None
+        if task and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+    
+    async def _fetch_fallback_states(self) -> Optional[List[Dict]]:
+        """拉取云端状态；并发调用共享同一次请求，避免重复的HTTP查询"""
+        task = self._fallback_fetch
+        if task is None or task.done():
+            task = self._fallback_fetch = asyncio.create_task(self._fallback_callback_async())
+        # shield：某个调用方被取消时不影响其他调用方共享的请求
+        return await asyncio.shield(task)
     
     async def _perform_immediate_sync(self) -> None:
         """立即执行状态同步"""
-        if not self.fallback_callback:
+        if not self._fallback_callback_async:
             _LOGGER.debug("没有设置兜底巡检回调，跳过立即状态同步")
             return
         
@@ -299,10 +338,7 @@ class StateSyncRouter:
             _LOGGER.info("路由器执行立即状态同步")
             
             # 调用兜底巡检回调获取云服务器状态
-            if asyncio.iscoroutinefunction(self.fallback_callback):
-                states = await self.fallback_callback()
-            else:
-                states = self.fallback_callback()
+            states = await self._fetch_fallback_states()
             
             if states:
                 _LOGGER.info(f"路由器立即状态同步完成，获取到{len(states)}个设备状态")
@@ -317,23 +353,32 @@ class StateSyncRouter:
     
     async def _fallback_loop(self) -> None:
         """兜底巡检循环"""
+        reconfig = self._fallback_reconfig
+        reconfig.clear()
         try:
             while True:
-                await asyncio.sleep(self.fallback_interval)
+                try:
+                    await asyncio.wait_for(reconfig.wait(), timeout=self.fallback_interval)
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    # 巡检间隔被重新配置：间隔为0时退出，否则按新间隔重新计时
+                    reconfig.clear()
+                    if self.fallback_interval <= 0:
+                        _LOGGER.info("兜底巡检已禁用，退出巡检循环")
+                        break
+                    continue
                 
-                if self.using_mqtt() and self.fallback_callback:
+                if self.using_mqtt() and self._fallback_callback_async:
                     try:
                         _LOGGER.debug("执行兜底巡检")
                         
-                        if asyncio.iscoroutinefunction(self.fallback_callback):
-                            states = await self.fallback_callback()
-                        else:
-                            states = self.fallback_callback()
+                        states = await self._fetch_fallback_states()
                         
                         if states:
                             await self.handle_fallback_states(states)
                         
-                        self.stats["last_fallback_check"] = datetime.now()
+                        self.stats["last_fallback_check"] = time.monotonic()
                         
                     except Exception as err:
                         _LOGGER.error(f"兜底巡检执行失败: {err}")
@@ -352,6 +397,7 @@ class StateSyncRouter:
         _LOGGER.info("停止状态同步路由器")
         
         # 停止兜底巡检
+        await self._cancel_immediate_sync()
         await self._stop_fallback_task()
         
         # 停止轮询总线
@@ -371,11 +417,22 @@ class StateSyncRouter:
             "optimistic_echo_enabled": self.optimistic_echo_enabled,
             "fallback_interval": self.fallback_interval,
             "fallback_running": self.fallback_task is not None and not self.fallback_task.done(),
-            "stats": self.stats.copy(),
+            "stats": self._format_stats(),
         }
         
         return status
     
+    def _format_stats(self) -> Dict[str, Any]:
+        """复制统计信息，并将单调时钟时间戳换算为datetime"""
+        stats = self.stats.copy()
+        now_mono = time.monotonic()
+        now = datetime.now()
+        for key in _TIMESTAMP_KEYS:
+            value = stats[key]
+            if value is not None:
+                stats[key] = now - timedelta(seconds=now_mono - value)
+        return stats
+    
     def reset_stats(self) -> None:
         """重置统计信息"""
         self.stats.update({
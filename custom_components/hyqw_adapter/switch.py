@@ -20,6 +20,12 @@ from .mqtt_entities import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# 开关控制功能码（模块加载时解析一次）
+_SWITCH_ON_FN = DEVICE_FUNCTIONS["switch"]["turn_on"]["fn"]
+_SWITCH_ON_FV = DEVICE_FUNCTIONS["switch"]["turn_on"]["fv"]
+_SWITCH_OFF_FN = DEVICE_FUNCTIONS["switch"]["turn_off"]["fn"]
+_SWITCH_OFF_FV = DEVICE_FUNCTIONS["switch"]["turn_off"]["fv"]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -66,49 +72,48 @@ class HYQWAdapterSwitch(CoordinatorEntity, SwitchEntity):
         # 设置设备图标（为将来的开关设备保留）
         # 当前没有需要单独开关实体的设备
         self._attr_icon = "mdi:toggle-switch"
-    
-    @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information."""
-        return {
+        # 设备信息只依赖初始化时的设备标识字段，构建一次
+        self._attr_device_info = {
             "identifiers": {(DOMAIN, str(self._device_id))},
             "name": self._initial_name,  # 使用初始名称，避免重置用户自定义名称
             "manufacturer": "花语前湾",
-            "model": f"Type {self._device.get('typeId')}",
-            "sw_version": self._device.get("projectCode", "Unknown"),
-            "suggested_area": self._device.get("roomName"),
+            "model": f"Type {device.get('typeId')}",
+            "sw_version": device.get("projectCode", "Unknown"),
+            "suggested_area": device.get("roomName"),
         }
+        self._update_is_on()
+        self._update_base_attrs()
     
-    @property
-    def is_on(self) -> bool:
-        """Return if the switch is on."""
+    def _update_is_on(self) -> None:
+        """根据设备数据计算开关状态，仅在设备数据更新时执行一次"""
         # 优先使用实时状态数据
-        current_states = self._device.get("current_states", {})
-        if 1 in current_states:  # fn=1 是开关状态
-            return current_states[1]["fv"] == 1
-        return self._device.get("state", 0) == 1 or self._device.get("is_on", False)
+        switch_state = (self._device.get("current_states") or {}).get(1)  # fn=1 是开关状态
+        if switch_state is not None:
+            self._attr_is_on = switch_state["fv"] == 1
+        else:
+            self._attr_is_on = self._device.get("state", 0) == 1 or self._device.get("is_on", False)
     
     @property
     def available(self) -> bool:
         """Return if entity is available."""
         return self.coordinator.last_update_success
     
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return entity specific state attributes."""
-        attrs = {
+    def _update_base_attrs(self) -> None:
+        """设备数据更新时重建基础属性，读取属性时直接复用"""
+        self._base_attrs = {
             "device_id": self._device.get("deviceId"),
             "device_name": self._device.get("deviceName"),
             "si": self._device.get("si"),
             "room": self._device.get("roomName"),
         }
-        
+    
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return entity specific state attributes."""
         # 添加processing状态
         if self.coordinator.is_entity_occupied(self.entity_id):
-            attrs["processing"] = True
-            attrs["status"] = "processing"
-        
-        return attrs
+            return {**self._base_attrs, "processing": True, "status": "processing"}
+        return self._base_attrs
     
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
@@ -116,8 +121,8 @@ class HYQWAdapterSwitch(CoordinatorEntity, SwitchEntity):
             device_id=self._device_id,
             st=self._device["st"],
             si=self._device["si"],
-            fn=DEVICE_FUNCTIONS["switch"]["turn_on"]["fn"],
-            fv=DEVICE_FUNCTIONS["switch"]["turn_on"]["fv"],
+            fn=_SWITCH_ON_FN,
+            fv=_SWITCH_ON_FV,
             entity_id=self.entity_id,  # 传递实体ID用于节流控制
         )
         
@@ -131,8 +136,8 @@ class HYQWAdapterSwitch(CoordinatorEntity, SwitchEntity):
             device_id=self._device_id,
             st=self._device["st"],
             si=self._device["si"],
-            fn=DEVICE_FUNCTIONS["switch"]["turn_off"]["fn"],
-            fv=DEVICE_FUNCTIONS["switch"]["turn_off"]["fv"],
+            fn=_SWITCH_OFF_FN,
+            fv=_SWITCH_OFF_FV,
             entity_id=self.entity_id,  # 传递实体ID用于节流控制
         )
         
@@ -143,11 +148,11 @@ class HYQWAdapterSwitch(CoordinatorEntity, SwitchEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         # 更新设备信息
-        if self.coordinator.data and "devices" in self.coordinator.data:
-            for device in self.coordinator.data["devices"]:
-                if device["deviceId"] == self._device_id:
-                    self._device = device
-                    break
+        device = self.coordinator.get_device_by_id(self._device_id)
+        if device is not None:
+            self._device = device
+        self._update_is_on()
+        self._update_base_attrs()
         super()._handle_coordinator_update()
     
     async def async_added_to_hass(self) -> None:
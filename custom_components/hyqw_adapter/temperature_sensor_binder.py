@@ -1,6 +1,7 @@
 """温度传感器绑定管理器 - 为地暖设备自动绑定同区域空调的温度传感器."""
+import asyncio
 import logging
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry, entity_registry
@@ -25,43 +26,72 @@ class TemperatureSensorBinder:
         self.entity_reg = entity_registry.async_get(hass)
         self._binding_cache: Dict[str, str] = {}  # 地暖设备ID -> 空调温度传感器实体ID
         self._processed_devices: Set[str] = set()  # 已处理的设备ID集合
+        self._entity_id_cache: Dict[Tuple[str, str], str] = {}  # (domain, unique_id) -> entity_id
     
-    def get_devices_by_room(self, devices: List[Dict]) -> Dict[str, List[Dict]]:
-        """按房间分组设备."""
-        room_devices = {}
+    def _lookup_entity_id(self, domain: str, unique_id: str) -> Optional[str]:
+        """通过 unique_id 查找 entity_id，命中结果缓存（未注册的不缓存，以便实体稍后注册时能查到）."""
+        key = (domain, unique_id)
+        entity_id = self._entity_id_cache.get(key)
+        if entity_id is None:
+            entity_id = self.entity_reg.async_get_entity_id(domain, DOMAIN, unique_id)
+            if entity_id:
+                self._entity_id_cache[key] = entity_id
+        return entity_id
+    
+    @staticmethod
+    def group_climate_devices_by_room(
+        devices: List[Dict],
+    ) -> Dict[str, Tuple[List[Tuple[str, Dict]], List[Tuple[str, Dict]]]]:
+        """单次遍历按房间分组空调(typeId=12)与地暖(typeId=16)设备: {房间: (空调列表, 地暖列表)}.
+
+        列表元素为 (设备ID字符串, 设备)，设备ID只在分组时转换一次.
+        """
+        rooms: Dict[str, Tuple[List[Tuple[str, Dict]], List[Tuple[str, Dict]]]] = {}
         
         for device in devices:
+            type_id = device.get("typeId")
+            if type_id == 12:
+                slot = 0
+            elif type_id == 16:
+                slot = 1
+            else:
+                continue
             room_name = device.get("roomName", "未知房间")
-            if room_name not in room_devices:
-                room_devices[room_name] = []
-            room_devices[room_name].append(device)
+            bucket = rooms.get(room_name)
+            if bucket is None:
+                bucket = rooms[room_name] = ([], [])
+            bucket[slot].append((str(device.get("deviceId")), device))
         
-        return room_devices
+        return rooms
     
-    def find_room_temperature_sensor(self, room_name: str, devices: List[Dict]) -> Optional[Dict]:
-        """在指定房间内查找空调温度传感器 (通过 unique_id 精确匹配)."""
-        for device in devices:
-            if device.get("typeId") == 12:
-                device_id = str(device.get("deviceId"))
-                unique_id = f"{DOMAIN}_{device_id}_temperature"
-                # 通过 unique_id 查找真实的 entity_id，避免硬编码
-                entity_id = self.entity_reg.async_get_entity_id("sensor", DOMAIN, unique_id)
-                if entity_id:
-                    _LOGGER.debug(f"在房间 {room_name} 找到空调温度传感器: {device.get('deviceName')} -> {entity_id}")
-                    return device
-                else:
-                    _LOGGER.debug(f"空调 {device.get('deviceName')} 的温度传感器尚未注册 (unique_id={unique_id})")
+    def find_room_temperature_sensor(
+        self, room_name: str, ac_devices: List[Tuple[str, Dict]]
+    ) -> Optional[Tuple[str, Dict]]:
+        """在指定房间的 (设备ID, 空调) 列表中查找已注册温度传感器的空调 (通过 unique_id 精确匹配)."""
+        for device_id, device in ac_devices:
+            unique_id = f"{DOMAIN}_{device_id}_temperature"
+            # 通过 unique_id 查找真实的 entity_id，避免硬编码
+            entity_id = self._lookup_entity_id("sensor", unique_id)
+            if entity_id:
+                _LOGGER.debug(f"在房间 {room_name} 找到空调温度传感器: {device.get('deviceName')} -> {entity_id}")
+                return device_id, device
+            else:
+                _LOGGER.debug(f"空调 {device.get('deviceName')} 的温度传感器尚未注册 (unique_id={unique_id})")
         return None
     
     def bind_floor_heating_to_ac_sensor(self, floor_heating_device: Dict, ac_device: Dict) -> bool:
         """将地暖设备绑定到空调温度传感器 (通过 unique_id 查找实体)."""
+        return self._bind(
+            str(floor_heating_device.get("deviceId")), floor_heating_device,
+            str(ac_device.get("deviceId")), ac_device,
+        )
+    
+    def _bind(self, floor_heating_id: str, floor_heating_device: Dict, ac_id: str, ac_device: Dict) -> bool:
+        """按已转换的设备ID字符串建立绑定."""
         try:
-            floor_heating_id = str(floor_heating_device.get("deviceId"))
-            ac_id = str(ac_device.get("deviceId"))
-
             # 通过 unique_id 获取空调温度传感器 entity_id
             temp_unique_id = f"{DOMAIN}_{ac_id}_temperature"
-            temp_sensor_entity_id = self.entity_reg.async_get_entity_id("sensor", DOMAIN, temp_unique_id)
+            temp_sensor_entity_id = self._lookup_entity_id("sensor", temp_unique_id)
             if not temp_sensor_entity_id:
                 _LOGGER.debug(
                     f"空调 {ac_device.get('deviceName')} 的温度传感器尚未注册, unique_id={temp_unique_id}"
@@ -70,7 +100,7 @@ class TemperatureSensorBinder:
 
             # 通过 unique_id 获取地暖 climate entity_id
             floor_unique_id = f"{DOMAIN}_{floor_heating_id}"
-            floor_heating_entity_id = self.entity_reg.async_get_entity_id("climate", DOMAIN, floor_unique_id)
+            floor_heating_entity_id = self._lookup_entity_id("climate", floor_unique_id)
             if not floor_heating_entity_id:
                 _LOGGER.debug(
                     f"地暖 {floor_heating_device.get('deviceName')} 的climate实体尚未注册, unique_id={floor_unique_id}"
@@ -89,50 +119,56 @@ class TemperatureSensorBinder:
             return False
     
     def get_bound_temperature_sensor(self, floor_heating_device_id: str) -> Optional[str]:
-        """获取地暖设备绑定的温度传感器实体ID."""
-        return self._binding_cache.get(str(floor_heating_device_id))
+        """获取地暖设备绑定的温度传感器实体ID (设备ID为字符串)."""
+        return self._binding_cache.get(floor_heating_device_id)
     
-    def process_room_devices(self, room_name: str, devices: List[Dict]) -> None:
-        """处理房间内的设备，建立温度传感器绑定关系."""
-        # 查找空调设备
-        ac_devices = [d for d in devices if d.get("typeId") == 12]
-        # 查找地暖设备
-        floor_heating_devices = [d for d in devices if d.get("typeId") == 16]
-        
+    def process_room_devices(
+        self,
+        room_name: str,
+        ac_devices: List[Tuple[str, Dict]],
+        floor_heating_devices: List[Tuple[str, Dict]],
+    ) -> None:
+        """处理房间内已按类型分好的空调与地暖设备，建立温度传感器绑定关系."""
         if not ac_devices or not floor_heating_devices:
             _LOGGER.debug(f"房间 {room_name} 没有空调或地暖设备，跳过温度传感器绑定")
             return
         
-        # 为每个地暖设备绑定第一个空调的温度传感器
-        for floor_heating in floor_heating_devices:
-            floor_heating_id = str(floor_heating.get("deviceId"))
-            
-            # 避免重复处理
-            if floor_heating_id in self._processed_devices:
-                continue
-            
-            # 查找可用的空调温度传感器
-            for ac_device in ac_devices:
-                if self.bind_floor_heating_to_ac_sensor(floor_heating, ac_device):
-                    self._processed_devices.add(floor_heating_id)
-                    break
-    
-    def process_all_devices(self, devices: List[Dict]) -> None:
-        """处理所有设备，建立温度传感器绑定关系."""
-        _LOGGER.debug("开始处理温度传感器绑定...")
+        # 跳过已处理的地暖设备
+        pending = [
+            item for item in floor_heating_devices
+            if item[0] not in self._processed_devices
+        ]
+        if not pending:
+            return
         
-        # 统计设备类型
-        ac_count = len([d for d in devices if d.get("typeId") == 12])
-        floor_heating_count = len([d for d in devices if d.get("typeId") == 16])
-        _LOGGER.debug(f"发现 {ac_count} 个空调设备，{floor_heating_count} 个地暖设备")
+        # 每个房间只选一次：第一个温度传感器已注册的空调
+        ac = self.find_room_temperature_sensor(room_name, ac_devices)
+        if ac is None:
+            return
+        ac_id, ac_device = ac
         
-        # 按房间分组设备
-        room_devices = self.get_devices_by_room(devices)
-        _LOGGER.debug(f"设备分布在 {len(room_devices)} 个房间中")
+        # 为每个地暖设备绑定所选空调的温度传感器
+        for floor_heating_id, floor_heating in pending:
+            if self._bind(floor_heating_id, floor_heating, ac_id, ac_device):
+                self._processed_devices.add(floor_heating_id)
+    
+    def _group_rooms(self, devices: List[Dict]) -> Dict[str, Tuple[List[Tuple[str, Dict]], List[Tuple[str, Dict]]]]:
+        """单次遍历按房间分组空调与地暖设备，并输出统计日志."""
+        _LOGGER.debug("开始处理温度传感器绑定...")
         
-        # 处理每个房间的设备
-        for room_name, room_device_list in room_devices.items():
-            self.process_room_devices(room_name, room_device_list)
+        room_devices = self.group_climate_devices_by_room(devices)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            ac_count = sum(len(ac) for ac, _ in room_devices.values())
+            floor_heating_count = sum(len(fh) for _, fh in room_devices.values())
+            _LOGGER.debug("发现 %s 个空调设备，%s 个地暖设备，分布在 %s 个房间中",
+                          ac_count, floor_heating_count, len(room_devices))
+        return room_devices
+    
+    async def async_process_all_devices(self, devices: List[Dict]) -> None:
+        """处理所有设备，建立温度传感器绑定关系；每处理完一个房间让出一次事件循环，避免长时间占用."""
+        for room_name, (ac_devices, floor_heating_devices) in self._group_rooms(devices).items():
+            self.process_room_devices(room_name, ac_devices, floor_heating_devices)
+            await asyncio.sleep(0)
         
         _LOGGER.info(f"温度传感器绑定完成，共处理 {len(self._processed_devices)} 个地暖设备")
     
@@ -155,4 +191,5 @@ class TemperatureSensorBinder:
         """清除所有绑定关系."""
         self._binding_cache.clear()
         self._processed_devices.clear()
+        self._entity_id_cache.clear()
         _LOGGER.info("温度传感器绑定关系已清除")
@@ -33,7 +33,7 @@ class DeviceAction:
     fv: int
     action_id: str
     entity_id: str  # Home Assistant实体ID
-    timestamp: float
+    timestamp: float  # 提交时间（time.monotonic()，仅用于计算等待时长）
     status: ActionStatus = ActionStatus.PENDING
     result: Optional[bool] = None
     error_message: Optional[str] = None
@@ -45,7 +45,7 @@ class OptimizedThrottledActionBus:
     基于FIFO队列的设备操作管理：
     1. 点击设备时检查设备是否已在队列中，如果存在不允许添加
     2. 如果不存在，添加到队列尾部，设置设备状态为占用
-    3. 队列size=1时立即执行，否则按顺序处理
+    3. 常驻处理器空闲时立即执行，否则按顺序处理
     4. 执行流程：触发短轮询总线 -> 异步等待200ms -> 触发回调
     5. 回调完成后设置目标值，继续处理队列
     """
@@ -66,15 +66,21 @@ class OptimizedThrottledActionBus:
         
         # FIFO队列管理
         self._action_queue: deque = deque()
+        # 排队中的操作索引 {action_id: action}，与队列同步增删
+        self._action_index: Dict[str, DeviceAction] = {}
         self._executing_action: Optional[DeviceAction] = None
         
         # 设备占用状态 {entity_id: action_id}
         self._occupied_devices: Dict[str, str] = {}
         
+        # 操作ID序号（递增计数，避免同一毫秒内提交的操作ID重复）
+        self._action_seq = 0
+        
         # 运行状态
         self._is_running = False
         self._processor_task: Optional[asyncio.Task] = None
-        self._processing_lock = asyncio.Lock()
+        # 有新操作入队时唤醒常驻处理器
+        self._queue_event = asyncio.Event()
         
         # 统计信息
         self._stats = {
@@ -96,6 +102,7 @@ class OptimizedThrottledActionBus:
             return
         
         self._is_running = True
+        self._processor_task = asyncio.create_task(self._run_processor())
         _LOGGER.info("优化版操作节流总线已启动")
     
     async def stop(self) -> None:
@@ -109,13 +116,13 @@ class OptimizedThrottledActionBus:
                 await self._processor_task
             except asyncio.CancelledError:
                 pass
+        self._processor_task = None
+        self._executing_action = None
         
-        # 取消所有排队的操作
-        while self._action_queue:
-            action = self._action_queue.popleft()
-            action.status = ActionStatus.CANCELLED
-            action.error_message = "节流总线已停止"
-            self._stats["cancelled_actions"] += 1
+        # 取消所有排队的操作（操作对象只由队列持有，直接丢弃）
+        self._stats["cancelled_actions"] += len(self._action_queue)
+        self._action_queue.clear()
+        self._action_index.clear()
         
         # 清空占用状态
         self._occupied_devices.clear()
@@ -139,7 +146,7 @@ class OptimizedThrottledActionBus:
             
         Raises:
             RuntimeError: 节流总线未运行
-            ValueError: 设备已被占用
+            ValueError: 设备已被占用（操作正在执行，或排队中的操作功能码不同）
         """
         if not self._is_running:
             raise RuntimeError("节流总线未运行")
@@ -147,11 +154,21 @@ class OptimizedThrottledActionBus:
         # 检查设备是否已在队列中（占用状态检测）
         if entity_id in self._occupied_devices:
             existing_action_id = self._occupied_devices[entity_id]
+            
+            # 同一功能的操作尚在排队时直接更新目标值（如连续拖动滑块），只执行最终值
+            pending = self._action_index.get(existing_action_id)
+            if (pending is not None and pending.status == ActionStatus.PENDING
+                    and pending.si == si and pending.fn == fn and pending.st == st):
+                _LOGGER.debug(f"合并排队中的操作: {entity_id} (fn={fn}) fv {pending.fv} -> {fv}")
+                pending.fv = fv
+                return existing_action_id
+            
             _LOGGER.warning(f"设备 {entity_id} 已存在于队列中: {existing_action_id}")
             raise ValueError(f"设备 {entity_id} 正在处理中，请稍后再试")
         
         # 生成操作ID
-        action_id = f"action_{int(time.time() * 1000)}"
+        self._action_seq += 1
+        action_id = f"action_{self._action_seq}"
         
         # 创建操作对象
         action = DeviceAction(
@@ -162,11 +179,12 @@ class OptimizedThrottledActionBus:
             fv=fv,
             action_id=action_id,
             entity_id=entity_id,
-            timestamp=time.time(),
+            timestamp=time.monotonic(),
         )
         
         # 添加到FIFO队列尾部
         self._action_queue.append(action)
+        self._action_index[action_id] = action
         
         # 设置设备占用状态
         self._occupied_devices[entity_id] = action_id
@@ -180,10 +198,8 @@ class OptimizedThrottledActionBus:
         _LOGGER.info(f"设备操作已加入队列: {entity_id} (fn={fn}, fv={fv}) "
                     f"- 队列长度: {queue_length}")
         
-        # 如果队列size=1，立即开始处理
-        if queue_length == 1:
-            _LOGGER.debug(f"队列size=1，立即开始处理操作: {action_id}")
-            asyncio.create_task(self._process_queue())
+        # 唤醒常驻处理器（处理器空闲时立即开始处理）
+        self._queue_event.set()
         
         return action_id
     
@@ -193,47 +209,51 @@ class OptimizedThrottledActionBus:
     
     def get_device_action_status(self, entity_id: str) -> Optional[str]:
         """获取设备的操作状态"""
-        if entity_id not in self._occupied_devices:
+        action_id = self._occupied_devices.get(entity_id)
+        if action_id is None:
             return None
         
-        action_id = self._occupied_devices[entity_id]
-        
         # 检查当前执行的操作
         if self._executing_action and self._executing_action.action_id == action_id:
             return "executing"
         
         # 检查队列中的操作
-        for action in self._action_queue:
-            if action.action_id == action_id:
-                return "pending"
+        if action_id in self._action_index:
+            return "pending"
         
         return "unknown"
     
-    async def _process_queue(self) -> None:
-        """处理队列中的操作（使用锁防止并发处理）"""
-        async with self._processing_lock:
-            while self._action_queue and self._is_running:
-                # 弹出队列头部的操作
-                action = self._action_queue.popleft()
-                self._executing_action = action
-                action.status = ActionStatus.EXECUTING
-                
-                _LOGGER.info(f"开始处理操作: {action.entity_id} (fn={action.fn}, fv={action.fv})")
-                
-                # 执行操作流程
-                await self._execute_action_flow(action)
-                
-                # 清理执行状态
-                self._executing_action = None
-                
-                # 清除设备占用状态
-                if action.entity_id in self._occupied_devices:
-                    del self._occupied_devices[action.entity_id]
-                    _LOGGER.debug(f"设备 {action.entity_id} 占用状态已清除")
+    async def _run_processor(self) -> None:
+        """常驻处理器：按FIFO顺序依次处理队列中的操作，队列为空时等待新操作入队"""
+        queue_event = self._queue_event
+        while self._is_running:
+            if not self._action_queue:
+                queue_event.clear()
+                await queue_event.wait()
+                continue
+            
+            # 弹出队列头部的操作
+            action = self._action_queue.popleft()
+            self._action_index.pop(action.action_id, None)
+            self._executing_action = action
+            action.status = ActionStatus.EXECUTING
+            
+            _LOGGER.info(f"开始处理操作: {action.entity_id} (fn={action.fn}, fv={action.fv})")
+            
+            # 执行操作流程
+            await self._execute_action_flow(action)
+            
+            # 清理执行状态
+            self._executing_action = None
+            
+            # 清除设备占用状态
+            if action.entity_id in self._occupied_devices:
+                del self._occupied_devices[action.entity_id]
+                _LOGGER.debug(f"设备 {action.entity_id} 占用状态已清除")
     
     async def _execute_action_flow(self, action: DeviceAction) -> None:
         """执行单个操作的完整流程"""
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
             # 步骤1: 根据路由器状态决定是否触发短轮询
@@ -289,7 +309,7 @@ class OptimizedThrottledActionBus:
     
     def get_queue_info(self) -> Dict[str, Any]:
         """获取队列信息"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         queue_info = []
         for action in self._action_queue: